@@ -10,5 +10,6 @@
 
 from .model_handler import ModelHandler
 from .phi15_handler import SimplePhiHandler
+from .llm_scheduler import LLMScheduler
 
-__all__ = ['ModelHandler', 'SimplePhiHandler']
+__all__ = ['ModelHandler', 'SimplePhiHandler', 'LLMScheduler']
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+"""
+LLM Scheduler for Satya Learning System
+Single Llama instance shared by interactive and background work
+"""
+
+import itertools
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class LLMScheduler:
+    """
+    Serialises access to the model; interactive calls preempt background tasks.
+
+    Background tasks run one at a time on a worker thread, in priority
+    order, and receive a cancelled() callable that turns True as soon as
+    an interactive call arrives or cancel_background() is called.
+    """
+
+    def __init__(self):
+        self._llm_lock = threading.RLock()
+        self._cond = threading.Condition()
+        self._interactive_active = 0
+        self._epoch = 0
+        self._seq = itertools.count()
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._worker = None
+        self.completed = 0
+        self.cancelled = 0
+
+    @contextmanager
+    def interactive(self):
+        """Holds the model for a student-facing call, cancelling background work."""
+        with self._cond:
+            self._interactive_active += 1
+        self.cancel_background()
+        try:
+            with self._llm_lock:
+                yield
+        finally:
+            with self._cond:
+                self._interactive_active -= 1
+                self._cond.notify_all()
+
+    def submit_background(
+        self,
+        fn: Callable,
+        *args,
+        priority: int = 10,
+        uses_llm: bool = False,
+        **kwargs
+    ) -> None:
+        """
+        Queues low-priority work.
+
+        Args:
+            fn: Called as fn(cancelled, *args, **kwargs)
+            priority: Lower runs first
+            uses_llm: Holds the model lock while running
+        """
+        self._queue.put((priority, next(self._seq), self._epoch, fn, args, kwargs, uses_llm))
+        self._ensure_worker()
+
+    def cancel_background(self) -> None:
+        """Drops queued background work and signals the running task to stop."""
+        with self._cond:
+            self._epoch += 1
+        dropped = 0
+        while True:
+            try:
+                self._queue.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                break
+        if dropped:
+            self.cancelled += dropped
+            logger.debug(f"Cancelled {dropped} background LLM tasks")
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="llm-background", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            try:
+                _, _, epoch, fn, args, kwargs, uses_llm = self._queue.get(timeout=30)
+            except queue.Empty:
+                return
+
+            def cancelled(epoch=epoch) -> bool:
+                return epoch != self._epoch or self._interactive_active > 0
+
+            # Background work only starts while nobody is waiting on the model
+            with self._cond:
+                while self._interactive_active > 0 and epoch == self._epoch:
+                    self._cond.wait(timeout=1.0)
+            if cancelled():
+                self.cancelled += 1
+                continue
+
+            try:
+                if uses_llm:
+                    with self._llm_lock:
+                        fn(cancelled, *args, **kwargs)
+                else:
+                    fn(cancelled, *args, **kwargs)
+                self.completed += 1
+            except Exception as e:
+                logger.warning(f"Background task failed (non-critical): {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Gets scheduler statistics."""
+        return {
+            "queued": self._queue.qsize(),
+            "interactive_active": self._interactive_active,
+            "completed": self.completed,
+            "cancelled": self.cancelled
+        }
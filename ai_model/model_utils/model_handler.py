@@ -16,6 +16,7 @@ import logging
 from typing import Dict, Any, List, Tuple, Iterator, Optional
 
 from .phi15_handler import SimplePhiHandler
+from .llm_scheduler import LLMScheduler
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,10 +32,16 @@ class SimpleHandler:
     def __init__(self, phi_handler):
         self.phi_handler = phi_handler
     
-    def get_answer(self, query_text: str, context_text: str) -> Tuple[str, float]:
+    def get_answer(
+        self,
+        query_text: str,
+        context_text: str,
+        context_tokens: Optional[List[List[List[int]]]] = None,
+        max_tokens: int = 512
+    ) -> Tuple[str, float]:
         """Single-step answer generation."""
         try:
-            return self.phi_handler.get_answer(query_text, context_text)
+            return self.phi_handler.get_answer(query_text, context_text, context_tokens, max_tokens)
         except Exception as e:
             logger.error(f"SimpleHandler error: {e}")
             return "Error generating answer.", 0.0
@@ -70,17 +77,21 @@ class ModelHandler:
             raise
         
         self.simple_handler = SimpleHandler(self.handler)
+        # Interactive calls preempt background prefetching
+        self.scheduler = LLMScheduler()
     
     def get_answer(self, question: str, context: str = "", answer_length: str = "medium") -> Tuple[str, float]:
         try:
-            return self.handler.get_answer(question, context)
+            with self.scheduler.interactive():
+                return self.handler.get_answer(question, context)
         except Exception as e:
             logger.error(f"Error: {e}")
             return "I'm having trouble with your question. Please try again.", 0.1
     
     def get_answer_stream(self, question: str, context: str = "", answer_length: str = "medium") -> Iterator[str]:
         try:
-            yield from self.handler.get_answer_stream(question, context)
+            with self.scheduler.interactive():
+                yield from self.handler.get_answer_stream(question, context)
         except Exception as e:
             logger.error(f"Stream error: {e}")
             yield "I'm having trouble with your question. Please try again."
@@ -88,11 +99,33 @@ class ModelHandler:
     def generate_response(self, prompt: str, max_tokens: int = 512) -> str:
         """Video passthrough for raw prompt generation."""
         try:
-             return self.handler.generate_response(prompt, max_tokens)
+             with self.scheduler.interactive():
+                 return self.handler.generate_response(prompt, max_tokens)
         except Exception as e:
              logger.error(f"Gen Error: {e}")
              return ""
     
+    def generate_verdict(self, prompt: str, feedback: bool = True) -> Optional[Tuple[bool, str]]:
+        """Grammar-constrained grading verdict (see SimplePhiHandler.generate_verdict)."""
+        try:
+            with self.scheduler.interactive():
+                return self.handler.generate_verdict(prompt, feedback)
+        except Exception as e:
+            logger.error(f"Verdict error: {e}")
+            return None
+    
+    def tokenize(self, text: str) -> List[int]:
+        """Tokenizes text into Phi token ids."""
+        return self.handler.tokenize(text)
+    
+    def count_tokens(self, text: str) -> int:
+        """Counts Phi tokens in text."""
+        try:
+            return self.handler.count_tokens(text)
+        except Exception as e:
+            logger.error(f"Tokenize error: {e}")
+            return (len(text) + 3) // 4
+    
     def get_model_info(self) -> Dict[str, Any]:
         return {
             "name": "Phi 1.5",
@@ -13,8 +13,8 @@ CPU-first, single-call implementation
 
 import re
 import logging
-from typing import Iterator, Tuple
-from llama_cpp import Llama
+from typing import Iterator, List, Optional, Tuple, Union
+from llama_cpp import Llama, LlamaGrammar
 
 logger = logging.getLogger(__name__)
 
@@ -22,10 +22,34 @@ class SimplePhiHandler:
     """Lightweight single-phase handler for i3 processors."""
     
     STOP_SEQUENCES = ["</s>", "\n\nQuestion:", "\n\nQ:", "Exercise", "Instructions:", "Reference material:"]  # Added to prevent hallucinations
+    CONTEXT_TOKEN_BUDGET = 200  # Reference material tokens in the RAG prompt
+    FOLLOW_UP_MAX_TOKENS = 256  # Answer length for follow-up turns
+    RAG_INSTRUCTION = (
+        "Instruct: You are Satya, an expert tutor. Use the Reference Material to write a specific, technical answer. "
+        "Use scientific terms and details from the text. Explain functions and processes clearly. "
+        "Avoid generic definitions.\n"
+        "Output:"
+    )
+    # Grading output: the verdict first, then at most one feedback sentence
+    VERDICT_GRAMMAR = r'''
+root     ::= " [" verdict "]"
+verdict  ::= "CORRECT" | "INCORRECT"
+'''
+    VERDICT_FEEDBACK_GRAMMAR = r'''
+root     ::= " [" verdict "]" "\nFeedback: " sentence
+verdict  ::= "CORRECT" | "INCORRECT"
+sentence ::= [A-Za-z0-9] [^\n.!?]* [.!?]
+'''
+    VERDICT_MAX_TOKENS = 6     # " [INCORRECT]" is at most a handful of tokens
+    FEEDBACK_MAX_TOKENS = 48   # One short feedback sentence
     
     def __init__(self, model_path: str):
         self.model_path = model_path
         self.llm = None
+        self._fixed_tokens = {}  # Token ids of constant prompt parts
+        self._grammars = {}  # Compiled GBNF grammars
+        self._session_tokens = None  # Evaluated tokens a follow-up may continue from
+        self._session_snapshot = None  # Saved only when another call evaluates in between
         self.system_prompt = (
             "You are Satya, a clear and patient educational tutor.\n"
             "Explain concepts to high-school students.\n"
@@ -71,24 +95,109 @@ class SimplePhiHandler:
         except Exception as e:
             logger.warning(f"Warm-up failed (non-critical): {e}")
     
+    def tokenize(self, text: str, add_bos: bool = False) -> List[int]:
+        """Tokenizes text into Phi token ids."""
+        if not self.llm:
+            self.load_model()
+        return self.llm.tokenize(text.encode("utf-8"), add_bos=add_bos)
+    
+    def _fixed(self, text: str, add_bos: bool = False) -> List[int]:
+        """Tokenizes a constant prompt part once."""
+        key = (text, add_bos)
+        if key not in self._fixed_tokens:
+            self._fixed_tokens[key] = self.tokenize(text, add_bos=add_bos)
+        return self._fixed_tokens[key]
+    
+    def count_tokens(self, text: str) -> int:
+        """Counts Phi tokens in text (approximates before the model is loaded)."""
+        if not text:
+            return 0
+        if self.llm is None:
+            return (len(text) + 3) // 4
+        return len(self.llm.tokenize(text.encode("utf-8"), add_bos=False))
+    
+    def _trim_context(self, context: str, max_tokens: int) -> str:
+        """Trims context to whole sentences within max_tokens."""
+        if self.count_tokens(context) <= max_tokens:
+            return context
+        
+        kept, used = [], 0
+        for sentence in re.split(r'(?<=[.!?])\s+', context):
+            tokens = self.count_tokens(sentence + " ")
+            if used + tokens > max_tokens:
+                break
+            kept.append(sentence)
+            used += tokens
+        return " ".join(kept)
+    
+    @staticmethod
+    def _trim_context_tokens(context_tokens: List[List[List[int]]], max_tokens: int) -> List[List[List[int]]]:
+        """Trims pre-tokenised context to whole sentences within max_tokens, like _trim_context."""
+        if sum(len(sentence) for chunk in context_tokens for sentence in chunk) <= max_tokens:
+            return context_tokens
+        
+        kept, used = [], 0
+        for chunk in context_tokens:
+            kept.append([])
+            for sentence in chunk:
+                if used + len(sentence) > max_tokens:
+                    return kept
+                kept[-1].append(sentence)
+                used += len(sentence)
+        return kept
+    
     def _build_prompt(self, question: str, context: str) -> str:
         context = (context or "").strip()
         
         # Prompt for RAG Use
-        base_instruction = (
-            "Instruct: You are Satya, an expert tutor. Use the Reference Material to write a specific, technical answer. "
-            "Use scientific terms and details from the text. Explain functions and processes clearly. "
-            "Avoid generic definitions.\n"
-            "Output:"
-        )
+        base_instruction = self.RAG_INSTRUCTION
         
         if context:
-            if len(context) > 850:
-                context = context[:850].rsplit('.', 1)[0] + '.'
+            context = self._trim_context(context, self.CONTEXT_TOKEN_BUDGET)
             return f"{base_instruction}\nReference material:\n{context}\n\nQuestion: {question}\nAnswer:"
         
         return f"{base_instruction}\nQuestion: {question}\nAnswer:"
     
+    def _build_prompt_tokens(self, question: str, context_tokens: List[List[List[int]]]) -> List[int]:
+        """
+        Assembles the RAG prompt from pre-tokenised context.
+        
+        Mirrors _build_prompt; only the question is tokenized per call.
+        
+        Args:
+            question: User question
+            context_tokens: Token ids per sentence, grouped per context chunk
+        
+        Returns:
+            Prompt token ids
+        """
+        prompt = list(self._fixed(self.RAG_INSTRUCTION + "\nReference material:\n", add_bos=True))
+        separator = self._fixed("\n\n")
+        
+        chunks = [chunk for chunk in self._trim_context_tokens(context_tokens, self.CONTEXT_TOKEN_BUDGET) if chunk]
+        for i, chunk in enumerate(chunks):
+            if i:
+                prompt.extend(separator)
+            for sentence in chunk:
+                prompt.extend(sentence)
+        
+        prompt.extend(self.tokenize(f"\n\nQuestion: {question}\nAnswer:"))
+        return prompt
+    
+    def _prepare_prompt(
+        self,
+        question: str,
+        context: str,
+        context_tokens: Optional[List[List[List[int]]]]
+    ) -> Union[str, List[int]]:
+        """Uses pre-tokenised context when given, otherwise the text prompt."""
+        if context_tokens:
+            try:
+                return self._build_prompt_tokens(question, context_tokens)
+            except Exception as e:
+                logger.warning(f"Token prompt assembly failed, using text prompt: {e}")
+        return self._build_prompt(question, context)
+    
     def _clean_answer(self, answer: str) -> str:
         if not answer:
             return ""
@@ -124,21 +233,28 @@ class SimplePhiHandler:
         
         return min(1.0, 0.5 + relevance * 0.5)
     
-    def get_answer_stream(self, question: str, context: str = "") -> Iterator[str]:
+    def get_answer_stream(
+        self,
+        question: str,
+        context: str = "",
+        context_tokens: Optional[List[List[List[int]]]] = None,
+        max_tokens: int = 512
+    ) -> Iterator[str]:
         if not self.llm:
             self.load_model()
+        self._protect_session()
         
         if not question or len(question.strip()) < 3:
             yield "Please provide a proper question."
             return
         
-        prompt = self._build_prompt(question, context)
+        prompt = self._prepare_prompt(question, context, context_tokens)
         
         try:
 
             for chunk in self.llm(
                 prompt,
-                max_tokens=512,  # Increased to 512 to allow for detailed, complete answers
+                max_tokens=max_tokens,  # 512 by default to allow for detailed, complete answers
                 temperature=0.6,
                 top_p=0.9,
                 repeat_penalty=1.12, 
@@ -155,19 +271,26 @@ class SimplePhiHandler:
             logger.error(f"Streaming error: {e}")
             yield "Error generating answer. Please try again."
     
-    def get_answer(self, question: str, context: str = "") -> Tuple[str, float]:
+    def get_answer(
+        self,
+        question: str,
+        context: str = "",
+        context_tokens: Optional[List[List[List[int]]]] = None,
+        max_tokens: int = 512
+    ) -> Tuple[str, float]:
         if not self.llm:
             self.load_model()
+        self._protect_session()
         
         if not question or len(question.strip()) < 3:
             return "Please provide a proper question.", 0.1
         
-        prompt = self._build_prompt(question, context)
+        prompt = self._prepare_prompt(question, context, context_tokens)
         
         try:
             response = self.llm(
                 prompt,
-                max_tokens=512,  
+                max_tokens=max_tokens,
                 temperature=0.6,
                 top_p=0.9,
                 repeat_penalty=1.12,
@@ -185,10 +308,102 @@ class SimplePhiHandler:
             logger.error(f"Answer generation error: {e}")
             return "Error generating answer.", 0.1
     
+    def keep_session(self) -> Optional[List[int]]:
+        """
+        Marks the evaluated tokens (prompt + answer) as the base for follow-ups.
+        
+        Only the token ids are copied; the KV cache stays live in llama.cpp,
+        which reuses the matching prefix when the follow-up is evaluated.
+        
+        Returns:
+            The evaluated token ids, or None without a loaded model
+        """
+        if not self.llm:
+            return None
+        self._session_tokens = self._evaluated_tokens()
+        self._session_snapshot = None
+        return self._session_tokens
+    
+    def end_session(self):
+        """Forgets the follow-up base, e.g. when a new question replaces it."""
+        self._session_tokens = None
+        self._session_snapshot = None
+    
+    def _evaluated_tokens(self) -> List[int]:
+        return [int(t) for t in self.llm.input_ids[:self.llm.n_tokens]]
+    
+    def _protect_session(self):
+        """Snapshots the session before another call overwrites its KV cache."""
+        if self._session_tokens is None or self._session_snapshot is not None:
+            return
+        if self._evaluated_tokens()[:len(self._session_tokens)] != self._session_tokens:
+            return
+        try:
+            self._session_snapshot = self.llm.save_state()
+        except Exception as e:
+            logger.warning(f"Could not save model state: {e}")
+    
+    def continuation_prompt(self, turn: str, history: Optional[List[int]]) -> Optional[List[int]]:
+        """
+        Builds the token prompt for a follow-up turn on top of the previous answer.
+        
+        Args:
+            turn: Follow-up instruction
+            history: Tokens returned by keep_session after the previous answer
+        
+        Returns:
+            Previous tokens plus the new turn, or None if it won't fit n_ctx
+        """
+        if history is None:
+            return None
+        if not self.llm:
+            self.load_model()
+        
+        prompt = list(history) + self.tokenize(f"\n\nQuestion: {turn}\nAnswer:")
+        if len(prompt) + self.FOLLOW_UP_MAX_TOKENS > self.llm.n_ctx():
+            return None
+        return prompt
+    
+    def continue_answer_stream(self, prompt: List[int], history: List[int]) -> Iterator[str]:
+        """
+        Streams a follow-up answer, evaluating only the newly appended turn.
+        
+        Args:
+            prompt: Tokens from continuation_prompt
+            history: Tokens the prompt was built on
+        """
+        try:
+            # Another call (grading, prefetch) replaced the KV cache after
+            # snapshotting it; without a snapshot the prompt is re-prefilled
+            snapshot = self._session_snapshot
+            if snapshot is not None and self._evaluated_tokens()[:len(history)] != list(history):
+                self.llm.load_state(snapshot)
+            self._session_snapshot = None
+            
+            # llama.cpp reuses the longest evaluated prefix of the prompt
+            for chunk in self.llm(
+                prompt,
+                max_tokens=self.FOLLOW_UP_MAX_TOKENS,
+                temperature=0.6,
+                top_p=0.9,
+                repeat_penalty=1.12,
+                stop=self.STOP_SEQUENCES,
+                stream=True
+            ):
+                if chunk and chunk.get("choices"):
+                    text = chunk["choices"][0].get("text", "")
+                    if text:
+                        yield text
+        
+        except Exception as e:
+            logger.error(f"Follow-up streaming error: {e}")
+            yield "Error generating answer. Please try again."
+    
     def generate_response(self, prompt: str, max_tokens: int = 512) -> str:
         """Generating a raw response from a custom prompt."""
         if not self.llm:
             self.load_model()
+        self._protect_session()
             
         try:
             response = self.llm(
@@ -206,7 +421,55 @@ class SimplePhiHandler:
             logger.error(f"Generation error: {e}")
             return ""
 
+    def _grammar(self, text: str) -> LlamaGrammar:
+        """Compiles a GBNF grammar once."""
+        if text not in self._grammars:
+            self._grammars[text] = LlamaGrammar.from_string(text, verbose=False)
+        return self._grammars[text]
+
+    def generate_verdict(self, prompt: str, feedback: bool = True) -> Optional[Tuple[bool, str]]:
+        """
+        Grades with a grammar that forces the verdict as the first tokens.
+
+        Args:
+            prompt: Grading prompt ending in "Verdict:"
+            feedback: Also decode one bounded feedback sentence
+
+        Returns:
+            (is_correct, feedback) or None if generation failed
+        """
+        if not self.llm:
+            self.load_model()
+        self._protect_session()
+
+        grammar_text = self.VERDICT_FEEDBACK_GRAMMAR if feedback else self.VERDICT_GRAMMAR
+        max_tokens = self.VERDICT_MAX_TOKENS + (self.FEEDBACK_MAX_TOKENS if feedback else 0)
+
+        try:
+            response = self.llm(
+                prompt,
+                max_tokens=max_tokens,
+                temperature=0.3,
+                top_p=0.9,
+                repeat_penalty=1.1,
+                grammar=self._grammar(grammar_text),
+                stream=False
+            )
+            return self._parse_verdict(response["choices"][0]["text"])
+        except Exception as e:
+            logger.error(f"Verdict generation error: {e}")
+            return None
+
+    @staticmethod
+    def _parse_verdict(text: str) -> Optional[Tuple[bool, str]]:
+        """Reads grammar-shaped output: ' [VERDICT]' then optional feedback."""
+        match = re.match(r'\s*\[(CORRECT|INCORRECT)\](?:\nFeedback: (.*))?', text, re.S)
+        if not match:
+            return None
+        return match.group(1) == "CORRECT", (match.group(2) or "").strip()
+
     def cleanup(self):
+        self.end_session()
         if self.llm:
             del self.llm
             self.llm = None
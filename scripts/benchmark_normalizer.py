@@ -0,0 +1,187 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Input Normalizer Micro-Benchmarks
+Times individual normalization stages on the CPU.
+
+Usage:
+    python scripts/benchmark_normalizer.py fuzzy --words 400
+    python scripts/benchmark_normalizer.py startup --spell-backend languagetool
+    python scripts/benchmark_normalizer.py classroom --repeats 5
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from system.input_processing.adaptive_normalizer import AdaptiveNormalizer
+from system.input_processing.fuzzy_matcher import FuzzyPhraseMatcher
+from system.input_processing.input_normalizer import InputNormalizer
+from system.input_processing.normalization_cache import NormalizationCache
+
+CLASSROOM_QUESTIONS = [
+    "hey can u explain photosynthesis", "why is the sky blue", "what is the difference between AC and DC",
+    "how do plants make food", "define velocity", "WITH REFERENCE TO THE DIAGRAM ABOVE explain mitosis",
+    "what does osmosis mean", "solve 2x + 3 = 7", "like basically what is DNA", "so what causes rain",
+    "explain in brief the water cycle", "compare mitosis and meiosis", "what happens when a switch is closed",
+]
+
+FILLER = (
+    "the chloroplast absorbs light energy and converts carbon dioxide and water into glucose "
+    "while oxygen is released through the stomata of the leaf during the day"
+).split()
+
+
+def _timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) / repeats * 1000, result
+
+
+def _legacy_fuzzy_remove(text, phrases, threshold):
+    """The sliding-window SequenceMatcher scan the fuzzy matcher replaced."""
+    for phrase in phrases:
+        target = phrase.lower()
+        size = len(target.split())
+        words = text.split()
+        best_idx, best_sim = -1, 0.0
+        for i in range(len(words) - size + 1):
+            window = " ".join(w.lower() for w in words[i:i + size])
+            sim = SequenceMatcher(None, window, target).ratio()
+            if sim > best_sim and sim >= threshold:
+                best_sim, best_idx = sim, i
+        if best_idx >= 0:
+            text = " ".join(words[:best_idx] + words[best_idx + size:])
+    return text
+
+
+def bench_fuzzy(args):
+    """Long pasted question: legacy difflib scan vs fuzzy phrase index."""
+    normalizer = InputNormalizer()
+    phrases, threshold = normalizer.fuzzy_noise_phrases, normalizer.fuzzy_threshold
+    matcher = FuzzyPhraseMatcher(phrases, threshold)
+
+    rng = random.Random(0)
+    words = [rng.choice(FILLER) for _ in range(args.words)]
+    words[args.words // 2:args.words // 2] = "acording to the pasage".split()
+    text = "With refrence to the figure abov " + " ".join(words) + " explain in breif"
+
+    legacy_ms, legacy = _timed(lambda: _legacy_fuzzy_remove(text, phrases, threshold), args.repeats)
+    fast_ms, (fast, removed) = _timed(lambda: matcher.remove(text), args.repeats)
+    assert legacy == fast, "fuzzy matcher disagrees with the difflib scan"
+
+    print(f"Question length:   {len(text.split())} words, {removed} phrases removed")
+    print(f"difflib scan:      {legacy_ms:.2f} ms")
+    print(f"Fuzzy index:       {fast_ms:.2f} ms")
+    print(f"Speedup:           {legacy_ms / fast_ms:.1f}x")
+    print(f"Windows filtered:  {matcher.stats()['filtered_ratio']:.1%}")
+
+
+def bench_startup(args):
+    """Normalizer construction: lazy optional components vs loading them up front."""
+    log_dir = tempfile.mkdtemp(prefix="satya-bench-")
+
+    def construct():
+        return AdaptiveNormalizer(log_dir=log_dir, spell_backend=args.spell_backend)
+
+    def construct_eager():
+        # What __init__ used to do: spaCy and the spell backend before returning
+        normalizer = construct()
+        normalizer.normalizer.nlp
+        normalizer.wait_until_ready()
+        return normalizer
+
+    eager_ms, eager = _timed(construct_eager, 1)
+    lazy_ms, lazy = _timed(construct, 1)
+    ready_start = time.perf_counter()
+    lazy.wait_until_ready()
+    ready_ms = (time.perf_counter() - ready_start) * 1000
+
+    print(f"spaCy available:        {eager.normalizer.nlp_ready}")
+    print(f"Spell backend:          {args.spell_backend} ({'loaded' if eager.spell_checker else 'unavailable'})")
+    print(f"Eager construction:     {eager_ms:.1f} ms")
+    print(f"Lazy construction:      {lazy_ms:.1f} ms")
+    print(f"Spell ready after:      {lazy_ms + ready_ms:.1f} ms (in the background)")
+
+
+def bench_classroom(args):
+    """Repeated classroom questions: result cache and combined intent matcher."""
+    rng = random.Random(0)
+    # A few questions dominate, as when a class works through the same exercise
+    variants = [f"{q} {suffix}" for q in CLASSROOM_QUESTIONS for suffix in ("", "please", "in class 8")]
+    weights = [1 / (rank + 1) for rank in range(len(variants))]
+    requests = rng.choices(variants, weights, k=args.words * 10)
+
+    log_dir = tempfile.mkdtemp(prefix="satya-bench-")
+    phrases = f"{log_dir}/phrases.json"
+    uncached = InputNormalizer(phrases, cache=NormalizationCache(0))
+    cache = NormalizationCache()
+    cached = InputNormalizer(phrases, cache=cache)
+    assert all(uncached.normalize(q) == cached.normalize(q) for q in variants), "cache changed a result"
+    cache.clear()
+
+    uncached_ms, _ = _timed(lambda: [uncached.normalize(q) for q in requests], args.repeats)
+    cached_ms, _ = _timed(lambda: [cached.normalize(q) for q in requests], args.repeats)
+
+    # What _classify_intent did before: every pattern of every intent in turn
+    legacy_patterns = {
+        intent: [re.compile(p, re.IGNORECASE) for p in patterns]
+        for intent, patterns in uncached.intent_patterns.items()
+    }
+
+    def legacy_intent(question):
+        for intent, patterns in legacy_patterns.items():
+            if any(p.search(question.lower()) for p in patterns):
+                return intent
+        return "DESCRIBE"
+
+    clean = [uncached.normalize(q)["clean_question"] for q in requests]
+    assert [legacy_intent(q) for q in clean] == [uncached._classify_intent(q) for q in clean]
+    legacy_ms, _ = _timed(lambda: [legacy_intent(q) for q in clean], args.repeats)
+    combined_ms, _ = _timed(lambda: [uncached._classify_intent(q) for q in clean], args.repeats)
+
+    print(f"Requests:            {len(requests)} ({len(set(requests))} distinct)")
+    print(f"normalize uncached:  {uncached_ms / len(requests) * 1000:.1f} us/question")
+    print(f"normalize cached:    {cached_ms / len(requests) * 1000:.1f} us/question "
+          f"({uncached_ms / cached_ms:.1f}x, hit rate {cache.stats()['hit_rate']:.1%})")
+    print(f"Intent, per pattern: {legacy_ms / len(clean) * 1000:.2f} us/question")
+    print(f"Intent, combined:    {combined_ms / len(clean) * 1000:.2f} us/question ({legacy_ms / combined_ms:.1f}x)")
+
+
+BENCHMARKS = {
+    "classroom": bench_classroom,
+    "fuzzy": bench_fuzzy,
+    "startup": bench_startup,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Input normalizer micro-benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS), help="Benchmark to run")
+    parser.add_argument("--words", type=int, default=400,
+                        help="Words in the generated question (classroom: requests / 10)")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed repetitions")
+    parser.add_argument("--spell-backend", default="symspell", choices=["auto", "symspell", "languagetool"],
+                        help="Spell backend loaded by the startup benchmark")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Spell Index Builder
+Builds the SymSpell index used by AdaptiveNormalizer from the curriculum
+content, the Chroma documents and a base English word list. The word list
+is required: without it ordinary English words outside the curriculum would
+be "corrected" to curriculum words. scripts/ingest_content.py rebuilds the
+index after every ingestion; this script rebuilds it on its own.
+
+Word lists are looked up in this order: --wordlist, satya_data/wordlist.txt
+(bundled with the release when present), then the system dictionary.
+
+Usage:
+    python scripts/build_spell_index.py
+    python scripts/build_spell_index.py --wordlist /usr/share/dict/words
+"""
+
+import argparse
+import itertools
+import logging
+import sys
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from system.input_processing.spell_corrector import SymSpellCorrector, content_texts, count_words
+from system.utils.resource_path import resolve_chroma_db_dir, resolve_content_dir
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = str(project_root / "satya_data" / "spell_index.json.gz")
+DEFAULT_WORDLISTS = [
+    str(project_root / "satya_data" / "wordlist.txt"),
+    "/usr/share/dict/words",
+    "/usr/share/dict/american-english",
+]
+
+
+def chroma_texts(chroma_path: str, page_size: int = 500):
+    """Yields every document stored in the Chroma collections."""
+    try:
+        import chromadb
+    except ImportError:
+        logger.warning("chromadb not installed; skipping Chroma documents")
+        return
+    yield from collection_texts(chromadb.PersistentClient(path=chroma_path), page_size)
+
+
+def collection_texts(client, page_size: int = 500):
+    """Yields every document of every collection of a Chroma client."""
+    for collection in client.list_collections():
+        collection = client.get_collection(collection.name)
+        offset = 0
+        while True:
+            batch = collection.get(include=["documents"], limit=page_size, offset=offset)
+            documents = batch.get("documents") or []
+            if not documents:
+                break
+            yield from (d for d in documents if d)
+            offset += len(documents)
+        logger.info(f"Read {offset} documents from {collection.name}")
+
+
+def wordlist_words(path: str) -> Set[str]:
+    """Reads the base lexicon (one word per line)."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return {w.strip().lower() for w in f if w.strip().isalpha()}
+
+
+def find_wordlist(path: Optional[str] = None) -> Optional[str]:
+    """Gets the given word list, or the first default one that exists."""
+    candidates = [path] if path else DEFAULT_WORDLISTS
+    return next((p for p in candidates if Path(p).exists()), None)
+
+
+def build_index(
+    texts: Iterable[str],
+    wordlist: Optional[str] = None,
+    output: str = DEFAULT_OUTPUT,
+    max_distance: int = 2,
+    min_count: int = 1
+) -> Optional[Path]:
+    """
+    Builds and saves the spell index.
+
+    Args:
+        texts: Curriculum texts (content JSON strings, Chroma documents)
+        wordlist: Base English word list (None searches the defaults)
+        output: Index file to write
+        max_distance: Largest correction distance
+        min_count: Drop curriculum words seen fewer times
+
+    Returns:
+        The index path, or None when no word list was found
+    """
+    wordlist = find_wordlist(wordlist)
+    if wordlist is None:
+        logger.warning("No base word list found (looked for satya_data/wordlist.txt and the system "
+                       "dictionary); spell index not built, LanguageTool will be used if installed")
+        return None
+    lexicon = wordlist_words(wordlist)
+    logger.info(f"Word list {wordlist}: {len(lexicon)} words")
+
+    counts = count_words(texts)
+    logger.info(f"Curriculum vocabulary: {len(counts)} words")
+
+    corrector = SymSpellCorrector.build(counts, lexicon, max_edit_distance=max_distance, min_count=min_count)
+    path = corrector.save(output)
+    logger.info(f"Spell index written to {path} ({path.stat().st_size / 1024:.0f} KB)")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the curriculum spell index")
+    parser.add_argument("--content", default=str(resolve_content_dir("satya_data/content")),
+                        help="Content JSON directory")
+    parser.add_argument("--chroma", default=str(resolve_chroma_db_dir()), help="ChromaDB directory")
+    parser.add_argument("--wordlist", default=None, help="Base English word list (one word per line)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Index file to write")
+    parser.add_argument("--max-distance", type=int, default=2, help="Largest correction distance")
+    parser.add_argument("--min-count", type=int, default=1, help="Drop words seen fewer times")
+    args = parser.parse_args()
+
+    texts = content_texts(args.content)
+    if Path(args.chroma).exists():
+        texts = itertools.chain(texts, chroma_texts(args.chroma))
+
+    if build_index(texts, args.wordlist, args.output, args.max_distance, args.min_count) is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
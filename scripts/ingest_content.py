@@ -16,6 +16,8 @@ Handles ALL content types:
 - Text files (TXT, MD, JSONL)
 
 Auto-detects content type and applies appropriate processing.
+Afterwards the spell index is rebuilt from the content JSON and all stored
+chunks (needs a base word list, see scripts/build_spell_index.py).
 
 Usage:
     python scripts/ingest_content.py
@@ -24,6 +26,7 @@ Usage:
     python scripts/ingest_content.py --ocr-mode force # force OCR on all PDFs
 """
 
+import itertools
 import os
 import sys
 import logging
@@ -36,7 +39,12 @@ import fitz  # PyMuPDF
 
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.build_spell_index import DEFAULT_OUTPUT as DEFAULT_SPELL_INDEX, build_index, collection_texts
 from scripts.rag_data_preparation.enhanced_chunker import EnhancedChunker
+from system.input_processing.spell_corrector import content_texts
+from system.rag.collection_router import CollectionRouter
+from system.rag.context_packer import split_sentences
+from system.rag.token_store import ChunkTokenStore
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -61,11 +69,12 @@ except ImportError:
 class UniversalContentIngester:
     """Handles all content types with auto-detection."""
     
-    def __init__(self, db_path: str, ocr_mode: str = "auto"):
+    def __init__(self, db_path: str, ocr_mode: str = "auto", model_path: Optional[str] = None):
         """
         Args:
             db_path: Path to ChromaDB
             ocr_mode: "auto" (detect), "force" (always OCR), "never" (text only)
+            model_path: Phi model folder used to pre-tokenise chunks
         """
         self.db_path = db_path
         self.ocr_mode = ocr_mode
@@ -78,12 +87,43 @@ class UniversalContentIngester:
         
         self.chunker = EnhancedChunker(chunk_size=512, overlap_ratio=0.1)
         
+        # Per-collection centroids for query routing
+        self.router = CollectionRouter(chroma_db_path=db_path)
+        
+        # Phi token ids per chunk so prompts skip tokenisation at query time
+        self.token_store = ChunkTokenStore(chroma_db_path=db_path)
+        self.tokenizer = self.load_tokenizer(model_path) if model_path else None
+        
         # Initialize OCR readers (lazy)
         self.easyocr_reader = None
         if EASYOCR_AVAILABLE and ocr_mode != "never":
             logger.info("Loading EasyOCR (for handwritten notes)...")
             self.easyocr_reader = easyocr.Reader(['en'], gpu=False)
     
+    def load_tokenizer(self, model_path: str):
+        """Loads only the Phi vocabulary (no weights) for pre-tokenisation."""
+        try:
+            from llama_cpp import Llama
+            gguf_files = list(Path(model_path).glob("*.gguf"))
+            if not gguf_files:
+                logger.warning(f"No .gguf file in {model_path}; chunks will not be pre-tokenised")
+                return None
+            logger.info("Loading Phi tokenizer...")
+            return Llama(model_path=str(gguf_files[0]), vocab_only=True, verbose=False)
+        except Exception as e:
+            logger.warning(f"Tokenizer unavailable; chunks will not be pre-tokenised: {e}")
+            return None
+    
+    def tokenize_chunks(self, ids: List[str], texts: List[str]) -> Dict[str, List[List[int]]]:
+        """Tokenizes each chunk sentence by sentence, matching query-time splitting."""
+        return {
+            chunk_id: [
+                self.tokenizer.tokenize((" " + sentence).encode("utf-8"), add_bos=False)
+                for sentence in split_sentences(text)
+            ]
+            for chunk_id, text in zip(ids, texts)
+        }
+    
     def detect_pdf_type(self, pdf_path: Path) -> str:
         """
         Detect if PDF is text-based or scanned.
@@ -264,6 +304,8 @@ class UniversalContentIngester:
         
         logger.info(f"Found {len(files)} files")
         
+        touched_collections = set()
+        
         for file_path in tqdm(files, desc="Processing files"):
             # Extract content
             content = self.process_file(file_path)
@@ -307,10 +349,38 @@ class UniversalContentIngester:
                         metadatas=metadatas[i:end]
                     )
                 
+                if self.tokenizer:
+                    self.token_store.put_collection(collection_name, self.tokenize_chunks(ids, texts))
+                
                 logger.info(f"Ingested {len(chunks)} chunks")
+                touched_collections.add(collection_name)
                 
             except Exception as e:
                 logger.error(f" DB error: {e}")
+        
+        self.update_router(touched_collections)
+    
+    def update_router(self, collection_names):
+        """Refits routing centroids for collections changed by this run."""
+        if not collection_names:
+            return
+        
+        logger.info(f"Fitting router centroids for {len(collection_names)} collections...")
+        for name in sorted(collection_names):
+            try:
+                self.router.fit_from_chroma(self.client.get_collection(name))
+            except Exception as e:
+                logger.error(f" Router error for {name}: {e}")
+        self.router.save()
+    
+    def update_spell_index(self, content_dir: str, wordlist: Optional[str], output: str):
+        """Rebuilds the spell index from the content JSON and every stored chunk."""
+        logger.info("Rebuilding spell index...")
+        texts = content_texts(content_dir) if Path(content_dir).exists() else iter(())
+        try:
+            build_index(itertools.chain(texts, collection_texts(self.client)), wordlist, output)
+        except Exception as e:
+            logger.error(f" Spell index error: {e}")
 
 
 def main():
@@ -326,6 +396,24 @@ def main():
         "satya_data", "chroma_db"
     )
     parser.add_argument("--db", default=auto_db_path, help="ChromaDB path")
+    parser.add_argument(
+        "--model",
+        default=os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "satya_data", "models", "phi15"
+        ),
+        help="Phi model folder for chunk pre-tokenisation"
+    )
+    parser.add_argument(
+        "--content",
+        default=os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "satya_data", "content"
+        ),
+        help="Content JSON folder added to the spell index vocabulary"
+    )
+    parser.add_argument("--wordlist", default=None, help="Base English word list for the spell index")
+    parser.add_argument("--spell-index", default=DEFAULT_SPELL_INDEX, help="Spell index file to write")
     
     args = parser.parse_args()
     
@@ -346,9 +434,10 @@ def main():
             sys.exit(0)
     
     # Run ingestion
-    ingester = UniversalContentIngester(args.db, args.ocr_mode)
+    ingester = UniversalContentIngester(args.db, args.ocr_mode, model_path=args.model)
     for dir_path in dirs_to_process:
         ingester.ingest_directory(dir_path)
+    ingester.update_spell_index(args.content, args.wordlist, args.spell_index)
     
     logger.info("\n All content ingested successfully!")
 
@@ -0,0 +1,73 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Normalization Log Reprocessing Script
+Re-runs the current normalizer rules over logged questions and reports what
+changed. Run after approving new noise phrases or editing abbreviations.
+
+Usage:
+    python scripts/reprocess_normalization_logs.py
+    python scripts/reprocess_normalization_logs.py --diff changes.jsonl --workers 4
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from system.input_processing.batch_normalizer import reprocess_log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-normalize logged questions and diff the results")
+    parser.add_argument("--log", default="satya_data/normalization_logs/feedback_db.jsonl",
+                        help="Feedback log to reprocess")
+    parser.add_argument("--phrases", default="satya_data/input_normalizer_phrases.json",
+                        help="Learned noise phrases")
+    parser.add_argument("--diff", default=None, help="Write one JSON line per changed question here")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--chunksize", type=int, default=256, help="Questions per worker task")
+    args = parser.parse_args()
+
+    if not Path(args.log).exists():
+        print(f"❌ Log not found: {args.log}\n")
+        return
+
+    start = time.perf_counter()
+    diff_file = open(args.diff, 'w', encoding='utf-8') if args.diff else None
+    try:
+        summary = reprocess_log(args.log, args.phrases, diff_file, args.workers, args.chunksize)
+    finally:
+        if diff_file:
+            diff_file.close()
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print(f"Reprocessed {summary['total']} questions in {elapsed:.1f}s")
+    print(f"Changed: {summary['changed']}  "
+          f"(clean {summary['field_changes']['clean']}, intent {summary['field_changes']['intent']}, "
+          f"confidence {summary['field_changes']['confidence']})")
+    print(f"Mean confidence: {summary['mean_confidence_before']:.3f} -> {summary['mean_confidence_after']:.3f}")
+    print("=" * 80)
+    for field, samples in summary["samples"].items():
+        if samples:
+            print(f"\n{field} changes:")
+            for sample in samples:
+                print(f"  line {sample['line']}: {json.dumps(sample[field], ensure_ascii=False)}")
+    if args.diff:
+        print(f"\nFull diff written to {args.diff}")
+
+
+if __name__ == "__main__":
+    main()
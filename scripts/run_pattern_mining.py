@@ -9,13 +9,20 @@
 """
 Weekly Pattern Mining Script
 Run this to discover new patterns and update the normalizer.
+
+Counters are kept in a state file, so each run only reads log lines added
+since the previous one. Use --rebuild to recount the whole log.
+
+For logs collected from many schools, --log-dir counts every *.jsonl file in
+a directory across a process pool with fixed-size count sketches.
 """
 
+import argparse
 import sys
 from pathlib import Path
 
 # Add project root to path
-project_root = Path(__file__).parent.parent.parent
+project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from system.input_processing.pattern_miner import PatternMiner
@@ -24,28 +31,52 @@ from system.input_processing.input_normalizer import InputNormalizer
 
 def main():
     """Run weekly pattern mining."""
+    parser = argparse.ArgumentParser(description="Discover new noise phrases from normalization logs")
+    parser.add_argument("--log", default="satya_data/normalization_logs/feedback_db.jsonl",
+                        help="Feedback log to mine")
+    parser.add_argument("--state", default="satya_data/normalization_logs/pattern_miner_state.json.gz",
+                        help="Persisted n-gram counters")
+    parser.add_argument("--rebuild", action="store_true", help="Discard saved counters and recount the whole log")
+    parser.add_argument("--log-dir", default=None,
+                        help="Directory of per-school *.jsonl logs to mine in parallel (ignores --log and --state)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --log-dir (default: one per CPU)")
+    args = parser.parse_args()
     
     print("="*80)
     print("PATTERN MINING - Weekly Discovery")
     print("="*80 + "\n")
     
     # Initialize
-    miner = PatternMiner(min_frequency=5, min_confidence=0.6)  # Lower thresholds for testing
     normalizer = InputNormalizer()
     
-    # Load feedback logs
-    log_file = "satya_data/normalization_logs/feedback_db.jsonl"
-    print(f"Loading logs from: {log_file}\n")
-    
-    logs = miner.load_feedback_logs(log_file)
-    
-    if not logs:
-        print("❌ No logs found. Run the system first to generate logs.\n")
-        return
+    if args.log_dir:
+        miner = PatternMiner(min_frequency=5, min_confidence=0.6)  # Lower thresholds for testing
+        log_files = sorted(Path(args.log_dir).glob("*.jsonl"))
+        if not log_files:
+            print(f"❌ No *.jsonl logs found in {args.log_dir}\n")
+            return
+        print(f"🔍 Mining patterns from {len(log_files)} log files...\n")
+        suggestions = miner.mine_sharded(log_files, workers=args.workers)
+    else:
+        miner = PatternMiner(min_frequency=5, min_confidence=0.6, state_file=args.state)  # Lower thresholds for testing
+        if args.rebuild:
+            miner.reset()
+        
+        # Read log lines added since the last run
+        print(f"Reading new entries from: {args.log}\n")
+        
+        new_entries = miner.update_from_log(args.log)
+        
+        if not miner.offset:
+            print("❌ No logs found. Run the system first to generate logs.\n")
+            return
+        
+        # Mine patterns
+        print(f"🔍 Mining patterns ({new_entries} new entries, {miner.counts.cases} low-confidence cases)...\n")
+        suggestions = miner.suggest()
     
-    # Mine patterns
-    print("🔍 Mining patterns...\n")
-    suggestions = miner.mine_new_patterns(logs)
+    # Skip phrases approved in earlier runs
+    suggestions = [s for s in suggestions if s['phrase'] not in normalizer.learned_noise_phrases]
     
     if not suggestions:
         print("✅ No new patterns found. System is performing well!\n")
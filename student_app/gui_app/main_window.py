@@ -14,11 +14,12 @@ from student_app.progress import progress_manager
 from ai_model.model_utils.model_handler import ModelHandler
 from student_app.learning.openai_proxy_client import OpenAIProxyClient
 from system.utils.resource_path import resolve_model_dir, resolve_content_dir, resolve_chroma_db_dir
+from system.rag.followup_session import FollowUpSession
+from system.rag.concept_prefetcher import ConceptPrefetcher
+from system.grading import QuickGrader, GradingCache, acceptable_answers
 from student_app.gui_app.components.grade_selector import GradeSelector
 from student_app.gui_app.components.subject_selector import SubjectSelector
 
-import difflib
-import re
 import tkinter.filedialog as fd
 import tkinter.messagebox as mb
 import os
@@ -60,6 +61,12 @@ class NEBeduApp(ctk.CTk):
         
         self.rag_engine = None
         self._rag_initialized = False
+        # Lets "explain more" / "give an example" continue the last answer
+        self.followup_session = FollowUpSession()
+        self._prefetch_running = False
+        self.concept_prefetcher = None
+        # Verdicts are shared by every student on this machine
+        self.quick_grader = QuickGrader(cache=GradingCache())
         
         self.model_handler = None
         self.model_path = None
@@ -315,6 +322,8 @@ class NEBeduApp(ctk.CTk):
             loader.update_idletasks()
             self.rag_engine.warm_up()  
             self._rag_initialized = True
+            # Warms likely questions of the open concept in the background
+            self.concept_prefetcher = ConceptPrefetcher(self.rag_engine)
             
             loader.update_status("Ready!", "All systems loaded and ready", 1.0)
             loader.update_idletasks()
@@ -386,6 +395,9 @@ class NEBeduApp(ctk.CTk):
         self._update_timer = self.after(delay, func)
 
     def _safe_destroy_widgets(self):
+        # Any navigation is interactive; background warm-up yields to it
+        if self.concept_prefetcher:
+            self.concept_prefetcher.cancel()
         try:
             for widget in self.main_frame.winfo_children():
                 widget.destroy()
@@ -564,6 +576,10 @@ class NEBeduApp(ctk.CTk):
                     view = ConceptDetailView(self.main_frame, concept, self.start_questions, lambda: self.on_topic_selected(self.selected_topic))
                     view.pack(fill='both', expand=True)
                     self._loading = False
+                    if self.concept_prefetcher:
+                        self.concept_prefetcher.start(
+                            concept, self.current_subject_filter, self.current_grade_filter
+                        )
                 self.after(0, show_concept)
             except Exception as e:
                 def show_error():
@@ -602,9 +618,10 @@ class NEBeduApp(ctk.CTk):
         
         def worker():
             user_ans = answer.strip()
-            correct_ans = question.get('answer', '').strip()
+            answers = acceptable_answers(question)
+            correct_ans = answers[0] if answers else ''
             
-            is_correct, explanation = self._grade_answer_with_ai(question['question'], user_ans, correct_ans)
+            is_correct, explanation = self._answer_grader().grade(question['question'], user_ans, answers)
             
             def show_result():
                 progress_manager.update_progress(self.username, self.selected_subject, self.selected_topic, self.selected_concept, question['question'], is_correct)
@@ -657,10 +674,33 @@ class NEBeduApp(ctk.CTk):
         if self._loading: return
         self._loading = True
         self._safe_destroy_widgets()
-        self.ask_view = AskQuestionView(self.main_frame, self.on_ask_submit, self.show_main_menu, self.on_ask_openai)
+        self.ask_view = AskQuestionView(
+            self.main_frame, self.on_ask_submit, self.show_main_menu, self.on_ask_openai,
+            on_prefetch=self.on_ask_prefetch
+        )
         self.ask_view.pack(fill='both', expand=True)
         self._loading = False
 
+    def on_ask_prefetch(self, partial_question):
+        """Runs speculative retrieval for the question being typed."""
+        if self._loading or self._prefetch_running or not self.rag_engine:
+            return
+        self._prefetch_running = True
+        
+        def worker():
+            try:
+                # Stop before searching once the question has been submitted
+                self.rag_engine.prefetch(
+                    partial_question,
+                    subject=self.current_subject_filter,
+                    grade=self.current_grade_filter,
+                    should_cancel=lambda: self._loading
+                )
+            finally:
+                self._prefetch_running = False
+        
+        threading.Thread(target=worker, daemon=True).start()
+
     def on_ask_openai(self, question):
         if self._loading: return
         self._loading = True
@@ -681,62 +721,12 @@ class NEBeduApp(ctk.CTk):
         threading.Thread(target=worker, daemon=True).start()
 
     
-    def _grade_answer_with_ai(self, question_text, user_answer, correct_answer):
-        """Using the model to grade the answer relative to the correct answer."""
-        if not self.model_handler:
-            is_correct = (user_answer.lower() == correct_answer.lower()) or (difflib.SequenceMatcher(None, user_answer.lower(), correct_answer.lower()).ratio() > 0.8)
-            return is_correct, f"The correct answer is: {correct_answer}"
-
-        prompt = (
-            f"Task: Grade the student's answer based on the Correct Answer. Provide helpful, specific feedback.\n\n"
-            f"Example 1:\n"
-            f"Question: What is the function of mitochondria?\n"
-            f"Correct Answer: It generates energy for the cell through respiration.\n"
-            f"Student Answer: It protects the nucleus.\n"
-            f"Verdict: [INCORRECT]\n"
-            f"Feedback: That is incorrect. The nucleus is protected by the nuclear membrane. Mitochondria are the 'powerhouse' of the cell responsible for generating energy (ATP).\n\n"
-            f"Example 2:\n"
-            f"Question: What is 2 + 2?\n"
-            f"Correct Answer: 4\n"
-            f"Student Answer: It is four.\n"
-            f"Verdict: [CORRECT]\n"
-            f"Feedback: Correct! You identified the right number.\n\n"
-            f"Current Task:\n"
-            f"Question: {question_text}\n"
-            f"Correct Answer: {correct_answer}\n"
-            f"Student Answer: {user_answer}\n"
-            f"Verdict:"
-        )
-        
-        try:
-
-            response = self.model_handler.generate_response(prompt, max_tokens=100)
-            
-            response_upper = response.upper()
-            is_correct = "[CORRECT]" in response_upper
-            explanation = response
-            
-            explanation = re.sub(r'^\[.*?\]', '', explanation).strip()
-            
-            if explanation.upper().startswith("VERDICT:"):
-                explanation = explanation[8:].strip()
-                explanation = re.sub(r'^\[.*?\]', '', explanation).strip()
-                
-            if explanation.upper().startswith("FEEDBACK:"):
-                explanation = explanation[9:].strip()
-            
-            explanation = explanation.strip()
-            
-            if not is_correct and "[INCORRECT]" not in response_upper:
-                 
-                 is_correct = (user_answer.lower() == correct_answer.lower())
-            
-            return is_correct, explanation
-            
-        except Exception as e:
-            print(f"AI Grading Error: {e}")
-            is_correct = (user_answer.lower() == correct_answer.lower()) or (difflib.SequenceMatcher(None, user_answer.lower(), correct_answer.lower()).ratio() > 0.8)
-            return is_correct, f"The correct answer is: {correct_answer}"
+    def _answer_grader(self):
+        """Gets the shared grader wired to whichever models are loaded."""
+        self.quick_grader.model_handler = self.model_handler
+        if self.quick_grader.embed_fn is None and self.rag_engine is not None:
+            self.quick_grader.embed_fn = self.rag_engine.embedding_gen.generate_embeddings
+        return self.quick_grader
 
     def on_ask_submit(self, question, answer_length="medium"):
         if self._loading:
@@ -777,22 +767,35 @@ class NEBeduApp(ctk.CTk):
                         self.ask_view.append_answer_token(token)
                     self.after(0, display)
                 
+                def on_event(event, payload):
+                    self.after(0, lambda: self.ask_view.on_stream_event(event, payload))
+                
                 try:
                     response = self.rag_engine.query(
                         query_text=normalized_question,
                         subject=self.current_subject_filter,
-                        stream_callback=on_token
+                        stream_callback=on_token,
+                        grade=self.current_grade_filter,
+                        session=self.followup_session,
+                        event_callback=on_event
                     )
                     
                     confidence = response.get('confidence', 0.5)
                     diagram = response.get('diagram')
                     
                     def finalize():
+                        # Prepared while decoding; the response copy is authoritative
+                        # since its "diagram" event may still be queued behind this
+                        prepared = {}
+                        if 'diagram_prepared' in response:
+                            prepared['prepared_diagram'] = response['diagram_prepared']
                         self.ask_view.finalize_answer(
                             confidence, 
+                            source_info=response.get('source_info'),
                             question=normalized_question,
                             grade=self.selected_grade,
-                            subject=self.current_subject_filter
+                            subject=self.current_subject_filter,
+                            **prepared
                         )
                         
                         if diagram:
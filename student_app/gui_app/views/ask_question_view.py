@@ -9,12 +9,19 @@
 import customtkinter as ctk
 import threading
 
+# finalize_answer default: the engine did not prepare a diagram for this answer
+_NOT_PREPARED = object()
+
 class AskQuestionView(ctk.CTkScrollableFrame):
-    def __init__(self, master, on_submit, on_back, on_ask_openai, *args, **kwargs):
+    PREFETCH_DEBOUNCE_MS = 400  # Typing pause before speculative retrieval
+    
+    def __init__(self, master, on_submit, on_back, on_ask_openai, *args, on_prefetch=None, **kwargs):
         super().__init__(master, *args, **kwargs)
         self.on_submit = on_submit
         self.on_back = on_back
         self.on_ask_openai = on_ask_openai
+        self.on_prefetch = on_prefetch
+        self._prefetch_job = None
         self.spinner_animation_running = False
 
         self.label = ctk.CTkLabel(self, text="Ask a Question", font=ctk.CTkFont(size=22, weight="bold"))
@@ -41,6 +48,8 @@ class AskQuestionView(ctk.CTkScrollableFrame):
         self.entry = ctk.CTkEntry(self, placeholder_text="Type your question here...", width=400, font=ctk.CTkFont(size=16))
         self.entry.pack(pady=10)
         self.entry.bind('<Return>', lambda e: self.submit())
+        if self.on_prefetch:
+            self.entry.bind('<KeyRelease>', self._schedule_prefetch)
 
         self.submit_btn = ctk.CTkButton(self, text="Ask", command=self.submit)
         self.submit_btn.pack(pady=10)
@@ -52,6 +61,10 @@ class AskQuestionView(ctk.CTkScrollableFrame):
         self.answer_box = None
         self.answer_frame = None
         self.streaming_answer = ""
+        self._early_source_info = None
+        self._prepared_diagram = None
+        self._diagram_ready = False
+        self._finalized = False
         
         self.openai_btn = ctk.CTkButton(self, text="Ask OpenAI", command=self.ask_openai, state="disabled")
         self.openai_btn.pack(pady=10)
@@ -59,7 +72,24 @@ class AskQuestionView(ctk.CTkScrollableFrame):
         self.back_btn = ctk.CTkButton(self, text="Back", command=self.on_back, fg_color="#bdbdbd", hover_color="#757575")
         self.back_btn.pack(pady=(30, 0))
 
+    def _schedule_prefetch(self, event=None):
+        """Debounces speculative retrieval on the partial question."""
+        if event is not None and event.keysym == 'Return':
+            return
+        if self._prefetch_job:
+            self.after_cancel(self._prefetch_job)
+        self._prefetch_job = self.after(self.PREFETCH_DEBOUNCE_MS, self._run_prefetch)
+    
+    def _run_prefetch(self):
+        self._prefetch_job = None
+        text = self.entry.get().strip()
+        if text and self.on_prefetch:
+            self.on_prefetch(text)
+    
     def submit(self):
+        if self._prefetch_job:
+            self.after_cancel(self._prefetch_job)
+            self._prefetch_job = None
         question = self.entry.get().strip()
         if question:
             self.set_loading(True)    
@@ -81,6 +111,10 @@ class AskQuestionView(ctk.CTkScrollableFrame):
             self.answer_box = None
             self.answer_frame = None
             self.streaming_answer = ""
+            self._early_source_info = None
+            self._prepared_diagram = None
+            self._diagram_ready = False
+            self._finalized = False
             self.spinner = ctk.CTkLabel(self.result_frame, text="", font=ctk.CTkFont(size=16))
             self.spinner.pack(pady=20)
             self.spinner_animation_running = True
@@ -139,6 +173,9 @@ class AskQuestionView(ctk.CTkScrollableFrame):
                 wrap='word'
             )
             self.answer_box.pack(pady=(10, 10), padx=10, fill='x', expand=False)
+            
+            if self._early_source_info:
+                self._show_source_label(self._early_source_info)
         
         self.streaming_answer += token
         self.answer_box.insert('end', token)
@@ -151,13 +188,26 @@ class AskQuestionView(ctk.CTkScrollableFrame):
                 
         self.update_idletasks()
     
-    def finalize_answer(self, confidence, hints=None, related=None, source_info=None, question=None, grade=None, subject=None):
+    def finalize_answer(self, confidence, hints=None, related=None, source_info=None, question=None, grade=None, subject=None,
+                        prepared_diagram=_NOT_PREPARED):
         self.set_loading(False)
         
         self._current_grade = grade
         self._current_subject = subject
         
-        if question and self.streaming_answer:
+        # The diagram is resolved here once; a late "diagram" event is ignored
+        self._finalized = True
+        if prepared_diagram is not _NOT_PREPARED:
+            self._prepared_diagram = prepared_diagram
+            self._diagram_ready = True
+        
+        if question and self.streaming_answer and self._diagram_ready:
+            # Diagram was prepared during decoding; only the answer checks remain
+            from system.diagrams import finalize_diagram
+            self._on_diagram_generated(
+                finalize_diagram(self._prepared_diagram, question, self.streaming_answer)
+            )
+        elif question and self.streaming_answer:
             try:
                 self.analyzing_label = ctk.CTkLabel(
                     self.answer_frame if self.answer_frame else self.result_frame,
@@ -199,22 +249,47 @@ class AskQuestionView(ctk.CTkScrollableFrame):
         self.answer_frame.update_idletasks()
         
         if source_info and self.answer_frame:
-            source_exists = any(
-                isinstance(w, ctk.CTkLabel) and "Source:" in w.cget("text")
-                for w in self.answer_frame.winfo_children()
-            )
-            
-            if not source_exists:
-                source_label = ctk.CTkLabel(
-                    self.answer_frame, 
-                    text=f"Source: {source_info}", 
-                    font=ctk.CTkFont(size=12), 
-                    text_color="#1976d2"
-                )
-                source_label.pack(pady=(5, 0), padx=10, anchor='w', before=self.answer_box)
+            self._show_source_label(source_info)
         
         self._add_metadata_sections(confidence, hints, related)
 
+    def on_stream_event(self, event, payload):
+        """Handles metadata computed by the RAG engine while the answer streams."""
+        if event == "sources":
+            self._early_source_info = payload.get("source_info")
+            if self._early_source_info and self.answer_frame:
+                self._show_source_label(self._early_source_info)
+        elif event == "diagram" and not self._finalized:
+            self._prepared_diagram = payload.get("prepared")
+            self._diagram_ready = True
+        elif event == "answer":
+            self.replace_answer(payload.get("answer", ""))
+
+    def replace_answer(self, text):
+        """Replaces the streamed tokens with the answer the engine kept."""
+        self.streaming_answer = text
+        if self.answer_box is None:
+            return
+        self.answer_box.delete('1.0', 'end')
+        self.answer_box.insert('end', text)
+        self.answer_box.see('end')
+
+    def _show_source_label(self, source_info):
+        """Adds the source label above the answer once."""
+        source_exists = any(
+            isinstance(w, ctk.CTkLabel) and "Source:" in w.cget("text")
+            for w in self.answer_frame.winfo_children()
+        )
+        
+        if not source_exists:
+            source_label = ctk.CTkLabel(
+                self.answer_frame, 
+                text=f"Source: {source_info}", 
+                font=ctk.CTkFont(size=12), 
+                text_color="#1976d2"
+            )
+            source_label.pack(pady=(5, 0), padx=10, anchor='w', before=self.answer_box)
+
     def _generate_diagram_background(self, question, answer, grade, subject):
         """Runs diagram generation in a separate thread."""
         try:
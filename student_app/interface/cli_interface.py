@@ -16,7 +16,6 @@ the Satya learning system.
 import os
 import sys
 import logging
-import difflib
 from typing import Optional, List, Dict, Any, Tuple
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
@@ -38,9 +37,10 @@ from student_app.progress import progress_manager
 from system.performance.performance_utils import timeit, log_resource_usage
 from system.security.security_utils import validate_username, sanitize_filepath, log_security_event, validate_content_input
 from student_app.learning.openai_proxy_client import OpenAIProxyClient
-import re
-from system.diagrams import generate_diagram_content
+from system.diagrams import generate_diagram_content, finalize_diagram
 from system.rag.rag_retrieval_engine import RAGRetrievalEngine
+from system.rag.followup_session import FollowUpSession
+from system.grading import QuickGrader, GradingCache
 from system.utils.resource_path import resolve_model_dir, resolve_content_dir, resolve_chroma_db_dir
 from student_app.interface.cli_renderer import CLIRenderer
 
@@ -143,6 +143,14 @@ class CLIInterface:
             self.rag_engine = None
             
         self.session = PromptSession(key_bindings=bindings)
+        # Lets "explain more" / "give an example" continue the last answer
+        self.followup_session = FollowUpSession()
+        # Settles clear-cut practice answers without the model
+        self.quick_grader = QuickGrader(
+            model_handler=self.model_handler,
+            embed_fn=self.rag_engine.embedding_gen.generate_embeddings if self.rag_engine else None,
+            cache=GradingCache()
+        )
         self.username = self._prompt_username()
         # Sticky memory for the most recent QA context
         self._last_question_text: Optional[str] = None
@@ -286,8 +294,8 @@ class CLIInterface:
         # Get user's answer (use prompt_toolkit session for consistent input handling)
         answer = self.session.prompt("Your answer: ")
         
-        # Use internal grading logic matching GUI
-        correct, explanation = self._grade_answer_with_ai(question['question'], answer, question.get('answer', ''))
+        # Shared grading logic (same grader as the GUI)
+        correct, explanation = self.quick_grader.grade_question(question, answer)
         
         if correct:
             console.print(Panel(
@@ -354,77 +362,6 @@ class CLIInterface:
             except Exception:
                 pass
             
-    def _grade_answer_with_ai(self, question_text, user_answer, correct_answer):
-        """Using the model to grade the answer relative to the correct answer."""
-        if not self.model_handler:
-            is_correct = (user_answer.lower() == correct_answer.lower()) or \
-                         (difflib.SequenceMatcher(None, user_answer.lower(), correct_answer.lower()).ratio() > 0.8)
-            return is_correct, f"The correct answer is: {correct_answer}"
-
-        if correct_answer:
-            prompt = (
-                f"Task: Grade the student's answer based on the Correct Answer. Provide helpful, specific feedback.\n\n"
-                f"Example 1:\n"
-                f"Question: What is the function of mitochondria?\n"
-                f"Correct Answer: It generates energy for the cell through respiration.\n"
-                f"Student Answer: It protects the nucleus.\n"
-                f"Verdict: [INCORRECT]\n"
-                f"Feedback: That is incorrect. The nucleus is protected by the nuclear membrane. Mitochondria are the 'powerhouse' of the cell responsible for generating energy (ATP).\n\n"
-                f"Example 2:\n"
-                f"Question: What is 2 + 2?\n"
-                f"Correct Answer: 4\n"
-                f"Student Answer: It is four.\n"
-                f"Verdict: [CORRECT]\n"
-                f"Feedback: Correct! You identified the right number.\n\n"
-                f"Current Task:\n"
-                f"Question: {question_text}\n"
-                f"Correct Answer: {correct_answer}\n"
-                f"Student Answer: {user_answer}\n"
-                f"Verdict:"
-            )
-        else:
-            prompt = (
-                f"Task: Evaluate if the student's answer is correct for the given question. Provide specific feedback.\n\n"
-                f"Question: {question_text}\n"
-                f"Student Answer: {user_answer}\n"
-                f"Verdict (Start with [CORRECT] or [INCORRECT]):"
-            )
-        
-        try:
-            response = self.model_handler.generate_response(prompt, max_tokens=100)
-            
-            response_upper = response.upper()
-            is_correct = "[CORRECT]" in response_upper
-            explanation = response
-            
-            explanation = re.sub(r'^\[.*?\]', '', explanation).strip()
-            
-            if explanation.upper().startswith("VERDICT:"):
-                explanation = explanation[8:].strip()
-                explanation = re.sub(r'^\[.*?\]', '', explanation).strip()
-                
-            if explanation.upper().startswith("FEEDBACK:"):
-                explanation = explanation[9:].strip()
-            
-            explanation = explanation.strip()
-            
-            if not is_correct and "[INCORRECT]" not in response_upper:
-                 # If verdict is unclear but valid answer exists, fallback to strict match
-                 if correct_answer:
-                    is_correct = (user_answer.lower() == correct_answer.lower())
-            
-            return is_correct, explanation
-            
-        except Exception as e:
-            logger.error(f"AI Grading Error: {e}")
-            if correct_answer:
-                is_correct = (user_answer.lower() == correct_answer.lower()) or \
-                             (difflib.SequenceMatcher(None, user_answer.lower(), correct_answer.lower()).ratio() > 0.8)
-                return is_correct, f"The correct answer is: {correct_answer}"
-            else:
-                return False, "Could not evaluate answer."
-
-            
     @timeit
     def _handle_free_text_question(self, question: str) -> None:
         """Handle free-text questions using the AI model with streaming."""
@@ -454,6 +391,14 @@ class CLIInterface:
                 else:
                     live_display.update(Panel(full_answer, title="Answer", border_style="green", padding=(1, 2)))
 
+            def event_callback(event, payload):
+                nonlocal full_answer
+                # The engine trimmed a degenerating answer; show what it kept
+                if event == "answer":
+                    full_answer = payload.get("answer", "")
+                    if live_display is not None:
+                        live_display.update(Panel(full_answer, title="Answer", border_style="green", padding=(1, 2)))
+
             # log_resource_usage("Before model inference")
             
             # Use the RAG engine to query and stream the answer
@@ -462,7 +407,10 @@ class CLIInterface:
                 response = self.rag_engine.query(
                     query_text=question,
                     subject="",
-                    stream_callback=stream_callback
+                    stream_callback=stream_callback,
+                    grade=str(self.selected_grade) if self.selected_grade else "",
+                    session=self.followup_session,
+                    event_callback=event_callback
                 )
                 
             finally:
@@ -480,12 +428,18 @@ class CLIInterface:
             # --- Post-Answer Diagram Generation ---
             try: 
                 rag_diagram = response.get('diagram')
-                dynamic_diagram_content = generate_diagram_content(
-                    question=question,
-                    answer=full_answer,
-                    grade=self.selected_grade,
-                    subject=self.selected_subject
-                )
+                if 'diagram_prepared' in response:
+                    # Matched and rendered by the engine while the answer streamed
+                    dynamic_diagram_content = finalize_diagram(
+                        response['diagram_prepared'], question, full_answer
+                    )
+                else:
+                    dynamic_diagram_content = generate_diagram_content(
+                        question=question,
+                        answer=full_answer,
+                        grade=self.selected_grade,
+                        subject=self.selected_subject
+                    )
                 
                 final_diagram = None
                 diagram_type = None
@@ -24,6 +24,8 @@ Usage:
 
 from .diagram_service import (
     generate_diagram_content,
+    prepare_diagram,
+    finalize_diagram,
     should_attempt_diagram,
     should_show_diagram,
 )
@@ -39,6 +41,8 @@ from .diagram_config import (
 
 __all__ = [
     'generate_diagram_content',
+    'prepare_diagram',
+    'finalize_diagram',
     'should_attempt_diagram',
     'should_show_diagram',
     
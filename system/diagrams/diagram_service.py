@@ -14,7 +14,7 @@ Orchestration layer for diagram generation using pre-built YAML library.
 
 import re
 import logging
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 
 from .diagram_library import DiagramLibrary
 from .diagram_renderer import DiagramRenderer
@@ -72,23 +72,22 @@ def should_attempt_diagram(question: str) -> bool:
     return any(re.search(p, q_low) for p in visual_triggers)
 
 
-def generate_diagram_content(
-    question: str, 
-    answer: str,
+def prepare_diagram(
+    question: str,
     grade: Optional[int] = None,
     subject: Optional[str] = None
-) -> Optional[Tuple[str, str]]:
+) -> Optional[Dict]:
     """
-    Core diagram generation using YAML library.
+    Matches and renders a diagram from the question alone.
+    
+    This is the answer-independent part of generate_diagram_content, so it
+    can run while the answer is still being generated.
     
     Returns:
-        Tuple of (formatted_diagram, diagram_type) or None
+        Dict with 'diagram', 'type' and 'confidence', or None
     """
     try:
-        if not question or not answer or len(answer.strip()) < 20:
-            return None
-        
-        if not should_attempt_diagram(question):
+        if not question or not should_attempt_diagram(question):
             return None
         
         library = DiagramLibrary.get_instance()
@@ -97,24 +96,57 @@ def generate_diagram_content(
         if not match:
             logger.debug(f"No diagram match for: {question[:50]}...")
             return None
-
-        if not should_show_diagram(question, answer, match['confidence']):
-            logger.debug(f"Skipping diagram - conditions not met for: {question[:50]}...")
-            return None
         
         diagram_data = match['diagram']
-        diagram_type = diagram_data.get('type', 'process')
-        
         rendered = _render_from_yaml(diagram_data)
         
         if not rendered or len(rendered.strip()) < 10:
             return None
         
-        return rendered, diagram_type
+        return {
+            'diagram': rendered,
+            'type': diagram_data.get('type', 'process'),
+            'confidence': match['confidence']
+        }
         
     except Exception as e:
-        logger.error(f"Diagram generation failed: {e}", exc_info=True)
+        logger.error(f"Diagram preparation failed: {e}", exc_info=True)
+        return None
+
+
+def finalize_diagram(prepared: Optional[Dict], question: str, answer: str) -> Optional[Tuple[str, str]]:
+    """
+    Applies the answer-dependent checks to a prepared diagram.
+    
+    Returns:
+        Tuple of (formatted_diagram, diagram_type) or None
+    """
+    if not prepared or not answer or len(answer.strip()) < 20:
         return None
+    
+    if not should_show_diagram(question, answer, prepared['confidence']):
+        logger.debug(f"Skipping diagram - conditions not met for: {question[:50]}...")
+        return None
+    
+    return prepared['diagram'], prepared['type']
+
+
+def generate_diagram_content(
+    question: str, 
+    answer: str,
+    grade: Optional[int] = None,
+    subject: Optional[str] = None
+) -> Optional[Tuple[str, str]]:
+    """
+    Core diagram generation using YAML library.
+    
+    Returns:
+        Tuple of (formatted_diagram, diagram_type) or None
+    """
+    if not question or not answer or len(answer.strip()) < 20:
+        return None
+    
+    return finalize_diagram(prepare_diagram(question, grade=grade, subject=subject), question, answer)
 
 
 def _render_from_yaml(diagram_data: dict) -> Optional[str]:
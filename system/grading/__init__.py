@@ -0,0 +1,17 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Answer Grading Module for Satya Learning System
+Grades practice answers shared by the GUI and CLI.
+"""
+
+from .quick_grader import QuickGrader, acceptable_answers, parse_verdict
+from .grading_cache import GradingCache
+
+__all__ = ["QuickGrader", "GradingCache", "acceptable_answers", "parse_verdict"]
@@ -0,0 +1,270 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Persistent Grading Cache for Satya Learning System
+
+Stores model verdicts per question so that the same answer ("Mitochondria."
+vs "mitochondria") from any student on the machine is graded once. Entries
+are keyed by a question id and the canonicalised answer, and optionally
+matched by embedding for near-duplicate wording. A question's entries are
+dropped when its acceptable answers change.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .quick_grader import normalize_answer
+
+logger = logging.getLogger(__name__)
+
+
+def question_id(question_text: str) -> str:
+    """Gets a stable id for a question (content questions carry no ids)."""
+    return hashlib.sha1(normalize_answer(question_text).encode('utf-8')).hexdigest()[:16]
+
+
+def answers_version(answers: List[str]) -> str:
+    """Fingerprints a question's acceptable answers."""
+    canonical = "\n".join(sorted(normalize_answer(a) for a in answers))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:12]
+
+
+def _encode_vector(vector: np.ndarray) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float16).tobytes()).decode('ascii')
+
+
+def _decode_vector(text: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(text), dtype=np.float16).astype(np.float32)
+
+
+class GradingCache:
+    """
+    Machine-wide cache of graded answers.
+    """
+
+    def __init__(
+        self,
+        cache_path: str = "satya_data/grading_cache.json",
+        max_entries: int = 5000,
+        similarity_threshold: float = 0.95,
+        autosave: bool = True
+    ):
+        """
+        Initialize grading cache.
+
+        Args:
+            cache_path: JSON file shared by every user on the machine
+            max_entries: Answers kept across all questions
+            similarity_threshold: Embedding cosine for a near-duplicate answer
+            autosave: Write to disk after every put (batch jobs call flush())
+        """
+        self.cache_path = Path(cache_path)
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.autosave = autosave
+        self._lock = threading.Lock()
+        self._mtime = 0.0
+        self._dirty = False
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        # question id -> {"answers": version, "entries": {canonical answer: entry}}
+        self._questions: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load cache from disk (empty on a missing or corrupted file)."""
+        if not self.cache_path.exists():
+            return {}
+        try:
+            self._mtime = self.cache_path.stat().st_mtime
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get("questions", {}) if isinstance(data, dict) else {}
+        except Exception as e:
+            logger.warning(f"Could not load grading cache: {e}")
+            return {}
+
+    def _refresh(self) -> None:
+        """Picks up verdicts written by another session since the last load."""
+        try:
+            mtime = self.cache_path.stat().st_mtime
+        except OSError:
+            return
+        if mtime > self._mtime and not self._dirty:
+            self._questions = self._load()
+
+    def _merge_from_disk(self) -> None:
+        """Keeps verdicts another session saved since our last load."""
+        try:
+            if self.cache_path.stat().st_mtime <= self._mtime:
+                return
+        except OSError:
+            return
+        for qid, bucket in self._load().items():
+            ours = self._questions.get(qid)
+            if ours is None:
+                self._questions[qid] = bucket
+            elif ours.get("answers") == bucket.get("answers"):
+                for key, entry in bucket.get("entries", {}).items():
+                    ours["entries"].setdefault(key, entry)
+        self._evict()
+
+    def _entries(self, question_text: str, answers: List[str], create: bool = False) -> Optional[Dict]:
+        """Gets a question's entries, dropping them if the answers changed."""
+        qid, version = question_id(question_text), answers_version(answers)
+        bucket = self._questions.get(qid)
+        if bucket is not None and bucket.get("answers") != version:
+            self.invalidated += len(bucket.get("entries", {}))
+            logger.info(f"Acceptable answers changed; dropped cached grades for question {qid}")
+            del self._questions[qid]
+            self._dirty = True
+            bucket = None
+        if bucket is None and create:
+            bucket = self._questions[qid] = {"answers": version, "entries": {}}
+        return bucket["entries"] if bucket is not None else None
+
+    def get(self, question_text: str, answers: List[str], user_answer: str) -> Optional[Tuple[bool, str]]:
+        """
+        Gets the verdict cached for the same canonical answer.
+
+        Args:
+            question_text: The question asked
+            answers: Current acceptable answers
+            user_answer: Student answer
+
+        Returns:
+            (is_correct, feedback) or None
+        """
+        with self._lock:
+            self._refresh()
+            entries = self._entries(question_text, answers)
+            entry = entries.get(normalize_answer(user_answer)) if entries else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["used"] = time.time()
+            return entry["correct"], entry["feedback"]
+
+    def find_near(self, question_text: str, answers: List[str], embedding) -> Optional[Tuple[bool, str]]:
+        """
+        Gets the verdict of a near-duplicate answer to the same question.
+
+        Args:
+            question_text: The question asked
+            answers: Current acceptable answers
+            embedding: Unit embedding of the student answer
+
+        Returns:
+            (is_correct, feedback) of the closest cached answer above the threshold, or None
+        """
+        with self._lock:
+            entries = self._entries(question_text, answers)
+            candidates = [e for e in (entries or {}).values() if e.get("embedding")]
+            if not candidates:
+                return None
+
+            matrix = np.stack([_decode_vector(e["embedding"]) for e in candidates])
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-6)
+            similarities = matrix @ np.asarray(embedding, dtype=np.float32).flatten()
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                return None
+
+            self.near_hits += 1
+            entry = candidates[best]
+            entry["used"] = time.time()
+            return entry["correct"], entry["feedback"]
+
+    def put(
+        self,
+        question_text: str,
+        answers: List[str],
+        user_answer: str,
+        is_correct: bool,
+        feedback: str,
+        embedding=None
+    ) -> None:
+        """
+        Stores a model verdict.
+
+        Args:
+            question_text: The question asked
+            answers: Acceptable answers the verdict was graded against
+            user_answer: Student answer
+            is_correct: Verdict
+            feedback: Feedback shown with the verdict
+            embedding: Optional unit embedding for near-duplicate lookups
+        """
+        key = normalize_answer(user_answer)
+        if not key:
+            return
+        with self._lock:
+            entries = self._entries(question_text, answers, create=True)
+            entries[key] = {
+                "correct": bool(is_correct),
+                "feedback": feedback,
+                "embedding": _encode_vector(embedding) if embedding is not None else None,
+                "used": time.time()
+            }
+            self._dirty = True
+            self._evict()
+        if self.autosave:
+            self.flush()
+
+    def _evict(self) -> None:
+        """LRU eviction across questions."""
+        total = sum(len(b["entries"]) for b in self._questions.values())
+        if total <= self.max_entries:
+            return
+        ranked = sorted(
+            ((e.get("used", 0), qid, key) for qid, b in self._questions.items() for key, e in b["entries"].items())
+        )
+        for _, qid, key in ranked[:total - self.max_entries]:
+            del self._questions[qid]["entries"][key]
+            if not self._questions[qid]["entries"]:
+                del self._questions[qid]
+
+    def flush(self) -> None:
+        """Writes the cache to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                self._merge_from_disk()
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_path.with_suffix(".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"version": 1, "questions": self._questions}, f)
+                os.replace(tmp_path, self.cache_path)
+                self._mtime = self.cache_path.stat().st_mtime
+                self._dirty = False
+            except Exception as e:
+                logger.warning(f"Could not save grading cache: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Gets grading cache statistics."""
+        return {
+            "questions": len(self._questions),
+            "entries": sum(len(b["entries"]) for b in self._questions.values()),
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "invalidated": self.invalidated
+        }
@@ -0,0 +1,435 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Quick Answer Grader for Satya Learning System
+
+Grades a practice answer against every acceptable answer with cheap checks
+first: normalised exact match, content-word overlap and one batched
+embedding cosine. Only answers that land between the confident-correct and
+confident-wrong thresholds go to the few-shot LLM prompt, which takes
+seconds per call on an i3. An answer is never accepted outright when it
+pads the reference with other content, flips its negation, or swaps one of
+its terms ("increases" for "decreases"); short and numeric answers need
+shared words before an embedding match can accept them.
+"""
+
+import difflib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r'[^\w\s]')
+_SPACES = re.compile(r'\s+')
+_DIGIT = re.compile(r'\d')
+_NEGATION = re.compile(
+    r"\b(?:not|no|never|none|nothing|neither|nor|cannot|without"
+    r"|(?:is|are|was|were|do|does|did|has|have|had|ca|can|could|would|should|wo)n'?t)\b"
+)
+
+STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'is', 'are', 'was', 'were', 'be', 'been', 'it', 'its',
+    'of', 'to', 'in', 'on', 'at', 'by', 'for', 'from', 'with', 'as', 'and',
+    'or', 'that', 'this', 'these', 'those', 'which', 'who', 'what', 'i',
+    'think', 'answer', 'my', 'so', 'do', 'does', 'called', 'known'
+})
+
+# Checks that settle an answer without the model
+QUICK_METHODS = ("exact", "overlap", "similar", "dissimilar", "cached")
+
+FEW_SHOT_PROMPT = (
+    "Task: Grade the student's answer based on the Correct Answer. Provide helpful, specific feedback.\n\n"
+    "Example 1:\n"
+    "Question: What is the function of mitochondria?\n"
+    "Correct Answer: It generates energy for the cell through respiration.\n"
+    "Student Answer: It protects the nucleus.\n"
+    "Verdict: [INCORRECT]\n"
+    "Feedback: That is incorrect. The nucleus is protected by the nuclear membrane. Mitochondria are the 'powerhouse' of the cell responsible for generating energy (ATP).\n\n"
+    "Example 2:\n"
+    "Question: What is 2 + 2?\n"
+    "Correct Answer: 4\n"
+    "Student Answer: It is four.\n"
+    "Verdict: [CORRECT]\n"
+    "Feedback: Correct! You identified the right number.\n\n"
+    "Current Task:\n"
+    "Question: {question}\n"
+    "Correct Answer: {correct}\n"
+    "Student Answer: {student}\n"
+    "Verdict:"
+)
+
+OPEN_PROMPT = (
+    "Task: Evaluate if the student's answer is correct for the given question. Provide specific feedback.\n\n"
+    "Question: {question}\n"
+    "Student Answer: {student}\n"
+    "Verdict (Start with [CORRECT] or [INCORRECT]):"
+)
+
+
+def normalize_answer(text: str) -> str:
+    """Lowercases an answer and drops punctuation and repeated spaces."""
+    return _SPACES.sub(' ', _NON_WORD.sub(' ', (text or '').lower())).strip()
+
+
+def content_words(text: str) -> set:
+    """Gets the non-stop-words of a normalised answer."""
+    return {w for w in normalize_answer(text).split() if w not in STOP_WORDS}
+
+
+def is_negated(text: str) -> bool:
+    """Checks whether an answer contains a negation such as "not" or "isn't"."""
+    return bool(_NEGATION.search((text or '').lower()))
+
+
+def acceptable_answers(question: Dict[str, Any]) -> List[str]:
+    """
+    Gets the reference answers of a question.
+
+    Args:
+        question: Question data with 'acceptable_answers' or a single 'answer'
+
+    Returns:
+        Non-empty reference answers
+    """
+    answers = question.get('acceptable_answers') or []
+    if isinstance(answers, str):
+        answers = [answers]
+    if not answers and question.get('answer'):
+        answers = [question['answer']]
+    return [a.strip() for a in answers if isinstance(a, str) and a.strip()]
+
+
+def parse_verdict(response: str, user_answer: str, correct_answer: str) -> Tuple[bool, str]:
+    """
+    Parses a [CORRECT]/[INCORRECT] verdict and feedback from model output.
+
+    Args:
+        response: Text generated after the "Verdict:" prompt
+        user_answer: Student answer (strict-match fallback)
+        correct_answer: Reference answer used in the prompt
+
+    Returns:
+        (is_correct, feedback)
+    """
+    response_upper = response.upper()
+    is_correct = "[CORRECT]" in response_upper
+
+    explanation = re.sub(r'^\[.*?\]', '', response).strip()
+    if explanation.upper().startswith("VERDICT:"):
+        explanation = explanation[8:].strip()
+        explanation = re.sub(r'^\[.*?\]', '', explanation).strip()
+    if explanation.upper().startswith("FEEDBACK:"):
+        explanation = explanation[9:].strip()
+    explanation = explanation.strip()
+
+    if not is_correct and "[INCORRECT]" not in response_upper and correct_answer:
+        # Verdict unclear: fall back to a strict match
+        is_correct = user_answer.lower() == correct_answer.lower()
+
+    return is_correct, explanation
+
+
+class QuickGrader:
+    """
+    Grades answers without the model when the verdict is clear-cut.
+    """
+
+    def __init__(
+        self,
+        model_handler=None,
+        embed_fn: Optional[Callable] = None,
+        correct_overlap: float = 0.8,
+        correct_precision: float = 0.5,
+        correct_similarity: float = 0.85,
+        incorrect_similarity: float = 0.3,
+        max_cached_references: int = 256,
+        feedback: bool = True,
+        cache=None
+    ):
+        """
+        Initialize quick grader.
+
+        Args:
+            model_handler: Handler with generate_response() for ambiguous answers
+            embed_fn: Batch embedding function (list of texts -> 2D array)
+            correct_overlap: Reference content words covered to accept outright
+            correct_precision: Share of the answer's content words that must
+                come from the reference for an overlap accept
+            correct_similarity: Cosine at or above which an answer is correct
+            incorrect_similarity: Cosine below which an answer sharing no
+                content words with any reference is wrong
+            max_cached_references: Questions (and answers) whose embeddings are kept
+            feedback: Ask the model for a feedback sentence, not just the verdict
+            cache: GradingCache of earlier model verdicts, shared across users
+        """
+        self.model_handler = model_handler
+        self.embed_fn = embed_fn
+        self.correct_overlap = correct_overlap
+        self.correct_precision = correct_precision
+        self.correct_similarity = correct_similarity
+        self.incorrect_similarity = incorrect_similarity
+        self.max_cached_references = max_cached_references
+        self.feedback = feedback
+        self.cache = cache
+        self._reference_embeddings: "OrderedDict[Tuple[str, ...], np.ndarray]" = OrderedDict()
+        self._answer_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.decisions: Dict[str, int] = {
+            "exact": 0, "overlap": 0, "similar": 0, "dissimilar": 0,
+            "cached": 0, "llm": 0, "fallback": 0
+        }
+
+    def grade_question(self, question: Dict[str, Any], user_answer: str) -> Tuple[bool, str]:
+        """Grades an answer to a content question (see grade())."""
+        return self.grade(question.get('question', ''), user_answer, acceptable_answers(question))
+
+    def grade(self, question_text: str, user_answer: str, answers: List[str]) -> Tuple[bool, str]:
+        """
+        Grades a student answer.
+
+        Args:
+            question_text: The question asked
+            user_answer: Student answer
+            answers: Acceptable reference answers
+
+        Returns:
+            (is_correct, feedback)
+        """
+        is_correct, explanation, _ = self.grade_detailed(question_text, user_answer, answers)
+        return is_correct, explanation
+
+    def grade_detailed(
+        self,
+        question_text: str,
+        user_answer: str,
+        answers: List[str],
+        use_model: bool = True
+    ) -> Optional[Tuple[bool, str, str]]:
+        """
+        Grades a student answer and reports which check decided it.
+
+        Args:
+            question_text: The question asked
+            user_answer: Student answer
+            answers: Acceptable reference answers
+            use_model: Run the model for ambiguous answers; when False they
+                return None so a caller can batch them
+
+        Returns:
+            (is_correct, feedback, method), or None if the model is needed
+        """
+        user_answer = (user_answer or '').strip()
+        answers = [a for a in answers if a]
+
+        if self.cache is not None:
+            hit = self.cache.get(question_text, answers, user_answer)
+            if hit is not None:
+                self._count("cached")
+                return (*hit, "cached")
+
+        verdict, method, reference = self.quick_verdict(user_answer, answers)
+        if verdict is not None:
+            self._count(method)
+            return verdict, self._verdict_message(verdict, reference), method
+
+        embedding = self.answer_embedding(user_answer) if self.cache is not None else None
+        if embedding is not None:
+            hit = self.cache.find_near(question_text, answers, embedding)
+            if hit is not None:
+                self._count("cached")
+                return (*hit, "cached")
+
+        if not use_model:
+            return None
+
+        is_correct, explanation, method = self._grade_with_model(question_text, user_answer, answers, reference)
+        self._count(method)
+        if method == "llm" and self.cache is not None:
+            self.cache.put(question_text, answers, user_answer, is_correct, explanation, embedding)
+        return is_correct, explanation, method
+
+    def quick_verdict(self, user_answer: str, answers: List[str]) -> Tuple[Optional[bool], str, str]:
+        """
+        Decides an answer from lexical and embedding checks alone.
+
+        Overlap accepts need the answer to cover the reference (recall) and
+        to stay on it (precision); overlap and similarity accepts also need
+        the answer and the reference to agree on negation. Similarity
+        accepts further need lexical support (see _lexically_supported).
+        Anything else is left ambiguous.
+
+        Args:
+            user_answer: Student answer
+            answers: Acceptable reference answers
+
+        Returns:
+            (verdict or None when ambiguous, deciding check, closest reference)
+        """
+        if not answers:
+            return None, "", ""
+        normalized = normalize_answer(user_answer)
+        if not normalized:
+            return False, "dissimilar", answers[0]
+
+        for answer in answers:
+            if normalized == normalize_answer(answer):
+                return True, "exact", answer
+
+        negated = is_negated(user_answer)
+        student_words = content_words(user_answer)
+        overlaps = []
+        for answer in answers:
+            reference_words = content_words(answer)
+            covered = len(student_words & reference_words)
+            overlaps.append((covered / len(reference_words) if reference_words else 0.0, covered))
+        best = max(range(len(answers)), key=lambda i: overlaps[i])
+        for answer, (recall, covered) in zip(answers, overlaps):
+            precision = covered / len(student_words) if student_words else 0.0
+            if (recall >= self.correct_overlap and precision >= self.correct_precision
+                    and is_negated(answer) == negated):
+                return True, "overlap", answer
+
+        similarities = self._similarities(user_answer, answers)
+        if similarities is None:
+            return None, "", answers[best]
+
+        closest = int(np.argmax(similarities))
+        if (similarities[closest] >= self.correct_similarity and is_negated(answers[closest]) == negated
+                and self._lexically_supported(user_answer, student_words, answers[closest])):
+            return True, "similar", answers[closest]
+        shares_words = any(covered for _, covered in overlaps)
+        if similarities[closest] < self.incorrect_similarity and not shares_words:
+            return False, "dissimilar", answers[closest]
+        return None, "", answers[closest]
+
+    @staticmethod
+    def _lexically_supported(user_answer: str, student_words: set, reference: str) -> bool:
+        """
+        Checks that an embedding match is not a near-miss such as
+        "mitosis"/"meiosis", "increases"/"decreases" or "4"/"5".
+
+        An answer sharing content words with the reference must not replace
+        any of its terms (miss a reference word while adding one of its own).
+        An answer sharing none is only trusted as a paraphrase: more than
+        three words and no numbers.
+        """
+        reference_words = content_words(reference)
+        if student_words & reference_words:
+            return not (reference_words - student_words and student_words - reference_words)
+        return len(normalize_answer(user_answer).split()) > 3 and not _DIGIT.search(user_answer)
+
+    def _similarities(self, user_answer: str, answers: List[str]) -> Optional[np.ndarray]:
+        """Cosine of the answer against every reference in one batched encode."""
+        if self.embed_fn is None:
+            return None
+
+        key, answer_key = tuple(answers), normalize_answer(user_answer)
+        with self._lock:
+            references = self._reference_embeddings.get(key)
+            if references is not None:
+                self._reference_embeddings.move_to_end(key)
+            student = self._answer_embeddings.get(answer_key)
+
+        texts = ([] if student is not None else [user_answer]) + ([] if references is not None else answers)
+        if texts:
+            try:
+                vectors = np.atleast_2d(np.asarray(self.embed_fn(texts), dtype=np.float32))
+            except Exception as e:
+                logger.warning(f"Answer embedding failed, skipping similarity check: {e}")
+                return None
+            vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            if student is None:
+                student, vectors = vectors[0], vectors[1:]
+            if references is None:
+                references = vectors
+
+            with self._lock:
+                self._reference_embeddings[key] = references
+                self._answer_embeddings[answer_key] = student
+                for cache in (self._reference_embeddings, self._answer_embeddings):
+                    while len(cache) > self.max_cached_references:
+                        cache.popitem(last=False)
+
+        return references @ student
+
+    def answer_embedding(self, user_answer: str) -> Optional[np.ndarray]:
+        """Gets the unit embedding computed for an answer during grading."""
+        with self._lock:
+            return self._answer_embeddings.get(normalize_answer(user_answer))
+
+    def _grade_with_model(
+        self,
+        question_text: str,
+        user_answer: str,
+        answers: List[str],
+        reference: str
+    ) -> Tuple[bool, str, str]:
+        """Runs the few-shot prompt against the closest reference answer."""
+        correct_answer = reference or (answers[0] if answers else '')
+
+        if not self.model_handler:
+            return (*self._fallback(user_answer, answers, correct_answer), "fallback")
+
+        if correct_answer:
+            prompt = FEW_SHOT_PROMPT.format(question=question_text, correct=correct_answer, student=user_answer)
+        else:
+            prompt = OPEN_PROMPT.format(question=question_text, student=user_answer)
+
+        try:
+            verdict = None
+            if hasattr(self.model_handler, 'generate_verdict'):
+                verdict = self.model_handler.generate_verdict(prompt, feedback=self.feedback)
+            if verdict is not None:
+                is_correct, explanation = verdict
+                return is_correct, explanation or self._verdict_message(is_correct, correct_answer), "llm"
+
+            # Handlers without grammar support: free text, parsed afterwards
+            response = self.model_handler.generate_response(prompt, max_tokens=100)
+            return (*parse_verdict(response, user_answer, correct_answer), "llm")
+        except Exception as e:
+            logger.error(f"AI Grading Error: {e}")
+            return (*self._fallback(user_answer, answers, correct_answer), "fallback")
+
+    @staticmethod
+    def _verdict_message(is_correct: bool, correct_answer: str) -> str:
+        if is_correct:
+            return "Correct! Your answer matches the expected answer."
+        return f"The correct answer is: {correct_answer}" if correct_answer else "That is not correct."
+
+    @staticmethod
+    def _fallback(user_answer: str, answers: List[str], correct_answer: str) -> Tuple[bool, str]:
+        if not answers:
+            return False, "Could not evaluate answer."
+        lowered = user_answer.lower()
+        is_correct = any(
+            lowered == a.lower() or difflib.SequenceMatcher(None, lowered, a.lower()).ratio() > 0.8
+            for a in answers
+        )
+        return is_correct, f"The correct answer is: {correct_answer}"
+
+    def _count(self, method: str) -> None:
+        with self._lock:
+            self.decisions[method] = self.decisions.get(method, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Gets grading statistics."""
+        graded = sum(self.decisions.values())
+        avoided = sum(self.decisions[m] for m in QUICK_METHODS)
+        return {
+            "graded": graded,
+            "llm_calls": self.decisions["llm"],
+            "llm_calls_avoided": avoided,
+            "llm_avoided_ratio": round(avoided / graded, 3) if graded else 0.0,
+            "decisions": dict(self.decisions)
+        }
@@ -16,14 +16,25 @@ import json
 import os
 import re
 import hashlib
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 
 from system.input_processing.input_normalizer import InputNormalizer
+from system.input_processing.batch_normalizer import normalize_many
+from system.input_processing.log_writer import LogWriter
+from system.input_processing.spell_corrector import LanguageToolCorrector, SymSpellCorrector
 
 logger = logging.getLogger(__name__)
 
+_CONTENT_WORD = re.compile(r'[a-z0-9]{4,}')
+
+
+def _content_words(text: str) -> Set[str]:
+    return set(_CONTENT_WORD.findall(text.lower()))
+
 
 class AdaptiveNormalizer:
     """Production wrapper with learning and spell correction."""
@@ -32,25 +43,46 @@ class AdaptiveNormalizer:
         self,
         normalizer: Optional[InputNormalizer] = None,
         log_dir: str = "satya_data/normalization_logs",
-        enable_spell_check: bool = True
+        enable_spell_check: bool = True,
+        spell_backend: str = "auto",
+        spell_index_path: str = "satya_data/spell_index.json.gz",
+        log_writer: Optional[LogWriter] = None,
+        compact_every: int = 1000
     ):
         self.normalizer = normalizer or InputNormalizer()
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
+        # Log files are appended by one background thread, shared process-wide
+        self.log_writer = log_writer or LogWriter.shared()
         self.feedback_db: List[Dict] = []
         self.feedback_file = self.log_dir / "feedback_db.jsonl"
+        self.review_file = self.log_dir / "low_confidence_cases.jsonl"
         
-        # Spell correction cache
+        # Spell correction cache: compacted snapshot + append-only log of new entries
         self.spell_cache_file = self.log_dir / "spell_cache.json"
+        self.spell_log_file = self.log_dir / "spell_cache.log.jsonl"
+        self.compact_every = compact_every
+        self._spell_log_entries = 0
         self.spell_cache = self._load_spell_cache()
         self.cache_hits = 0
         self.cache_misses = 0
+        self._spell_lock = threading.Lock()
+        self._spell_executor: Optional[ThreadPoolExecutor] = None
         
-        # Grammar + spell checker 
+        # Spell checker: in-process SymSpell when its index exists, LanguageTool
+        # otherwise ("auto"), or either one on request. Loaded in the
+        # background; questions skip spell-check until it is ready.
+        self.spell_backend = spell_backend
         self.spell_checker = None
+        self.spell_ready = threading.Event()
         if enable_spell_check:
-            self.spell_checker = self._load_language_tool()
+            threading.Thread(
+                target=self._load_spell_checker, args=(spell_backend, spell_index_path),
+                name="spell-loader", daemon=True
+            ).start()
+        else:
+            self.spell_ready.set()
         
         logger.info("AdaptiveNormalizer initialized")
     
@@ -59,7 +91,8 @@ class AdaptiveNormalizer:
         raw_question: str,
         user_id: Optional[str] = None,
         add_scaffolding: bool = False,
-        enable_spell_check: bool = True
+        enable_spell_check: bool = True,
+        log: bool = True
     ) -> Dict[str, any]:
         original = raw_question
         
@@ -71,41 +104,130 @@ class AdaptiveNormalizer:
                 self.cache_hits += 1
                 logger.debug(f"Cache HIT: {cache_key[:8]}...")
             elif self._should_spell_check(raw_question):
-                # Run LanguageTool only if needed
-                corrected = self._correct_text(raw_question)
-                if corrected != raw_question:
-                    # Cache the correction
-                    self.spell_cache[cache_key] = {
-                        "corrected": corrected,
-                        "timestamp": datetime.now().isoformat(),
-                        "hit_count": 1
-                    }
-                    self._save_spell_cache()
-                raw_question = corrected
+                # Run the spell checker only if needed
+                raw_question = self._correct_and_cache(raw_question)
                 self.cache_misses += 1
             else:
                 logger.debug(f"Spell-check SKIPPED (heuristic)")
         
         result = self.normalizer.normalize(raw_question, add_scaffolding=add_scaffolding)
         
-        self._log_normalization(
-            original=original,
-            corrected=raw_question,
-            result=result,
-            user_id=user_id
-        )
+        if log:
+            self._log_normalization(
+                original=original,
+                corrected=raw_question,
+                result=result,
+                user_id=user_id
+            )
         
         return result
     
+    def normalize_speculative(
+        self,
+        raw_question: str,
+        user_id: Optional[str] = None,
+        add_scaffolding: bool = False,
+        enable_spell_check: bool = True,
+        log: bool = True
+    ) -> Tuple[Dict[str, any], Optional[Future]]:
+        """
+        Normalizes the question as typed and spell-checks it in the background.
+
+        Cached corrections are applied straight away. On a cache miss the
+        correction runs on a worker thread and is cached when it finishes,
+        whether or not the caller waits for it.
+
+        Args:
+            raw_question: Question as typed
+            user_id: Student identifier for the learning log
+            add_scaffolding: Add Phi-1.5 reasoning scaffolding
+            enable_spell_check: Allow spell correction for this question
+            log: Record the question in the learning log (False for
+                questions the student did not ask, such as prefetches)
+
+        Returns:
+            The normalization result, and a future resolving to the corrected
+            text (None when no background check was started)
+        """
+        original, future = raw_question, None
+        
+        if enable_spell_check and self.spell_checker:
+            cache_key = self._get_cache_key(raw_question)
+            if cache_key in self.spell_cache:
+                raw_question = self.spell_cache[cache_key]["corrected"]
+                self.cache_hits += 1
+            elif self._should_spell_check(raw_question):
+                if self._spell_executor is None:
+                    self._spell_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spell-check")
+                future = self._spell_executor.submit(self._correct_and_cache, raw_question)
+                self.cache_misses += 1
+        
+        result = self.normalizer.normalize(raw_question, add_scaffolding=add_scaffolding)
+        if log:
+            self._log_normalization(original=original, corrected=raw_question, result=result, user_id=user_id)
+        return result, future
+    
+    def apply_correction(
+        self,
+        result: Dict[str, any],
+        corrected: Optional[str],
+        add_scaffolding: bool = False
+    ) -> Optional[Dict[str, any]]:
+        """
+        Re-normalizes a background correction if it changes the question.
+
+        Args:
+            result: Normalization of the uncorrected question
+            corrected: Text from the normalize_speculative future
+            add_scaffolding: Add Phi-1.5 reasoning scaffolding
+
+        Returns:
+            The corrected normalization, or None when the correction only
+            touches short words, case or punctuation
+        """
+        if not corrected:
+            return None
+        updated = self.normalizer.normalize(corrected, add_scaffolding=add_scaffolding)
+        if _content_words(updated["clean_question"]) == _content_words(result["clean_question"]):
+            return None
+        return updated
+    
+    def normalize_many(
+        self,
+        questions: Iterable[str],
+        workers: Optional[int] = None,
+        chunksize: int = 256,
+        add_scaffolding: bool = False
+    ) -> Iterator[Dict[str, any]]:
+        """
+        Normalizes many questions with the current rules, without logging.
+
+        Spell correction is not applied; pass already-corrected text (the
+        'corrected' field of the feedback log) to measure rule changes.
+
+        Args:
+            questions: Question texts (consumed lazily)
+            workers: Worker processes (None for one per CPU, 0 or 1 to run in-process)
+            chunksize: Questions sent to a worker at a time
+            add_scaffolding: Add Phi-1.5 reasoning scaffolding
+
+        Returns:
+            Iterator of normalization results, in input order
+        """
+        return normalize_many(
+            questions, self.normalizer.learnable_db_path,
+            workers=workers, chunksize=chunksize, add_scaffolding=add_scaffolding
+        )
+    
     def get_low_confidence_cases(self, limit: int = 100) -> List[Dict]:
         """Gets recent low-confidence cases for review."""
-        review_file = self.log_dir / "low_confidence_cases.jsonl"
-        if not review_file.exists():
+        self.log_writer.flush()
+        if not self.review_file.exists():
             return []
         
         try:
             cases = []
-            with open(review_file, 'r', encoding='utf-8') as f:
+            with open(self.review_file, 'r', encoding='utf-8') as f:
                 for line in f:
                     if line.strip():
                         cases.append(json.loads(line))
@@ -121,19 +243,77 @@ class AdaptiveNormalizer:
         normalized = text.lower().strip()
         return hashlib.md5(normalized.encode()).hexdigest()
     
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until the spell checker has finished loading.
+
+        Args:
+            timeout: Seconds to wait (None waits indefinitely)
+
+        Returns:
+            True once loading finished (the checker may still be None if unavailable)
+        """
+        return self.spell_ready.wait(timeout)
+    
+    def close(self):
+        """
+        Writes queued log entries, compacts the spell cache and stops the
+        spell-check worker. The log writer is shared and keeps running.
+        """
+        if self._spell_executor is not None:
+            self._spell_executor.shutdown(wait=True)
+            self._spell_executor = None
+        if self._spell_log_entries:
+            self.log_writer.call(self._compact_spell_cache)
+        self.log_writer.flush()
+    
+    def _correct_and_cache(self, text: str) -> str:
+        """Corrects text and caches the correction when it changed."""
+        corrected = self._correct_text(text)
+        if corrected != text:
+            key = self._get_cache_key(text)
+            entry = {
+                "corrected": corrected,
+                "timestamp": datetime.now().isoformat(),
+                "hit_count": 1
+            }
+            with self._spell_lock:
+                self.spell_cache[key] = entry
+                self._spell_log_entries += 1
+                compact = self._spell_log_entries >= self.compact_every
+                if compact:
+                    self._spell_log_entries = 0
+            self.log_writer.write(self.spell_log_file, {"key": key, **entry})
+            if compact:
+                self.log_writer.call(self._compact_spell_cache)
+        return corrected
+    
     def _load_spell_cache(self) -> Dict:
-        """Load spell correction cache from disk."""
-        if not self.spell_cache_file.exists():
-            return {}
+        """Load spell correction cache from the snapshot and replay the log."""
+        cache = {}
+        if self.spell_cache_file.exists():
+            try:
+                with open(self.spell_cache_file, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except Exception as e:
+                logger.warning(f"Could not load spell cache: {e}")
         
-        try:
-            with open(self.spell_cache_file, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
+        if self.spell_log_file.exists():
+            try:
+                with open(self.spell_log_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                            cache[entry.pop("key")] = entry
+                            self._spell_log_entries += 1
+                        except (ValueError, KeyError):
+                            continue
+            except Exception as e:
+                logger.warning(f"Could not replay spell cache log: {e}")
+        
+        if cache:
             logger.info(f"Loaded spell cache: {len(cache)} entries")
-            return cache
-        except Exception as e:
-            logger.warning(f"Could not load spell cache: {e}")
-            return {}
+        return cache
     
     def _save_spell_cache(self):
         """Save spell correction cache to disk."""
@@ -147,10 +327,26 @@ class AdaptiveNormalizer:
                 )
                 self.spell_cache = dict(sorted_cache[:10000])
             
-            with open(self.spell_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.spell_cache, f, indent=2)
+            tmp_file = self.spell_cache_file.with_suffix(".json.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.spell_cache, f, separators=(',', ':'))
+            os.replace(tmp_file, self.spell_cache_file)
+            return True
         except Exception as e:
             logger.warning(f"Could not save spell cache: {e}")
+            return False
+    
+    def _compact_spell_cache(self):
+        """Folds the append-only log into the snapshot (runs on the writer thread)."""
+        with self._spell_lock:
+            if not self._save_spell_cache():
+                return
+        try:
+            # Entries queued after this task are appended to the fresh log
+            open(self.spell_log_file, 'w').close()
+            logger.debug(f"Compacted spell cache: {len(self.spell_cache)} entries")
+        except Exception as e:
+            logger.warning(f"Could not truncate spell cache log: {e}")
     
     def _should_spell_check(self, text: str) -> bool:
         words = text.split()
@@ -180,11 +376,32 @@ class AdaptiveNormalizer:
         
         return False
     
-    def _load_language_tool(self):
+    def _load_spell_checker(self, backend: str, index_path: str):
+        """Loads the spell backend (runs on the spell-loader thread)."""
+        try:
+            checker = None
+            if backend != "languagetool":
+                checker = self._load_symspell(index_path)
+                if checker is None:
+                    logger.warning(f"No usable spell index at {index_path} (built by scripts/ingest_content.py "
+                                   f"or scripts/build_spell_index.py)")
+            if checker is None and backend != "symspell":
+                checker = self._load_language_tool()
+            if checker is None:
+                logger.warning(f"Spell-check disabled: no {backend} spell backend available")
+            self.spell_checker = checker
+        finally:
+            self.spell_ready.set()
+    
+    def _load_symspell(self, index_path: str) -> Optional[SymSpellCorrector]:
+        """Load the precomputed curriculum spell index."""
+        corrector = SymSpellCorrector(index_path)
+        return corrector if corrector.ready else None
+    
+    def _load_language_tool(self) -> Optional[LanguageToolCorrector]:
         """Load LanguageTool for offline correction."""
         try:
-            import language_tool_python
-            tool = language_tool_python.LanguageTool('en-US')
+            tool = LanguageToolCorrector('en-US')
             logger.info("LanguageTool loaded (offline mode)")
             return tool
         except ImportError:
@@ -199,15 +416,7 @@ class AdaptiveNormalizer:
             return text
         
         try:
-            import language_tool_python
-            matches = self.spell_checker.check(text)
-            if not matches:
-                return text
-            
-            corrected = language_tool_python.utils.correct(text, matches)
-            if corrected != text:
-                logger.debug(f"Corrected: '{text}' -> '{corrected}'")
-            return corrected
+            return self.spell_checker.correct(text)
         except Exception as e:
             logger.debug(f"Correction error: {e}")
             return text
@@ -226,11 +435,13 @@ class AdaptiveNormalizer:
             "original": original,
             "corrected": corrected,
             "clean": result["clean_question"],
+            "intent": result.get("intent"),
             "confidence": result["confidence"],
             "notes": result["notes"],
         }
         
         self.feedback_db.append(log_entry)
+        self.log_writer.write(self.feedback_file, log_entry)
         
         if result["confidence"] < 0.7:
             self._flag_for_review(log_entry)
@@ -239,21 +450,12 @@ class AdaptiveNormalizer:
             self._persist_feedback()
     
     def _flag_for_review(self, log_entry: Dict):
-        review_file = self.log_dir / "low_confidence_cases.jsonl"
-        try:
-            with open(review_file, 'a', encoding='utf-8') as f:
-                json.dump(log_entry, f)
-                f.write('\n')
-        except Exception as e:
-            logger.warning(f"Could not flag for review: {e}")
+        self.log_writer.write(self.review_file, log_entry)
     
     def _persist_feedback(self):
-        try:
-            with open(self.feedback_file, 'a', encoding='utf-8') as f:
-                for entry in self.feedback_db:
-                    json.dump(entry, f)
-                    f.write('\n')
-            self.feedback_db = []
-            logger.debug("Persisted feedback")
-        except Exception as e:
-            logger.warning(f"Could not persist feedback: {e}")
+        """Checkpoint: waits for queued feedback to reach disk, then clears the buffer."""
+        if not self.log_writer.flush():
+            logger.warning("Could not persist feedback: log writer is behind")
+            return
+        self.feedback_db = []
+        logger.debug("Persisted feedback")
@@ -0,0 +1,244 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Batch Normalization for Offline Log Reprocessing
+
+Re-runs the rule engine over logged questions (feedback_db.jsonl) after noise
+phrases or abbreviations change, and reports which clean questions, intents
+and confidences moved. Input is streamed in chunks to a process pool with a
+bounded number of chunks in flight, results come back in input order, and
+nothing is logged or cached along the way.
+"""
+
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from system.input_processing.input_normalizer import InputNormalizer
+from system.input_processing.normalization_cache import NormalizationCache
+
+logger = logging.getLogger(__name__)
+
+DIFF_FIELDS = {"clean": "clean_question", "intent": "intent", "confidence": "confidence"}
+
+# One normalizer per worker process, built by _init_worker
+_worker_normalizer: Optional[InputNormalizer] = None
+_worker_scaffolding = False
+
+
+def _init_worker(learnable_db_path: str, add_scaffolding: bool) -> None:
+    global _worker_normalizer, _worker_scaffolding
+    # Bulk runs would only evict the live classroom questions from the shared cache
+    _worker_normalizer = InputNormalizer(learnable_db_path, cache=NormalizationCache(0))
+    _worker_scaffolding = add_scaffolding
+
+
+def _normalize_chunk(questions: List[str]) -> List[Dict]:
+    return [_worker_normalizer.normalize(q, add_scaffolding=_worker_scaffolding) for q in questions]
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_feedback_log(log_file: str) -> Iterator[Dict]:
+    """
+    Streams entries of a feedback log, skipping malformed lines.
+
+    Args:
+        log_file: JSONL file written by AdaptiveNormalizer
+
+    Yields:
+        Log entries with a 'line' number added
+    """
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping malformed log line {number}")
+                continue
+            entry["line"] = number
+            yield entry
+
+
+def normalize_many(
+    questions: Iterable[str],
+    learnable_db_path: str = "satya_data/input_normalizer_phrases.json",
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+    add_scaffolding: bool = False
+) -> Iterator[Dict]:
+    """
+    Normalizes questions in bulk without logging or spell-checking.
+
+    Args:
+        questions: Question texts (consumed lazily)
+        learnable_db_path: Learned noise phrases to normalize with
+        workers: Worker processes (None for one per CPU, 0 or 1 to run in-process)
+        chunksize: Questions sent to a worker at a time
+        add_scaffolding: Add Phi-1.5 reasoning scaffolding
+
+    Yields:
+        InputNormalizer results, in input order
+    """
+    chunks = _chunks(questions, chunksize)
+
+    if workers is not None and workers <= 1:
+        _init_worker(learnable_db_path, add_scaffolding)
+        for chunk in chunks:
+            yield from _normalize_chunk(chunk)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(learnable_db_path, add_scaffolding)
+    ) as pool:
+        # Two chunks per worker keeps every process busy without reading the whole file
+        in_flight = deque()
+        limit = 2 * workers
+        for chunk in chunks:
+            in_flight.append(pool.submit(_normalize_chunk, chunk))
+            if len(in_flight) >= limit:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def diff_entry(entry: Dict, result: Dict, tolerance: float = 0.01) -> Optional[Dict]:
+    """
+    Compares a logged normalization with a fresh one.
+
+    Args:
+        entry: Feedback log entry ('clean', 'confidence', optionally 'intent')
+        result: New InputNormalizer result
+        tolerance: Confidence change treated as noise
+
+    Returns:
+        Compact record of the changed fields as [old, new] pairs, or None
+    """
+    changes = {}
+    for logged, field in DIFF_FIELDS.items():
+        if logged not in entry:
+            continue
+        old, new = entry[logged], result.get(field)
+        if logged == "confidence":
+            if old is not None and new is not None and abs(new - old) <= tolerance:
+                continue
+            new = round(new, 3) if new is not None else None
+        elif old == new:
+            continue
+        changes[logged] = [old, new]
+    if not changes:
+        return None
+    return {"line": entry.get("line"), "question": entry.get("corrected") or entry.get("original"), **changes}
+
+
+class DiffReport:
+    """
+    Running summary of a reprocessing run.
+    """
+
+    def __init__(self, output: Optional[TextIO] = None, examples: int = 5):
+        """
+        Initialize diff report.
+
+        Args:
+            output: Open JSONL file receiving one line per changed question
+            examples: Changes kept per field for the summary
+        """
+        self.output = output
+        self.examples = examples
+        self.total = 0
+        self.changed = 0
+        self.field_changes = {field: 0 for field in DIFF_FIELDS}
+        self.confidence_before = 0.0
+        self.confidence_after = 0.0
+        self.samples: Dict[str, List[Dict]] = {field: [] for field in DIFF_FIELDS}
+
+    def add(self, entry: Dict, result: Dict) -> Optional[Dict]:
+        """Records one question; returns its diff if anything changed."""
+        self.total += 1
+        self.confidence_before += entry.get("confidence") or 0.0
+        self.confidence_after += result.get("confidence") or 0.0
+
+        diff = diff_entry(entry, result)
+        if diff is None:
+            return None
+        self.changed += 1
+        for field in DIFF_FIELDS:
+            if field in diff:
+                self.field_changes[field] += 1
+                if len(self.samples[field]) < self.examples:
+                    self.samples[field].append(diff)
+        if self.output is not None:
+            self.output.write(json.dumps(diff, ensure_ascii=False) + "\n")
+        return diff
+
+    def summary(self) -> Dict:
+        """Gets counts, mean confidence before/after and sample changes."""
+        return {
+            "total": self.total,
+            "changed": self.changed,
+            "field_changes": dict(self.field_changes),
+            "mean_confidence_before": round(self.confidence_before / self.total, 3) if self.total else 0.0,
+            "mean_confidence_after": round(self.confidence_after / self.total, 3) if self.total else 0.0,
+            "samples": {field: list(samples) for field, samples in self.samples.items()}
+        }
+
+
+def reprocess_log(
+    log_file: str,
+    learnable_db_path: str = "satya_data/input_normalizer_phrases.json",
+    output: Optional[TextIO] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 256
+) -> Dict:
+    """
+    Re-normalizes a feedback log and diffs it against the logged results.
+
+    The spell-corrected text from the log is re-normalized, so only rule
+    changes show up in the diff.
+
+    Args:
+        log_file: feedback_db.jsonl
+        learnable_db_path: Learned noise phrases to normalize with
+        output: Optional JSONL stream for per-question diffs
+        workers: Worker processes (see normalize_many)
+        chunksize: Questions sent to a worker at a time
+
+    Returns:
+        DiffReport summary
+    """
+    report = DiffReport(output)
+    pending = deque()
+
+    def questions():
+        for entry in iter_feedback_log(log_file):
+            pending.append(entry)
+            yield entry.get("corrected") or entry.get("original") or ""
+
+    for result in normalize_many(questions(), learnable_db_path, workers, chunksize):
+        report.add(pending.popleft(), result)
+
+    summary = report.summary()
+    logger.info(f"Reprocessed {summary['total']} questions: {summary['changed']} changed")
+    return summary
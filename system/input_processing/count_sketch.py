@@ -0,0 +1,75 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Mergeable Count-Min Sketch for District-Scale Pattern Mining
+
+Counts keys in a fixed-size table whose estimates can only err upwards.
+Sketches built with the same width and depth merge by adding their tables,
+so each school's log can be counted in its own process and the results
+combined. Memory depends on the sketch size, not on the vocabulary.
+"""
+
+import hashlib
+from array import array
+from operator import add
+from typing import Iterable, Tuple
+
+
+def _hash_pair(key: str) -> Tuple[int, int]:
+    # Stable across processes, unlike hash() under PYTHONHASHSEED
+    digest = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+    return digest & 0xFFFFFFFF, (digest >> 32) | 1
+
+
+class CountMinSketch:
+    """
+    Fixed-size frequency table that never underestimates a count.
+    """
+
+    def __init__(self, width: int = 2 ** 17, depth: int = 4):
+        """
+        Initialize sketch.
+
+        Args:
+            width: Counters per row (overestimate is about 2.7 / width of the total)
+            depth: Independent rows (failure probability about e^-depth)
+        """
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.table = [array('q', bytes(8 * width)) for _ in range(depth)]
+
+    def _cells(self, key: str) -> Iterable[Tuple[array, int]]:
+        # Double hashing: row i uses h1 + i * h2
+        h1, h2 = _hash_pair(key)
+        return ((row, (h1 + i * h2) % self.width) for i, row in enumerate(self.table))
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Counts a key and returns its new estimate."""
+        self.total += count
+        h1, h2 = _hash_pair(key)
+        estimate = None
+        for row in self.table:
+            cell = h1 % self.width
+            value = row[cell] = row[cell] + count
+            if estimate is None or value < estimate:
+                estimate = value
+            h1 += h2
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        """Gets the estimated count of a key."""
+        return min(row[cell] for row, cell in self._cells(key))
+
+    def merge(self, other: "CountMinSketch"):
+        """Adds another sketch of the same shape into this one."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Count-Min sketches must have the same width and depth to merge")
+        self.table = [array('q', map(add, row, other_row)) for row, other_row in zip(self.table, other.table)]
+        self.total += other.total
@@ -0,0 +1,184 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Fuzzy Phrase Matcher for Satya Input Normalization
+
+Finds approximate occurrences of noise phrases ("acording to the pasage")
+in a question. Word windows are screened by length and shared character
+bigrams, then by a bounded insert/delete edit distance that gives up as soon
+as the bound is exceeded. Only windows that survive both filters are scored
+with difflib, so verdicts match the plain sliding-window SequenceMatcher scan
+at the same threshold.
+"""
+
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+
+def _bigrams(text: str) -> List[str]:
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+
+def bounded_indel_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Computes the insert/delete edit distance between two strings, up to a limit.
+
+    Only a band of width 2 * limit + 1 around the diagonal is filled, and the
+    scan stops as soon as every cell in a row exceeds the limit.
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Largest distance of interest
+
+    Returns:
+        The distance, or None if it is larger than limit
+    """
+    la, lb = len(a), len(b)
+    if abs(la - lb) > limit:
+        return None
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        current = [over] * (lb + 1)
+        current[0] = i if i <= limit else over
+        lo, hi = max(1, i - limit), min(lb, i + limit)
+        char = a[i - 1]
+        best = current[0]
+        for j in range(lo, hi + 1):
+            if char == b[j - 1]:
+                cost = previous[j - 1]
+            else:
+                cost = min(previous[j], current[j - 1]) + 1
+            if cost > over:
+                cost = over
+            current[j] = cost
+            if cost < best:
+                best = cost
+        if best > limit:
+            return None
+        previous = current
+    return previous[lb] if previous[lb] <= limit else None
+
+
+class FuzzyPhraseMatcher:
+    """
+    Index of fuzzy phrases matched against word windows of a question.
+    """
+
+    def __init__(self, phrases: List[str], threshold: float = 0.85):
+        """
+        Initialize fuzzy phrase matcher.
+
+        Args:
+            phrases: Phrases to find, in removal order
+            threshold: Minimum SequenceMatcher ratio for a match
+        """
+        self.threshold = threshold
+        self.phrases = []
+        for phrase in phrases:
+            target = phrase.lower()
+            self.phrases.append({
+                "phrase": phrase,
+                "target": target,
+                "words": len(target.split()),
+                "length": len(target),
+                "bigrams": set(_bigrams(target))
+            })
+        self.windows_checked = 0
+        self.windows_scored = 0
+
+    def _limit(self, length: int, target_length: int) -> int:
+        """Largest indel distance that can still reach the threshold."""
+        total = length + target_length
+        return int((1.0 - self.threshold) * total + 1e-9)
+
+    def _score(self, window: str, entry: Dict) -> float:
+        """Scores one window, or returns 0.0 when a filter rules it out."""
+        self.windows_checked += 1
+        target = entry["target"]
+        limit = self._limit(len(window), entry["length"])
+        if abs(len(window) - entry["length"]) > limit:
+            return 0.0
+
+        # Each insert/delete breaks at most two bigrams of the window
+        needed = max(len(window), entry["length"]) - 1 - 2 * limit
+        if needed > 0:
+            grams = entry["bigrams"]
+            shared = sum(1 for gram in _bigrams(window) if gram in grams)
+            if shared < needed:
+                return 0.0
+
+        # 1 - indel / total bounds the SequenceMatcher ratio from above
+        if bounded_indel_distance(window, target, limit) is None:
+            return 0.0
+        self.windows_scored += 1
+        return SequenceMatcher(None, window, target).ratio()
+
+    def _best_window(self, words: List[str], entry: Dict) -> Tuple[int, float]:
+        size = entry["words"]
+        best_idx, best_sim = -1, 0.0
+        for i in range(len(words) - size + 1):
+            sim = self._score(" ".join(words[i:i + size]), entry)
+            if sim > best_sim and sim >= self.threshold:
+                best_idx, best_sim = i, sim
+        return best_idx, best_sim
+
+    def find_all(self, text: str) -> List[Tuple[str, int, float]]:
+        """
+        Finds the best approximate occurrence of every phrase.
+
+        Args:
+            text: Question text
+
+        Returns:
+            (phrase, word index, similarity) for each phrase found
+        """
+        words = text.lower().split()
+        found = []
+        for entry in self.phrases:
+            idx, sim = self._best_window(words, entry)
+            if idx >= 0:
+                found.append((entry["phrase"], idx, sim))
+        return found
+
+    def remove(self, text: str) -> Tuple[str, int]:
+        """
+        Removes the best occurrence of each phrase, in phrase order.
+
+        Args:
+            text: Question text
+
+        Returns:
+            Text without the matched phrases, and the number removed
+        """
+        words = text.split()
+        lowered = [w.lower() for w in words]
+        removed = 0
+        for entry in self.phrases:
+            idx, _ = self._best_window(lowered, entry)
+            if idx < 0:
+                continue
+            del words[idx:idx + entry["words"]]
+            del lowered[idx:idx + entry["words"]]
+            removed += 1
+        if removed:
+            text = " ".join(words)
+        return text, removed
+
+    def stats(self) -> Dict:
+        """Gets matcher statistics."""
+        return {
+            "phrases": len(self.phrases),
+            "windows_checked": self.windows_checked,
+            "windows_scored": self.windows_scored,
+            "filtered_ratio": (
+                1 - self.windows_scored / self.windows_checked if self.windows_checked else 0.0
+            )
+        }
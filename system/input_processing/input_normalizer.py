@@ -9,23 +9,67 @@
 """
 Input Normalization - Core Rule Engine
 Handles deterministic text transformations optimized for Phi-1.5.
+
+Results are cached per raw question in a process-wide LRU, since the same
+questions recur constantly in a classroom.
 """
 
 import re
 import logging
 import json
 import os
-from typing import Dict, List, Tuple, Set
-from difflib import SequenceMatcher
+import threading
+from typing import Dict, List, Optional, Tuple, Set
+
+from .fuzzy_matcher import FuzzyPhraseMatcher
+from .normalization_cache import NormalizationCache
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE = re.compile(r'\s+')
+_LEADING_PUNCT = re.compile(r'^[,:;\-\s]+')
+_REPEATED_QUESTION_MARKS = re.compile(r'\?+')
+
+def _intent_lookahead(patterns: List[str]) -> str:
+    """Builds a zero-width test for any of an intent's patterns, matched at the start."""
+    anchored = [p[1:] for p in patterns if p.startswith("^")]
+    floating = [p for p in patterns if not p.startswith("^")]
+    tests = [f"(?:{p})" for p in anchored] + ([r"[\s\S]*?(?:" + "|".join(floating) + ")"] if floating else [])
+    return "(?=" + "|".join(tests) + ")"
+
+
+_SCAFFOLDS = {"WHY": "Explain the reason:", "HOW": "Describe the process:",
+              "DEFINE": "Define precisely:", "SOLVE": "Solve step by step:"}
+
+
+def _combine(patterns: List[str], flags: int = 0) -> re.Pattern:
+    """Compiles patterns into one alternation; match.lastgroup gives the rule index."""
+    return re.compile("|".join(f"(?P<r{i}>{p})" for i, p in enumerate(patterns)), flags)
+
+
+def _prefixes(patterns: List[str], flags: int = 0) -> re.Pattern:
+    """Compiles ^-anchored patterns applied one after another into one match."""
+    return re.compile("^" + "".join(f"(?:{p.lstrip('^')})?" for p in patterns), flags)
+
 
 class InputNormalizer:
     """Rule-based normalizer for educational questions."""
     
-    def __init__(self, learnable_db_path: str = "satya_data/input_normalizer_phrases.json"):
+    def __init__(
+        self,
+        learnable_db_path: str = "satya_data/input_normalizer_phrases.json",
+        cache: Optional[NormalizationCache] = None
+    ):
+        """
+        Initialize normalizer.
+
+        Args:
+            learnable_db_path: Learned noise phrases (JSON)
+            cache: Result cache (defaults to the process-wide shared cache;
+                NormalizationCache(0) disables caching)
+        """
         self.learnable_db_path = learnable_db_path
+        self.cache = cache if cache is not None else NormalizationCache.shared()
         self.learned_noise_phrases: Set[str] = set()
         self._load_learnable_database()
         
@@ -56,22 +100,50 @@ class InputNormalizer:
             "COMPARE": [r"difference between", r"compare ", r"versus"],
             "SOLVE": [r"^solve ", r"^calculate ", r"^find "],
         }
-        self.compiled_intent_patterns = {
-            intent: [re.compile(p, re.IGNORECASE) for p in patterns]
-            for intent, patterns in self.intent_patterns.items()
-        }
         
-        # Optional POS tagger
-        self.nlp = self._load_spacy()
+        # Single-pass matchers over the rules above
+        self._compile_rules()
+        
+        # Optional POS tagger, loaded on first use (never needed by normalize())
+        self._nlp = None
+        self._nlp_loaded = False
+        self._nlp_lock = threading.Lock()
         
         logger.info("InputNormalizer initialized")
     
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded on first access (None if spaCy is unavailable)."""
+        if not self._nlp_loaded:
+            with self._nlp_lock:
+                if not self._nlp_loaded:
+                    self._nlp = self._load_spacy()
+                    self._nlp_loaded = True
+        return self._nlp
+    
+    @property
+    def nlp_ready(self) -> bool:
+        """Whether spaCy has been loaded successfully."""
+        return self._nlp_loaded and self._nlp is not None
+    
     def normalize(self, raw_question: str, add_scaffolding: bool = False) -> Dict[str, any]:
-        """Main normalization pipeline."""
+        """Main normalization pipeline, cached per raw question."""
+        if not raw_question or not isinstance(raw_question, str) or len(raw_question) < 3:
+            return self._fallback_result(raw_question, "Invalid input")
+        
+        if self._learned_count != len(self.learned_noise_phrases):
+            self._compile_learned_phrases()
+        key = (self._rules_key, add_scaffolding, raw_question)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._normalize(raw_question, add_scaffolding)
+            if result["intent"] != "UNKNOWN":
+                self.cache.put(key, result)
+        return result
+    
+    def _normalize(self, raw_question: str, add_scaffolding: bool) -> Dict[str, any]:
+        """Runs every normalization stage (uncached)."""
         try:
-            if not raw_question or not isinstance(raw_question, str) or len(raw_question) < 3:
-                return self._fallback_result(raw_question, "Invalid input")
-            
             question = raw_question.strip()
             notes = []
 
@@ -96,10 +168,7 @@ class InputNormalizer:
             result = {"clean_question": question, "intent": intent, "confidence": confidence, "notes": notes}
             
             if add_scaffolding:
-                scaffolds = {"WHY": "Explain the reason:", "HOW": "Describe the process:", 
-                           "DEFINE": "Define precisely:", "SOLVE": "Solve step by step:"}
-                scaffold = scaffolds.get(intent, "Explain clearly:")
-                result["scaffolded_prompt"] = f"{scaffold} {question}"
+                result["scaffolded_prompt"] = f"{_SCAFFOLDS.get(intent, 'Explain clearly:')} {question}"
             
             return result
         except Exception as e:
@@ -111,10 +180,53 @@ class InputNormalizer:
         phrase = phrase.lower().strip()
         if phrase and phrase not in self.learned_noise_phrases:
             self.learned_noise_phrases.add(phrase)
+            self._compile_learned_phrases()
             self._save_learnable_database()
     
     # Private Methods
     
+    def _compile_rules(self):
+        """Builds one matcher per stage from the rule lists (call after editing them)."""
+        self._starter_matcher = _prefixes(self.conversational_starters, re.IGNORECASE)
+        # Slang and fillers are whole words, so one left-to-right pass matches
+        # what the sequential substitutions did
+        self._casual_rules = list(self.slang_to_formal.values()) + [""] * len(self.filler_words)
+        self._casual_matcher = _combine(list(self.slang_to_formal) + self.filler_words, re.IGNORECASE)
+        self._politeness_matcher = _prefixes(self.politeness_patterns, re.IGNORECASE)
+        self._noise_matcher = _combine([p.pattern for p in self.noise_patterns], re.IGNORECASE)
+        self._fuzzy_matcher = FuzzyPhraseMatcher(self.fuzzy_noise_phrases, self.fuzzy_threshold)
+        self._abbrev_rules = list(self.abbreviations.values())
+        self._abbrev_matcher = _combine(list(self.abbreviations))
+        # Intents are tried in order, so the first intent with any matching
+        # pattern wins (not the leftmost match); ^-anchored patterns are only
+        # tried at the start, the rest scan the question
+        self._intent_matcher = re.compile(
+            "|".join(
+                f"(?P<{intent}>{_intent_lookahead(patterns)})" for intent, patterns in self.intent_patterns.items()
+            ),
+            re.IGNORECASE
+        )
+        self._compile_learned_phrases()
+    
+    def _compile_learned_phrases(self):
+        """Rebuilds the learned-phrase matcher (longest phrase wins on overlap)."""
+        phrases = sorted(self.learned_noise_phrases, key=lambda p: (-len(p), p))
+        self._learned_count = len(self.learned_noise_phrases)
+        self._learned_matcher = (
+            re.compile("|".join(re.escape(p) for p in phrases), re.IGNORECASE) if phrases else None
+        )
+        self._refresh_rules_key()
+    
+    def _refresh_rules_key(self):
+        """Fingerprints the rules so cached results never outlive a rule change."""
+        self._rules_key = hash((
+            tuple(self.conversational_starters), tuple(self.slang_to_formal.items()), tuple(self.filler_words),
+            tuple(self.politeness_patterns), tuple(p.pattern for p in self.noise_patterns),
+            tuple(self.fuzzy_noise_phrases), self.fuzzy_threshold, tuple(self.abbreviations.items()),
+            tuple(sorted(self.learned_noise_phrases)), repr(self.context_rules),
+            tuple((intent, tuple(patterns)) for intent, patterns in self.intent_patterns.items())
+        ))
+    
     def _compile_noise_patterns(self) -> List[re.Pattern]:
         """Compiles exam meta-language patterns."""
         patterns = [
@@ -170,19 +282,14 @@ class InputNormalizer:
         """Removes slang and casual language."""
         notes, original = [], question
         
-        for pattern in self.conversational_starters:
-            question = re.sub(pattern, "", question, flags=re.IGNORECASE)
-        
-        for slang, formal in self.slang_to_formal.items():
-            question = re.sub(slang, formal, question, flags=re.IGNORECASE)
+        question = question[self._starter_matcher.match(question).end():]
         
-        for filler in self.filler_words:
-            question = re.sub(filler, "", question, flags=re.IGNORECASE)
+        rules = self._casual_rules
+        question = self._casual_matcher.sub(lambda m: rules[int(m.lastgroup[1:])], question)
         
-        for pattern in self.politeness_patterns:
-            question = re.sub(pattern, "", question, flags=re.IGNORECASE)
+        question = question[self._politeness_matcher.match(question).end():]
         
-        question = re.sub(r'\s+', ' ', question).strip()
+        question = _WHITESPACE.sub(' ', question).strip()
         if question != original:
             notes.append("formalized")
         return question, notes
@@ -191,61 +298,33 @@ class InputNormalizer:
         """Removes exam fluff using multiple strategies."""
         notes, original = [], question
         
-        for pattern in self.noise_patterns:
-            if pattern.search(question):
-                question = pattern.sub("", question)
-                notes.append("removed_regex")
+        matched = set()
+        question = self._noise_matcher.sub(lambda m: matched.add(m.lastgroup) or "", question)
+        notes.extend(["removed_regex"] * len(matched))
         
-        for phrase in self.fuzzy_noise_phrases:
-            if self._fuzzy_match(question, phrase):
-                question = self._remove_fuzzy(question, phrase)
-                notes.append("removed_fuzzy")
+        question, removed = self._fuzzy_matcher.remove(question)
+        notes.extend(["removed_fuzzy"] * removed)
         
-        for phrase in self.learned_noise_phrases:
-            if phrase in question.lower():
-                question = re.sub(re.escape(phrase), "", question, flags=re.IGNORECASE)
-                notes.append("removed_learned")
+        if self._learned_matcher is not None:
+            matched = set()
+            question = self._learned_matcher.sub(lambda m: matched.add(m.group().lower()) or "", question)
+            notes.extend(["removed_learned"] * len(matched))
         
-        question = re.sub(r'\s+', ' ', question).strip()
-        question = re.sub(r'^[,:;\-\s]+', '', question)
+        question = _WHITESPACE.sub(' ', question).strip()
+        question = _LEADING_PUNCT.sub('', question)
         return question, notes
     
-    def _fuzzy_match(self, text: str, phrase: str) -> bool:
-        """Checks fuzzy match using sliding window."""
-        text_words, phrase_words = text.lower().split(), phrase.lower().split()
-        if len(phrase_words) > len(text_words):
-            return False
-        
-        for i in range(len(text_words) - len(phrase_words) + 1):
-            window = " ".join(text_words[i:i + len(phrase_words)])
-            if SequenceMatcher(None, window, phrase.lower()).ratio() >= self.fuzzy_threshold:
-                return True
-        return False
-    
-    def _remove_fuzzy(self, text: str, phrase: str) -> str:
-        """Removes fuzzy-matched phrase."""
-        text_words = text.split()
-        phrase_words = phrase.lower().split()
-        best_idx, best_sim = -1, 0.0
-        
-        for i in range(len(text_words) - len(phrase_words) + 1):
-            window = " ".join([w.lower() for w in text_words[i:i + len(phrase_words)]])
-            sim = SequenceMatcher(None, window, phrase.lower()).ratio()
-            if sim > best_sim and sim >= self.fuzzy_threshold:
-                best_sim, best_idx = sim, i
-        
-        if best_idx >= 0:
-            return " ".join(text_words[:best_idx] + text_words[best_idx + len(phrase_words):])
-        return text
-    
     def _expand_abbreviations(self, question: str) -> Tuple[str, List[str]]:
         """Expands domain abbreviations."""
-        notes = []
-        for abbrev, full in self.abbreviations.items():
-            if re.search(abbrev, question):
-                question = re.sub(abbrev, full, question)
-                notes.append("expanded_abbrev")
-        return question, notes
+        matched = set()
+        rules = self._abbrev_rules
+        
+        def expand(m):
+            matched.add(m.lastgroup)
+            return rules[int(m.lastgroup[1:])]
+        
+        question = self._abbrev_matcher.sub(expand, question)
+        return question, ["expanded_abbrev"] * len(matched)
     
     def _normalize_sentence(self, question: str) -> Tuple[str, List[str]]:
         """Fixes case and punctuation."""
@@ -262,7 +341,7 @@ class InputNormalizer:
         if any(question.lower().startswith(w) for w in starters) and not question.endswith("?"):
             question = question.rstrip(".!,;:") + "?"
         
-        question = re.sub(r'\?+', '?', question)
+        question = _REPEATED_QUESTION_MARKS.sub('?', question)
         return question, notes
     
     def _expand_context(self, question: str) -> Tuple[str, List[str]]:
@@ -288,10 +367,8 @@ class InputNormalizer:
     
     def _classify_intent(self, question: str) -> str:
         """Classifies question intent."""
-        for intent, patterns in self.compiled_intent_patterns.items():
-            if any(p.search(question.lower()) for p in patterns):
-                return intent
-        return "DESCRIBE"
+        match = self._intent_matcher.match(question)
+        return match.lastgroup if match else "DESCRIBE"
     
     def _calculate_confidence(self, original: str, clean: str, notes: List[str]) -> float:
         """Calculates normalization confidence."""
@@ -0,0 +1,182 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Background JSONL Log Writer for Satya Input Normalization
+
+Feedback, review and spell-cache entries are queued by the question path
+and appended to their files by one writer thread, which groups entries per
+file and flushes every batch_size entries or flush_interval seconds. The
+queue is bounded: when the disk falls behind, new entries are dropped and
+counted rather than blocking the student's question. Normalizers share one
+process-wide writer (LogWriter.shared()), so opening more sessions does not
+add threads.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class LogWriter:
+    """
+    Single background thread that appends JSON lines to log files.
+    """
+
+    _shared: Optional["LogWriter"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 200, flush_interval: float = 2.0):
+        """
+        Initialize log writer.
+
+        Args:
+            max_queue: Entries held before new ones are dropped
+            batch_size: Entries written per flush
+            flush_interval: Seconds before a partial batch is written
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.close)
+
+    @classmethod
+    def shared(cls) -> "LogWriter":
+        """Gets the process-wide writer used by default."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def _ensure_started(self) -> None:
+        # Also restarts a closed writer that gets written to again
+        if self._thread is None or not self._thread.is_alive():
+            with self._start_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                    self._thread.start()
+
+    def write(self, path: Path, entry: Dict) -> bool:
+        """
+        Queues one entry for appending.
+
+        Args:
+            path: JSONL file
+            entry: JSON-serialisable record
+
+        Returns:
+            False if the queue was full and the entry was dropped
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((Path(path), entry))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Log queue full; dropped {self.dropped} entries")
+            return False
+
+    def call(self, task: Callable[[], None]) -> None:
+        """
+        Runs a task on the writer thread after the entries queued before it are written.
+
+        Args:
+            task: Callable run once, e.g. a compaction
+        """
+        self._ensure_started()
+        self._queue.put((None, task))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Waits until every entry queued so far is on disk.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            True if the writer caught up in time
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put((None, done.set), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Writes what is queued, stops the thread and drops the exit hook."""
+        atexit.unregister(self.close)
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self.flush()
+        self._queue.put((None, _STOP))
+        self._thread.join(timeout=5.0)
+
+    def _run(self) -> None:
+        batch: Dict[Path, List[str]] = {}
+        pending = 0
+        while True:
+            try:
+                path, item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if pending:
+                    self._write(batch)
+                    batch, pending = {}, 0
+                continue
+
+            if path is not None:
+                batch.setdefault(path, []).append(json.dumps(item, ensure_ascii=False))
+                pending += 1
+                if pending >= self.batch_size:
+                    self._write(batch)
+                    batch, pending = {}, 0
+                continue
+
+            # Control item: write everything before it, then act on it
+            if pending:
+                self._write(batch)
+                batch, pending = {}, 0
+            if item is _STOP:
+                return
+            try:
+                item()
+            except Exception as e:
+                logger.warning(f"Log writer task failed: {e}")
+
+    def _write(self, batch: Dict[Path, List[str]]) -> None:
+        for path, lines in batch.items():
+            try:
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write("\n".join(lines) + "\n")
+                self.written += len(lines)
+            except Exception as e:
+                logger.warning(f"Could not write {len(lines)} entries to {path}: {e}")
+
+    def stats(self) -> Dict:
+        """Gets writer statistics."""
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped
+        }
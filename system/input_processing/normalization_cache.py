@@ -0,0 +1,96 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Normalization Result Cache for Satya Input Processing
+
+A classroom asks the same questions over and over, so InputNormalizer keeps
+finished results in a bounded LRU keyed on the raw text. One cache is shared
+by every normalizer in the process (GUI and CLI sessions alike); keys carry
+a fingerprint of the normalizer's rules, so normalizers with different
+learned phrases never see each other's results.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+def _copy(result: Dict[str, Any]) -> Dict[str, Any]:
+    # Callers log and annotate results, so never hand out the cached objects
+    return {**result, "notes": list(result.get("notes", []))}
+
+
+class NormalizationCache:
+    """
+    Thread-safe LRU of normalization results.
+    """
+
+    _shared: Optional["NormalizationCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize normalization cache.
+
+        Args:
+            max_entries: Results kept (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> "NormalizationCache":
+        """Gets the process-wide cache used by default."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Gets a copy of the cached result, marking it recently used."""
+        if not self.max_entries:
+            return None
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy(result)
+
+    def put(self, key: Hashable, result: Dict[str, Any]) -> None:
+        """Stores a copy of a result, evicting the least recently used."""
+        if not self.max_entries:
+            return
+        result = _copy(result)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Gets cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
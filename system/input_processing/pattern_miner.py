@@ -9,56 +9,396 @@
 """
 Pattern Miner - Automated Noise Discovery
 Analyzes logs to find repeated patterns for learning.
+
+Low-confidence cases are folded into persisted n-gram, start-position and
+example counters. Each run reads only the log lines appended since the last
+one (tracked by byte offset), and suggestions come straight from the
+counters, so mining time does not grow with the length of the log history.
 """
 
+import gzip
+import hashlib
 import json
 import logging
+import os
 import re
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from collections import Counter
 
+from system.input_processing.count_sketch import CountMinSketch
+
 logger = logging.getLogger(__name__)
 
+STATE_FORMAT = 1
+LOW_CONFIDENCE = 0.7
+EXAMPLE_LIMIT = 3
+
+
+def iter_ngrams(words: List[str], n_range: Tuple[int, int] = (2, 4)) -> Iterator[str]:
+    """Yields the n-grams of a word list, skipping very short ones."""
+    for n in range(n_range[0], n_range[1] + 1):
+        for i in range(len(words) - n + 1):
+            ngram = ' '.join(words[i:i+n])
+            if len(ngram) > 5:
+                yield ngram
+
+
+class NgramCounts:
+    """N-gram, start-position and example counters over low-confidence cases."""
+
+    def __init__(self):
+        self.cases = 0
+        self.ngrams = Counter()
+        self.starts = Counter()
+        # Example questions, kept only for n-grams that look like noise
+        self.examples: Dict[str, List[str]] = {}
+
+    def add(self, original: str, is_noise, n_range: Tuple[int, int] = (2, 4)):
+        """
+        Counts one low-confidence question.
+
+        Args:
+            original: Raw question text
+            is_noise: Predicate deciding whether an n-gram keeps examples
+            n_range: N-gram sizes to count
+        """
+        self.cases += 1
+        words = original.lower().split()
+        for n in range(n_range[0], min(n_range[1], len(words)) + 1):
+            lead = ' '.join(words[:n])
+            if len(lead) > 5:
+                self.starts[lead] += 1
+
+        seen = set()
+        for ngram in iter_ngrams(words, n_range):
+            if ngram not in self.ngrams and is_noise(ngram):
+                self.examples[ngram] = []
+            self.ngrams[ngram] += 1
+            if ngram in seen:
+                continue
+            seen.add(ngram)
+            examples = self.examples.get(ngram)
+            if examples is not None and len(examples) < EXAMPLE_LIMIT:
+                examples.append(original)
+
+    def most_common(self, n: int) -> List[Tuple[str, int]]:
+        return self.ngrams.most_common(n)
+
+    def start_count(self, phrase: str) -> int:
+        return self.starts[phrase]
+
+    def to_dict(self) -> Dict:
+        return {
+            "cases": self.cases,
+            "ngrams": dict(self.ngrams),
+            "starts": dict(self.starts),
+            "examples": self.examples
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "NgramCounts":
+        counts = cls()
+        counts.cases = data.get("cases", 0)
+        counts.ngrams = Counter(data.get("ngrams", {}))
+        counts.starts = Counter(data.get("starts", {}))
+        counts.examples = data.get("examples", {})
+        return counts
+
+
+class NgramSketch:
+    """
+    Bounded-memory counterpart of NgramCounts for sharded mining.
+    """
+
+    def __init__(self, capacity: int = 2000, width: int = 2 ** 17, depth: int = 4):
+        """
+        Initialize n-gram sketch.
+
+        Args:
+            capacity: Heavy-hitter phrases retained (kept between capacity and 2x capacity)
+            width: Count-Min counters per row
+            depth: Count-Min rows
+        """
+        self.capacity = capacity
+        self.cases = 0
+        self.ngrams = CountMinSketch(width, depth)
+        self.starts = CountMinSketch(width, depth)
+        # Heavy-hitter phrases and their example questions
+        self.examples: Dict[str, List[str]] = {}
+        self._floor = 0
+
+    def add(self, original: str, is_noise=None, n_range: Tuple[int, int] = (2, 4)):
+        """
+        Counts one low-confidence question.
+
+        Args:
+            original: Raw question text
+            is_noise: Unused; examples are kept for every heavy hitter
+            n_range: N-gram sizes to count
+        """
+        self.cases += 1
+        words = original.lower().split()
+        for n in range(n_range[0], min(n_range[1], len(words)) + 1):
+            lead = ' '.join(words[:n])
+            if len(lead) > 5:
+                self.starts.add(lead)
+
+        seen = set()
+        for ngram in iter_ngrams(words, n_range):
+            estimate = self.ngrams.add(ngram)
+            if ngram in seen:
+                continue
+            seen.add(ngram)
+            examples = self.examples.get(ngram)
+            if examples is None:
+                if estimate <= self._floor:
+                    continue
+                examples = self.examples[ngram] = []
+                if len(self.examples) > 2 * self.capacity:
+                    self._prune()
+                    examples = self.examples.get(ngram)
+            if examples is not None and len(examples) < EXAMPLE_LIMIT:
+                examples.append(original)
+
+    def merge(self, other: "NgramSketch"):
+        """Adds another shard's counts; heavy hitters are re-ranked on the merged table."""
+        self.cases += other.cases
+        self.ngrams.merge(other.ngrams)
+        self.starts.merge(other.starts)
+        for phrase, examples in other.examples.items():
+            mine = self.examples.setdefault(phrase, [])
+            mine.extend(examples[:EXAMPLE_LIMIT - len(mine)])
+        self._floor = 0
+        if len(self.examples) > self.capacity:
+            self._prune()
+
+    def most_common(self, n: int) -> List[Tuple[str, int]]:
+        """Gets the n heavy hitters with the highest estimated counts."""
+        ranked = sorted(((p, self.ngrams.estimate(p)) for p in self.examples), key=lambda x: (-x[1], x[0]))
+        return ranked[:n]
+
+    def start_count(self, phrase: str) -> int:
+        """Gets the estimated number of questions opening with phrase."""
+        return self.starts.estimate(phrase)
+
+    def stats(self) -> Dict:
+        """Get sketch statistics."""
+        return {
+            "cases": self.cases,
+            "ngrams_counted": self.ngrams.total,
+            "heavy_hitters": len(self.examples),
+            "admission_floor": self._floor,
+            "table_bytes": 2 * self.ngrams.width * self.ngrams.depth * 8
+        }
+
+    def _prune(self):
+        """Keeps the capacity phrases with the highest estimates."""
+        ranked = self.most_common(self.capacity)
+        keep = {phrase for phrase, _ in ranked}
+        self.examples = {p: ex for p, ex in self.examples.items() if p in keep}
+        self._floor = ranked[-1][1] if len(ranked) >= self.capacity else 0
+
+
+def _count_shard(log_file: str, capacity: int, width: int, depth: int) -> NgramSketch:
+    """Counts the low-confidence cases of one log file (runs in a worker process)."""
+    sketch = NgramSketch(capacity, width, depth)
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                log = json.loads(line)
+            except ValueError:
+                continue
+            if log.get('confidence', 1.0) < LOW_CONFIDENCE:
+                sketch.add(log.get('original', ''))
+    logger.info(f"Counted {sketch.cases} low-confidence cases in {log_file}")
+    return sketch
+
 
 class PatternMiner:
     """Discovers new noise phrases from production logs."""
     
-    def __init__(self, min_frequency: int = 10, min_confidence: float = 0.6):
+    def __init__(self, min_frequency: int = 10, min_confidence: float = 0.6, state_file: Optional[str] = None):
+        """
+        Initialize pattern miner.
+
+        Args:
+            min_frequency: Occurrences needed before a phrase is suggested
+            min_confidence: Noise confidence needed before a phrase is suggested
+            state_file: Gzipped JSON counters for incremental mining (None to keep them in memory)
+        """
         self.min_frequency = min_frequency
         self.min_confidence = min_confidence
         self.noise_indicators = [
             'please', 'can you', 'help me', 'tell me', 'like', 'basically',
             'actually', 'just', 'really', 'bro', 'bruh', 'sir'
         ]
+        self.noise_patterns = [
+            r'^(can|could|would) you',
+            r'^please',
+            r'help me',
+            r'with reference',
+            r'according to',
+            r'in brief'
+        ]
+        self._compile_noise_matcher()
+        self.state_file = Path(state_file) if state_file else None
+        self.counts = NgramCounts()
+        self.log_file: Optional[str] = None
+        self.log_head: Optional[str] = None
+        self.offset = 0
+        if self.state_file:
+            self._load_state()
     
     def mine_new_patterns(self, feedback_logs: List[Dict]) -> List[Dict]:
         """Discovers patterns from low-confidence cases."""
-        low_conf = [log for log in feedback_logs if log.get('confidence', 1.0) < 0.7]
-        
-        if not low_conf:
-            logger.info("No low-confidence cases to analyze")
-            return []
-        
-        logger.info(f"Analyzing {len(low_conf)} cases...")
-        
-        ngrams = self._extract_ngrams(low_conf)
-        ngram_counts = Counter(ngrams)
-        suggestions = []
-        
-        for phrase, count in ngram_counts.most_common(100):
-            if count >= self.min_frequency and self._is_likely_noise(phrase):
-                confidence = self._calculate_confidence(phrase, low_conf, count)
-                if confidence >= self.min_confidence:
-                    suggestions.append({
-                        'phrase': phrase,
-                        'frequency': count,
-                        'confidence': confidence,
-                        'examples': self._get_examples(phrase, low_conf, 3)
-                    })
-        
-        suggestions.sort(key=lambda x: x['confidence'] * x['frequency'], reverse=True)
-        logger.info(f"Found {len(suggestions)} pattern suggestions")
-        return suggestions
+        counts = NgramCounts()
+        for log in feedback_logs:
+            if log.get('confidence', 1.0) < LOW_CONFIDENCE:
+                counts.add(log.get('original', ''), self._is_likely_noise)
+        return self._suggest(counts)
+
+    def update(self, feedback_logs: Iterable[Dict]) -> int:
+        """
+        Folds new log entries into the persisted counters.
+
+        Args:
+            feedback_logs: Log entries not seen before
+
+        Returns:
+            Number of low-confidence cases added
+        """
+        added = 0
+        for log in feedback_logs:
+            if log.get('confidence', 1.0) < LOW_CONFIDENCE:
+                self.counts.add(log.get('original', ''), self._is_likely_noise)
+                added += 1
+        return added
+
+    def update_from_log(self, log_file: str) -> int:
+        """
+        Reads log lines appended since the last run and updates the counters.
+
+        Starts over if the log is a different file or was truncated or
+        rotated. A trailing line without a newline is left for the next run.
+
+        Args:
+            log_file: JSONL feedback log
+
+        Returns:
+            Number of new log entries read
+        """
+        path = Path(log_file)
+        if not path.exists():
+            logger.warning(f"Log not found: {log_file}")
+            return 0
+
+        head = self._first_line_digest(path)
+        if (self.log_file != str(path) or path.stat().st_size < self.offset
+                or (self.offset and head != self.log_head)):
+            if self.offset:
+                logger.info(f"{log_file} was replaced; recounting from the start")
+            self.reset()
+            self.log_file = str(path)
+        self.log_head = head
+
+        entries = 0
+
+        def new_entries():
+            nonlocal entries
+            for entry in self._read_new_entries(path):
+                entries += 1
+                yield entry
+
+        added = self.update(new_entries())
+        logger.info(f"Read {entries} new log entries ({added} low-confidence), {self.counts.cases} cases in total")
+        if self.state_file:
+            self.save_state()
+        return entries
+
+    def mine_sharded(
+        self,
+        log_files: List[str],
+        workers: Optional[int] = None,
+        capacity: int = 2000,
+        width: int = 2 ** 17,
+        depth: int = 4
+    ) -> List[Dict]:
+        """
+        Mines many log files (e.g. one per school) across a process pool.
+
+        Each file is counted into its own Count-Min sketch with a bounded
+        heavy-hitter set, and the shards are merged in file order. Memory per
+        process is fixed by the sketch size; frequencies are upper-bound
+        estimates.
+
+        Args:
+            log_files: JSONL feedback logs
+            workers: Worker processes (None for one per CPU, 0 or 1 to run in-process)
+            capacity: Heavy-hitter phrases kept per shard and after merging
+            width: Count-Min counters per row
+            depth: Count-Min rows
+
+        Returns:
+            Suggestions, as from mine_new_patterns
+        """
+        merged = NgramSketch(capacity, width, depth)
+        count_shard = partial(_count_shard, capacity=capacity, width=width, depth=depth)
+        files = [str(f) for f in log_files]
+        if workers is not None and workers <= 1:
+            for log_file in files:
+                merged.merge(count_shard(log_file))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for shard in pool.map(count_shard, files):
+                    merged.merge(shard)
+        logger.info(f"Merged {len(log_files)} shards: {merged.stats()}")
+        return self._suggest(merged)
+
+    def suggest(self) -> List[Dict]:
+        """Gets suggestions from the accumulated counters."""
+        return self._suggest(self.counts)
+
+    def reset(self):
+        """Clears the counters and the log position."""
+        self.counts = NgramCounts()
+        self.log_file, self.log_head, self.offset = None, None, 0
+
+    def save_state(self) -> bool:
+        """Writes counters and log position to state_file."""
+        if not self.state_file:
+            return False
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "format": STATE_FORMAT,
+                "log_file": self.log_file,
+                "log_head": self.log_head,
+                "offset": self.offset,
+                **self.counts.to_dict()
+            }
+            tmp_file = self.state_file.with_suffix(".tmp")
+            with gzip.open(tmp_file, 'wt', encoding='utf-8') as f:
+                json.dump(payload, f, separators=(',', ':'))
+            os.replace(tmp_file, self.state_file)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not save miner state: {e}")
+            return False
+
+    def stats(self) -> Dict:
+        """Get counter statistics."""
+        return {
+            "cases": self.counts.cases,
+            "distinct_ngrams": len(self.counts.ngrams),
+            "tracked_examples": len(self.counts.examples),
+            "log_file": self.log_file,
+            "offset": self.offset
+        }
     
     def generate_report(self, suggestions: List[Dict], output_file: str):
         """Generates a human-readable report."""
@@ -96,38 +436,55 @@ class PatternMiner:
     
     # Private Methods 
     
+    def _suggest(self, counts: Union[NgramCounts, NgramSketch]) -> List[Dict]:
+        """Ranks likely-noise n-grams from counters."""
+        if not counts.cases:
+            logger.info("No low-confidence cases to analyze")
+            return []
+        
+        logger.info(f"Analyzing {counts.cases} cases...")
+        suggestions = []
+        
+        for phrase, count in counts.most_common(100):
+            if count >= self.min_frequency and self._is_likely_noise(phrase):
+                confidence = self._score(phrase, count, counts.start_count(phrase))
+                if confidence >= self.min_confidence:
+                    suggestions.append({
+                        'phrase': phrase,
+                        'frequency': count,
+                        'confidence': confidence,
+                        'examples': list(counts.examples.get(phrase, []))
+                    })
+        
+        suggestions.sort(key=lambda x: x['confidence'] * x['frequency'], reverse=True)
+        logger.info(f"Found {len(suggestions)} pattern suggestions")
+        return suggestions
+    
     def _extract_ngrams(self, logs: List[Dict], n_range: tuple = (2, 4)) -> List[str]:
         """Extracts n-grams from logs."""
         ngrams = []
         for log in logs:
-            words = log.get('original', '').lower().split()
-            for n in range(n_range[0], n_range[1] + 1):
-                for i in range(len(words) - n + 1):
-                    ngram = ' '.join(words[i:i+n])
-                    if len(ngram) > 5:
-                        ngrams.append(ngram)
+            ngrams.extend(iter_ngrams(log.get('original', '').lower().split(), n_range))
         return ngrams
     
+    def _compile_noise_matcher(self):
+        """Combines indicators and patterns into one regex (call after editing them)."""
+        alternatives = [re.escape(ind) for ind in self.noise_indicators] + self.noise_patterns
+        self._noise_matcher = re.compile('|'.join(f'(?:{a})' for a in alternatives))
+    
     def _is_likely_noise(self, phrase: str) -> bool:
         """Checks if phrase is likely noise."""
-        phrase_lower = phrase.lower()
-        
-        if any(ind in phrase_lower for ind in self.noise_indicators):
-            return True
-        
-        patterns = [
-            r'^(can|could|would) you',
-            r'^please',
-            r'help me',
-            r'with reference',
-            r'according to',
-            r'in brief'
-        ]
-        
-        return any(re.search(p, phrase_lower) for p in patterns)
+        return self._noise_matcher.search(phrase.lower()) is not None
     
     def _calculate_confidence(self, phrase: str, logs: List[Dict], frequency: int) -> float:
         """Calculates confidence that phrase is noise."""
+        start_count = sum(1 for log in logs 
+                         if phrase in log.get('original', '').lower() 
+                         and log.get('original', '').lower().startswith(phrase))
+        return self._score(phrase, frequency, start_count)
+    
+    def _score(self, phrase: str, frequency: int, start_count: int) -> float:
+        """Scores a phrase from its frequency and how often it opens a question."""
         confidence = 0.5
         
         if frequency > 50:
@@ -135,10 +492,6 @@ class PatternMiner:
         elif frequency > 20:
             confidence += 0.1
         
-        start_count = sum(1 for log in logs 
-                         if phrase in log.get('original', '').lower() 
-                         and log.get('original', '').lower().startswith(phrase))
-        
         if start_count > frequency * 0.7:
             confidence += 0.15
         
@@ -157,3 +510,43 @@ class PatternMiner:
                 if len(examples) >= limit:
                     break
         return examples
+
+    def _read_new_entries(self, path: Path) -> Iterator[Dict]:
+        """Yields complete log lines past the stored offset, advancing it."""
+        with open(path, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                self.offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping malformed log line at byte {self.offset - len(line)}")
+
+    @staticmethod
+    def _first_line_digest(path: Path) -> Optional[str]:
+        """Fingerprints a log by its first line, to notice rotation."""
+        with open(path, 'rb') as f:
+            first = f.readline()
+        return hashlib.sha1(first).hexdigest() if first.endswith(b'\n') else None
+
+    def _load_state(self):
+        """Loads counters and log position from state_file."""
+        if not self.state_file.exists():
+            return
+        try:
+            with gzip.open(self.state_file, 'rt', encoding='utf-8') as f:
+                payload = json.load(f)
+            if payload.get("format") != STATE_FORMAT:
+                raise ValueError(f"unsupported state format {payload.get('format')}")
+            self.counts = NgramCounts.from_dict(payload)
+            self.log_file = payload.get("log_file")
+            self.log_head = payload.get("log_head")
+            self.offset = payload.get("offset", 0)
+            logger.info(f"Loaded miner state: {self.counts.cases} cases, offset {self.offset}")
+        except Exception as e:
+            logger.warning(f"Could not load miner state, starting over: {e}")
+            self.reset()
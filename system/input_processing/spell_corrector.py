@@ -0,0 +1,344 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Spell Correction Backends for Satya Input Normalization
+
+SymSpellCorrector is an in-process symmetric-delete corrector over the
+curriculum vocabulary (content JSON, Chroma documents and a base English word
+list). Its delete index is precomputed by scripts/build_spell_index.py and
+stored as one gzipped JSON file, so loading needs no Java server and lookups
+take microseconds. Every word of the base lexicon is in the index, so only
+words missing from it are ever corrected; an index built without a lexicon
+is refused, since it would "correct" ordinary English (please -> place). LanguageToolCorrector wraps the optional LanguageTool
+server behind the same correct() call.
+"""
+
+import gzip
+import json
+import logging
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT = 2
+_WORD = re.compile(r"(?<![\w'])[A-Za-z]+(?![\w'])")
+_TOKEN = re.compile(r"[a-z]+")
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from word by deleting up to max_distance characters."""
+    found, frontier = set(), {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w)) if len(w) > 1}
+        found |= frontier
+    return found
+
+
+def edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Computes the optimal string alignment distance, up to a limit.
+
+    Args:
+        a: First word
+        b: Second word
+        limit: Largest distance of interest
+
+    Returns:
+        The distance, or None if it is larger than limit
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    before, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return None
+        before, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+def count_words(texts: Iterable[str]) -> Counter:
+    """
+    Counts lowercase alphabetic words.
+
+    Args:
+        texts: Documents to count
+
+    Returns:
+        Word frequencies
+    """
+    counts = Counter()
+    for text in texts:
+        counts.update(_TOKEN.findall(text.lower()))
+    return counts
+
+
+def content_texts(content_dir: str) -> Iterator[str]:
+    """
+    Yields every string value in the content JSON files.
+
+    Args:
+        content_dir: Directory of subject JSON files
+
+    Yields:
+        Text fields (titles, summaries, questions, answers)
+    """
+    def walk(node):
+        if isinstance(node, str):
+            yield node
+        elif isinstance(node, dict):
+            for value in node.values():
+                yield from walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                yield from walk(value)
+
+    for path in sorted(Path(content_dir).rglob("*.json")):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                yield from walk(json.load(f))
+        except Exception as e:
+            logger.warning(f"Skipping content file {path}: {e}")
+
+
+class SymSpellCorrector:
+    """
+    Symmetric-delete spell corrector over the curriculum vocabulary.
+    """
+
+    def __init__(
+        self,
+        index_path: str = "satya_data/spell_index.json.gz",
+        min_word_length: int = 3,
+        load: bool = True
+    ):
+        """
+        Initialize SymSpell corrector.
+
+        Args:
+            index_path: Precomputed index written by build_spell_index.py
+            min_word_length: Shorter words are never corrected
+            load: Load the index file now
+        """
+        self.index_path = Path(index_path)
+        self.min_word_length = min_word_length
+        self.max_edit_distance = 2
+        self.prefix_length = 7
+        self.words: Dict[str, int] = {}
+        self.deletes: Dict[str, List[str]] = {}
+        self.lexicon_size = 0
+        self.lookups = 0
+        self.corrections = 0
+        if load:
+            self.load()
+
+    @property
+    def ready(self) -> bool:
+        """Whether a vocabulary is loaded."""
+        return bool(self.words)
+
+    @classmethod
+    def build(cls, word_counts: Dict[str, int], lexicon: Iterable[str], max_edit_distance: int = 2,
+              prefix_length: int = 7, min_count: int = 1) -> "SymSpellCorrector":
+        """
+        Builds the delete index from word frequencies and a base lexicon.
+
+        Args:
+            word_counts: Curriculum word -> frequency
+            lexicon: Broad English word list; its words are never corrected
+            max_edit_distance: Largest correction distance
+            prefix_length: Characters of each word indexed (longer words share prefixes)
+            min_count: Curriculum words seen fewer times are dropped
+
+        Returns:
+            A corrector holding the new index
+
+        Raises:
+            ValueError: If the lexicon is empty
+        """
+        lexicon = {w.lower() for w in lexicon if w.isalpha()}
+        if not lexicon:
+            raise ValueError("a base English lexicon is required to build the spell index")
+
+        corrector = cls(load=False)
+        corrector.max_edit_distance = max_edit_distance
+        corrector.prefix_length = prefix_length
+        corrector.words = {w: c for w, c in word_counts.items() if c >= min_count and w.isalpha()}
+        for word in lexicon:
+            corrector.words.setdefault(word, 1)
+        corrector.lexicon_size = len(lexicon)
+
+        deletes: Dict[str, List[str]] = {}
+        for word in corrector.words:
+            prefix = word[:prefix_length]
+            for key in _deletes(prefix, max_edit_distance) | {prefix}:
+                deletes.setdefault(key, []).append(word)
+        corrector.deletes = deletes
+        logger.info(f"Built spell index: {len(corrector.words)} words, {len(deletes)} delete keys")
+        return corrector
+
+    def save(self, path: Optional[str] = None) -> Path:
+        """
+        Writes the index as gzipped JSON, with words referenced by position.
+
+        Args:
+            path: Output file (defaults to index_path)
+
+        Returns:
+            The written path
+        """
+        path = Path(path) if path else self.index_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        words = sorted(self.words, key=lambda w: (-self.words[w], w))
+        position = {w: i for i, w in enumerate(words)}
+        payload = {
+            "format": INDEX_FORMAT,
+            "lexicon_size": self.lexicon_size,
+            "max_edit_distance": self.max_edit_distance,
+            "prefix_length": self.prefix_length,
+            "words": words,
+            "counts": [self.words[w] for w in words],
+            "deletes": {key: [position[w] for w in ws] for key, ws in self.deletes.items()}
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        return path
+
+    def load(self) -> bool:
+        """
+        Loads the precomputed index file.
+
+        Returns:
+            True if the index was loaded
+        """
+        if not self.index_path.exists():
+            logger.warning(f"Spell index not found at {self.index_path}; run scripts/build_spell_index.py")
+            return False
+        try:
+            with gzip.open(self.index_path, 'rt', encoding='utf-8') as f:
+                payload = json.load(f)
+            if payload.get("format") != INDEX_FORMAT:
+                raise ValueError(f"unsupported index format {payload.get('format')}; rebuild it with "
+                                 f"scripts/build_spell_index.py")
+            if not payload.get("lexicon_size"):
+                raise ValueError("index was built without a base lexicon; rebuild it with a --wordlist")
+            words = payload["words"]
+            self.max_edit_distance = payload["max_edit_distance"]
+            self.prefix_length = payload["prefix_length"]
+            self.words = dict(zip(words, payload["counts"]))
+            self.deletes = {key: [words[i] for i in ids] for key, ids in payload["deletes"].items()}
+            self.lexicon_size = payload["lexicon_size"]
+            logger.info(f"Loaded spell index: {len(self.words)} words")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not load spell index: {e}")
+            self.words, self.deletes = {}, {}
+            return False
+
+    def lookup(self, word: str) -> Optional[str]:
+        """
+        Finds the closest known word, preferring smaller distance then higher frequency.
+
+        Args:
+            word: Lowercase word
+
+        Returns:
+            The word itself if known, its best correction, or None
+        """
+        self.lookups += 1
+        if word in self.words:
+            return word
+        # Short words get one edit so "teh" -> "the" but not "cat" -> "act" -> ...
+        limit = 1 if len(word) <= 4 else self.max_edit_distance
+        prefix = word[:self.prefix_length]
+
+        best, best_key = None, None
+        seen = set()
+        for key in _deletes(prefix, limit) | {prefix}:
+            for candidate in self.deletes.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(word, candidate, limit)
+                if distance is None:
+                    continue
+                rank = (distance, -self.words[candidate], candidate)
+                if best_key is None or rank < best_key:
+                    best, best_key = candidate, rank
+        return best
+
+    def correct(self, text: str) -> str:
+        """
+        Corrects each unknown word in a question.
+
+        Acronyms, words next to digits or apostrophes, and words shorter than
+        min_word_length are left alone, as are words with no close match.
+
+        Args:
+            text: Raw question
+
+        Returns:
+            The corrected question
+        """
+        if not self.ready:
+            return text
+
+        def fix(match):
+            word = match.group()
+            if len(word) < self.min_word_length or (word.isupper() and len(word) > 1):
+                return word
+            suggestion = self.lookup(word.lower())
+            if not suggestion or suggestion == word.lower():
+                return word
+            self.corrections += 1
+            return suggestion.capitalize() if word[0].isupper() else suggestion
+
+        corrected = _WORD.sub(fix, text)
+        if corrected != text:
+            logger.debug(f"Corrected: '{text}' -> '{corrected}'")
+        return corrected
+
+    def stats(self) -> Dict:
+        """Gets corrector statistics."""
+        return {
+            "words": len(self.words),
+            "delete_keys": len(self.deletes),
+            "lexicon_size": self.lexicon_size,
+            "lookups": self.lookups,
+            "corrections": self.corrections
+        }
+
+
+class LanguageToolCorrector:
+    """
+    Optional grammar and spelling backend using a local LanguageTool server.
+    """
+
+    def __init__(self, language: str = 'en-US'):
+        import language_tool_python
+        self._utils = language_tool_python.utils
+        self.tool = language_tool_python.LanguageTool(language)
+
+    def correct(self, text: str) -> str:
+        """Applies LanguageTool's suggested replacements."""
+        matches = self.tool.check(text)
+        if not matches:
+            return text
+        corrected = self._utils.correct(text, matches)
+        if corrected != text:
+            logger.debug(f"Corrected: '{text}' -> '{corrected}'")
+        return corrected
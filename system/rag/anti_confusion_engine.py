@@ -145,13 +145,12 @@ class AntiConfusionEngine:
         full_context = " ".join(context_chunks).lower()
         answer_lower = answer.lower()
         
-        answer_terms = set(re.findall(r'\b\w{5,}\b', answer_lower))
+        answer_terms = self.key_terms(answer_lower)
         
         if not answer_terms:
             return True, "No key terms to validate"
             
-        found_count = sum(1 for term in answer_terms if term in full_context)
-        overlap_ratio = found_count / len(answer_terms) if answer_terms else 0
+        overlap_ratio = self.grounding_overlap(answer_terms, full_context)
         
         if overlap_ratio < self.MIN_CONTEXT_OVERLAP:
             logger.warning(f"Low grounding: {overlap_ratio:.2%}")
@@ -172,6 +171,17 @@ class AntiConfusionEngine:
                  
         return True, "Grounded"
 
+    def key_terms(self, text: str) -> set:
+        """Words of five or more letters, the terms grounding is judged on."""
+        return set(re.findall(r'\b\w{5,}\b', text.lower()))
+
+    def grounding_overlap(self, terms: set, full_context: str) -> float:
+        """Fraction of terms found in the (lowercased) context."""
+        if not terms:
+            return 0.0
+        found_count = sum(1 for term in terms if term in full_context)
+        return found_count / len(terms)
+
     def resolve_conflicts(self, chunks: List[Dict]) -> List[Dict]:
         if not chunks:
             return []
@@ -0,0 +1,291 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Centroid-based Collection Router for Satya RAG
+
+Stores a small set of k-means centroids per ChromaDB collection (computed at
+ingest time) and routes each query embedding only to the collections whose
+centroids are close to it. Replaces name matching on collection names.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CENTROIDS_FILENAME = "collection_centroids.json"
+
+
+def kmeans_centroids(
+    embeddings: np.ndarray,
+    k: int = 4,
+    max_iter: int = 20,
+    seed: int = 42
+) -> np.ndarray:
+    """
+    Computes up to k unit-length centroids with spherical k-means.
+
+    Args:
+        embeddings: (n, d) matrix of chunk embeddings
+        k: Maximum number of centroids
+        max_iter: Lloyd iterations
+        seed: Random seed for k-means++ initialisation
+
+    Returns:
+        (k', d) matrix of normalised centroids, k' <= k
+    """
+    data = np.asarray(embeddings, dtype=np.float32)
+    if data.ndim == 1:
+        data = data.reshape(1, -1)
+    if len(data) == 0:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    norms = np.linalg.norm(data, axis=1, keepdims=True)
+    data = data / np.maximum(norms, 1e-12)
+
+    k = max(1, min(k, len(data)))
+    rng = np.random.default_rng(seed)
+
+    # k-means++ initialisation on cosine distance
+    centroids = [data[rng.integers(len(data))]]
+    for _ in range(1, k):
+        sims = np.max(data @ np.stack(centroids).T, axis=1)
+        dists = np.clip(1.0 - sims, 0.0, None)
+        total = dists.sum()
+        if total <= 0:
+            break
+        centroids.append(data[rng.choice(len(data), p=dists / total)])
+    centroids = np.stack(centroids)
+
+    for _ in range(max_iter):
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        updated = np.stack([
+            data[assignment == c].sum(axis=0) if np.any(assignment == c) else centroids[c]
+            for c in range(len(centroids))
+        ])
+        updated /= np.maximum(np.linalg.norm(updated, axis=1, keepdims=True), 1e-12)
+        if np.allclose(updated, centroids, atol=1e-5):
+            centroids = updated
+            break
+        centroids = updated
+
+    return centroids.astype(np.float32)
+
+
+class CollectionRouter:
+    """
+    Routes query embeddings to the closest collections.
+
+    Features:
+    - Per-collection k-means centroids, persisted next to ChromaDB
+    - Top-k selection with a similarity margin
+    - Counters for collection searches avoided
+    """
+
+    def __init__(
+        self,
+        chroma_db_path: str = "satya_data/chroma_db",
+        max_collections: int = 3,
+        margin: float = 0.08,
+        min_similarity: float = 0.1
+    ):
+        """
+        Initialize collection router.
+
+        Args:
+            chroma_db_path: ChromaDB directory; centroids live alongside it
+            max_collections: Maximum collections searched per query
+            margin: Collections scoring within this of the best are searched
+            min_similarity: Collections below this score are never searched
+        """
+        self.centroids_path = os.path.join(chroma_db_path, CENTROIDS_FILENAME)
+        self.max_collections = max_collections
+        self.margin = margin
+        self.min_similarity = min_similarity
+
+        self.centroids: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+        self.queries_routed = 0
+        self.searches_performed = 0
+        self.searches_avoided = 0
+
+        self.load()
+
+    @property
+    def is_ready(self) -> bool:
+        return bool(self.centroids)
+
+    def fit_collection(self, name: str, embeddings, k: int = 4) -> None:
+        """Computes and stores centroids for a collection from its chunk embeddings."""
+        centroids = kmeans_centroids(np.asarray(embeddings), k=k)
+        if centroids.size == 0:
+            return
+        with self._lock:
+            self.centroids[name] = centroids
+        logger.info(f"Router: {len(centroids)} centroids stored for {name}")
+
+    def fit_from_chroma(self, collection, sample_size: Optional[int] = None, k: int = 4) -> bool:
+        """Fits centroids from embeddings stored in a ChromaDB collection."""
+        sample = collection.get(limit=sample_size, include=["embeddings"])
+        embeddings = sample.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            return False
+        self.fit_collection(collection.name, embeddings, k=k)
+        return True
+
+    def remove_collection(self, name: str) -> None:
+        with self._lock:
+            self.centroids.pop(name, None)
+
+    def sync_with_client(self, chroma_client, sample_size: int = 500, k: int = 4) -> int:
+        """
+        Fits centroids for collections that were ingested without them and
+        drops centroids of collections that no longer exist.
+
+        Returns:
+            Number of collections newly fitted
+        """
+        if chroma_client is None:
+            return 0
+
+        existing = [c.name for c in chroma_client.list_collections()]
+        fitted = 0
+
+        for name in list(self.centroids):
+            if name not in existing:
+                self.remove_collection(name)
+
+        for name in existing:
+            if name in self.centroids:
+                continue
+            try:
+                if self.fit_from_chroma(chroma_client.get_collection(name), sample_size, k):
+                    fitted += 1
+            except Exception as e:
+                logger.warning(f"Router: could not sample {name}: {e}")
+
+        if fitted:
+            self.save()
+        return fitted
+
+    def score(self, query_embedding) -> List[Tuple[str, float]]:
+        """Scores every collection by its best centroid similarity, best first."""
+        query = np.asarray(query_embedding, dtype=np.float32).flatten()
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return []
+        query = query / query_norm
+
+        with self._lock:
+            items = list(self.centroids.items())
+
+        scores = []
+        for name, centroids in items:
+            if centroids.shape[1] != query.shape[0]:
+                continue
+            scores.append((name, float(np.max(centroids @ query))))
+
+        scores.sort(key=lambda x: x[1], reverse=True)
+        return scores
+
+    def route(
+        self,
+        query_embedding,
+        candidates: Optional[List[str]] = None,
+        max_collections: Optional[int] = None
+    ) -> List[str]:
+        """
+        Selects collections to search for a query.
+
+        Args:
+            query_embedding: Query embedding vector
+            candidates: Optional restriction to these collection names
+            max_collections: Overrides the configured fan-out cap
+
+        Returns:
+            Collection names, best first (empty if no centroids are known)
+        """
+        scores = self.score(query_embedding)
+        if candidates is not None:
+            allowed = set(candidates)
+            scores = [s for s in scores if s[0] in allowed]
+        if not scores:
+            return []
+
+        limit = max_collections or self.max_collections
+        best = scores[0][1]
+        selected = [
+            name for name, sim in scores
+            if sim >= best - self.margin and sim >= self.min_similarity
+        ][:limit]
+
+        # Always searches the closest collection
+        if not selected:
+            selected = [scores[0][0]]
+
+        self.queries_routed += 1
+        self.searches_performed += len(selected)
+        self.searches_avoided += len(scores) - len(selected)
+
+        logger.info(
+            f"Router selected {len(selected)}/{len(scores)} collections: {selected}"
+        )
+        return selected
+
+    def load(self) -> None:
+        """Loads centroids from disk."""
+        if not os.path.exists(self.centroids_path):
+            return
+
+        try:
+            with open(self.centroids_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            with self._lock:
+                self.centroids = {
+                    name: np.asarray(vectors, dtype=np.float32)
+                    for name, vectors in data.get("collections", {}).items()
+                    if vectors
+                }
+            logger.info(f"Loaded router centroids: {len(self.centroids)} collections")
+        except Exception as e:
+            logger.warning(f"Could not load router centroids: {e}")
+            self.centroids = {}
+
+    def save(self) -> None:
+        """Saves centroids to disk."""
+        try:
+            os.makedirs(os.path.dirname(self.centroids_path) or ".", exist_ok=True)
+            with self._lock:
+                data = {
+                    "collections": {
+                        name: np.round(c, 6).tolist()
+                        for name, c in self.centroids.items()
+                    }
+                }
+            with open(self.centroids_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except Exception as e:
+            logger.warning(f"Could not save router centroids: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """Gets routing statistics."""
+        total = self.searches_performed + self.searches_avoided
+        return {
+            "collections": len(self.centroids),
+            "queries_routed": self.queries_routed,
+            "searches_performed": self.searches_performed,
+            "searches_avoided": self.searches_avoided,
+            "avoided_ratio": (self.searches_avoided / total) if total else 0.0
+        }
@@ -0,0 +1,126 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Concept-browse Prefetcher for Satya RAG
+
+When a concept is opened, its own questions and summary are the most likely
+next things a student asks about. This warms embeddings and retrieval for
+them (and optionally full answers) as low-priority LLM scheduler work that
+is dropped the moment the student does something interactive.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from ai_model.model_utils.llm_scheduler import LLMScheduler
+
+logger = logging.getLogger(__name__)
+
+RETRIEVAL_PRIORITY = 10
+ANSWER_PRIORITY = 20
+
+
+class ConceptPrefetcher:
+    """
+    Background warm-up of likely questions for the open concept.
+    """
+
+    def __init__(
+        self,
+        rag_engine,
+        scheduler: Optional[LLMScheduler] = None,
+        prefetch_answers: bool = False,
+        max_questions: int = 5
+    ):
+        """
+        Initialize concept prefetcher.
+
+        Args:
+            rag_engine: RAGRetrievalEngine to warm
+            scheduler: LLM scheduler shared with interactive calls
+            prefetch_answers: Also generate and cache full answers
+            max_questions: Questions warmed per concept
+        """
+        self.rag_engine = rag_engine
+        self.scheduler = scheduler or getattr(rag_engine.llm, 'scheduler', None) or LLMScheduler()
+        self.prefetch_answers = prefetch_answers
+        self.max_questions = max_questions
+        self.retrievals_warmed = 0
+        self.answers_warmed = 0
+
+    @staticmethod
+    def likely_questions(concept: Dict, limit: int) -> List[str]:
+        """Collects the concept's questions, then its summary's first sentence."""
+        texts = [
+            q.get('question', '').strip()
+            for q in concept.get('questions', [])
+            if isinstance(q, dict) and q.get('question')
+        ][:limit]
+
+        summary = (concept.get('summary') or '').strip()
+        if summary:
+            texts.append(summary.split('. ')[0])
+        return texts
+
+    def start(self, concept: Dict, subject: str, grade: str = "") -> int:
+        """
+        Queues warm-up work for a newly opened concept.
+
+        Args:
+            concept: Concept data with 'questions' and 'summary'
+            subject: Subject filter
+            grade: Grade filter
+
+        Returns:
+            Number of texts queued
+        """
+        self.cancel()
+        texts = self.likely_questions(concept or {}, self.max_questions)
+
+        for text in texts:
+            self.scheduler.submit_background(
+                self._warm_retrieval, text, subject, grade, priority=RETRIEVAL_PRIORITY
+            )
+
+        if self.prefetch_answers:
+            for text in texts[:self.max_questions]:
+                self.scheduler.submit_background(
+                    self._warm_answer, text, subject, grade,
+                    priority=ANSWER_PRIORITY, uses_llm=True
+                )
+
+        logger.debug(f"Queued prefetch for {len(texts)} concept texts")
+        return len(texts)
+
+    def cancel(self) -> None:
+        """Drops queued warm-up work and stops the running task."""
+        self.scheduler.cancel_background()
+
+    def _warm_retrieval(self, cancelled, text: str, subject: str, grade: str) -> None:
+        if cancelled():
+            return
+        if self.rag_engine.prefetch(text, subject, grade):
+            self.retrievals_warmed += 1
+
+    def _warm_answer(self, cancelled, text: str, subject: str, grade: str) -> None:
+        if cancelled() or self.rag_engine.cache.get(text, subject, grade):
+            return
+        result = self.rag_engine.query(
+            text, subject, grade=grade, should_cancel=cancelled, log_question=False
+        )
+        if result.get("type") == "rag_response":
+            self.answers_warmed += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Gets prefetch statistics."""
+        return {
+            "retrievals_warmed": self.retrievals_warmed,
+            "answers_warmed": self.answers_warmed,
+            **self.scheduler.stats()
+        }
@@ -0,0 +1,129 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Extractive Context Compressor for Satya RAG
+
+Keeps only the sentences of the packed context that are closest to the
+question embedding, within a token budget. Shorter prompts mean less
+prefill work on CPU and a lower time-to-first-token.
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from system.rag.context_packer import approximate_token_count, split_sentences
+
+logger = logging.getLogger(__name__)
+
+
+class ContextCompressor:
+    """
+    Sentence-level extractive compression scored against the query embedding.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], np.ndarray],
+        token_counter: Optional[Callable[[str], int]] = None,
+        token_budget: int = 120,
+        min_similarity: float = 0.15
+    ):
+        """
+        Initialize context compressor.
+
+        Args:
+            embed_fn: Embeds a list of sentences (rows L2-normalised)
+            token_counter: Returns the model token count of a text
+            token_budget: Maximum tokens kept after compression
+            min_similarity: Sentences below this similarity are dropped
+        """
+        self.embed_fn = embed_fn
+        self.token_counter = token_counter or approximate_token_count
+        self.token_budget = token_budget
+        self.min_similarity = min_similarity
+
+    def _count(self, text: str) -> int:
+        try:
+            return self.token_counter(text)
+        except Exception:
+            return approximate_token_count(text)
+
+    def compress(
+        self,
+        chunks: List[Dict],
+        query_embedding,
+        token_budget: Optional[int] = None,
+        sentence_tokens: Optional[Dict[str, List[int]]] = None
+    ) -> List[Dict]:
+        """
+        Compresses chunk texts to their most query-relevant sentences.
+
+        Args:
+            chunks: Ordered context chunks with 'text'
+            query_embedding: Embedding already computed for retrieval
+            token_budget: Overrides the configured budget
+            sentence_tokens: Pre-tokenised sentence ids from the token store
+
+        Returns:
+            Chunks (copies) in the same order with compressed 'text' and
+            recounted 'tokens'; chunks left with no sentences are dropped
+        """
+        budget = self.token_budget if token_budget is None else token_budget
+        if not chunks or query_embedding is None:
+            return chunks
+
+        sentences = []  # (chunk_idx, text, tokens)
+        for ci, chunk in enumerate(chunks):
+            for sentence in split_sentences(chunk.get('text', '')):
+                if sentence_tokens and sentence in sentence_tokens:
+                    tokens = len(sentence_tokens[sentence])
+                else:
+                    tokens = self._count(sentence + " ")
+                sentences.append((ci, sentence, tokens))
+
+        total = sum(s[2] for s in sentences)
+        if total <= budget:
+            return chunks
+
+        try:
+            embeddings = np.asarray(self.embed_fn([s[1] for s in sentences]), dtype=np.float32)
+            query = np.asarray(query_embedding, dtype=np.float32).flatten()
+            query /= max(np.linalg.norm(query), 1e-12)
+            norms = np.maximum(np.linalg.norm(embeddings, axis=1), 1e-12)
+            scores = (embeddings @ query) / norms
+        except Exception as e:
+            logger.warning(f"Context compression skipped: {e}")
+            return chunks
+
+        kept = set()
+        used = 0
+        for idx in np.argsort(-scores):
+            if scores[idx] < self.min_similarity and kept:
+                break
+            tokens = sentences[idx][2]
+            if used + tokens > budget:
+                continue
+            kept.add(int(idx))
+            used += tokens
+
+        compressed = []
+        for ci, chunk in enumerate(chunks):
+            # Keeps the original sentence order for readability
+            kept_sentences = [s for i, s in enumerate(sentences) if s[0] == ci and i in kept]
+            if kept_sentences:
+                compressed.append({
+                    **chunk,
+                    'text': " ".join(s[1] for s in kept_sentences),
+                    'tokens': sum(s[2] for s in kept_sentences)
+                })
+
+        logger.info(f"Compressed context: {total} -> {used} tokens")
+        return compressed
@@ -0,0 +1,189 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Token-budgeted Context Packer for Satya RAG
+
+Fills the prompt's reference material up to a token budget:
+1. Maximal marginal relevance (MMR) chunk selection
+2. Removal of overlapping spans left by chunk overlap
+3. Removal of near-duplicate sentences
+4. Exact accounting with the model's tokenizer
+"""
+
+import re
+import logging
+from typing import Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+_WORD = re.compile(r'\w+')
+
+
+def approximate_token_count(text: str) -> int:
+    """Rough token estimate (~4 characters per token) used when no tokenizer is loaded."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def split_sentences(text: str) -> List[str]:
+    """Splits text into sentences, dropping empty fragments."""
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text or "") if s and s.strip()]
+
+
+def _shingles(text: str, size: int = 3) -> Set[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_WORD.findall(text.lower()))
+
+
+class ContextPacker:
+    """
+    Packs ranked chunks into a token budget with MMR de-duplication.
+    """
+
+    def __init__(
+        self,
+        token_counter: Optional[Callable[[str], int]] = None,
+        token_budget: int = 200,
+        mmr_lambda: float = 0.7,
+        duplicate_threshold: float = 0.8
+    ):
+        """
+        Initialize context packer.
+
+        Args:
+            token_counter: Returns the model token count of a text
+            token_budget: Maximum context tokens
+            mmr_lambda: Relevance vs. diversity trade-off (1.0 = relevance only)
+            duplicate_threshold: Word-set similarity above which a sentence is a duplicate
+        """
+        self.token_counter = token_counter or approximate_token_count
+        self.token_budget = token_budget
+        self.mmr_lambda = mmr_lambda
+        self.duplicate_threshold = duplicate_threshold
+
+    def count_tokens(self, text: str) -> int:
+        try:
+            return self.token_counter(text)
+        except Exception as e:
+            logger.debug(f"Token counter failed, approximating: {e}")
+            return approximate_token_count(text)
+
+    def sentence_count(self, sentence: str, sentence_tokens: Optional[Dict[str, List[int]]] = None) -> int:
+        """Counts a sentence's tokens, using pre-tokenised ids when available."""
+        if sentence_tokens and sentence in sentence_tokens:
+            return len(sentence_tokens[sentence])
+        return self.count_tokens(sentence + " ")
+
+    def select_mmr(self, chunks: List[Dict], limit: Optional[int] = None) -> List[Dict]:
+        """
+        Orders chunks by maximal marginal relevance.
+
+        Args:
+            chunks: Ranked chunks with 'text' and 'final_score'
+            limit: Maximum chunks to return
+
+        Returns:
+            Chunks in MMR order
+        """
+        remaining = list(chunks)
+        shingles = {id(c): _shingles(c.get('text', '')) for c in remaining}
+        selected: List[Dict] = []
+        limit = limit or len(remaining)
+
+        while remaining and len(selected) < limit:
+            best, best_score = None, float('-inf')
+            for chunk in remaining:
+                redundancy = max(
+                    (_jaccard(shingles[id(chunk)], shingles[id(s)]) for s in selected),
+                    default=0.0
+                )
+                score = (
+                    self.mmr_lambda * chunk.get('final_score', 0.0)
+                    - (1 - self.mmr_lambda) * redundancy
+                )
+                if score > best_score:
+                    best, best_score = chunk, score
+            selected.append(best)
+            remaining.remove(best)
+
+        return selected
+
+    def pack(
+        self,
+        chunks: List[Dict],
+        token_budget: Optional[int] = None,
+        sentence_tokens: Optional[Dict[str, List[int]]] = None
+    ) -> List[Dict]:
+        """
+        Selects and trims chunks to fit the token budget.
+
+        Args:
+            chunks: Ranked chunks with 'text' and 'final_score'
+            token_budget: Overrides the configured budget
+            sentence_tokens: Pre-tokenised sentence ids from the token store
+
+        Returns:
+            Packed chunks (copies) with de-duplicated 'text' and 'tokens'
+        """
+        budget = self.token_budget if token_budget is None else token_budget
+        if budget <= 0 or not chunks:
+            return []
+
+        packed: List[Dict] = []
+        packed_text = " "
+        packed_sentences: Set[str] = set()
+        packed_words: List[Set[str]] = []
+        used = 0
+
+        for chunk in self.select_mmr(chunks):
+            kept, kept_tokens = [], 0
+            for i, sentence in enumerate(split_sentences(chunk.get('text', ''))):
+                norm = _normalize(sentence)
+                if not norm or norm in packed_sentences:
+                    continue
+                # Chunker overlap makes a chunk open with the cut-off tail of an
+                # earlier sentence; only such a leading fragment (no capital) is
+                # matched inside packed sentences, on word boundaries
+                if i == 0 and not sentence[:1].isupper() and f" {norm} " in packed_text:
+                    continue
+                words = set(norm.split())
+                if any(_jaccard(words, w) >= self.duplicate_threshold for w in packed_words):
+                    continue
+
+                tokens = self.sentence_count(sentence, sentence_tokens)
+                if used + tokens > budget:
+                    break
+                kept.append(sentence)
+                kept_tokens += tokens
+                used += tokens
+                packed_text += norm + " "
+                packed_sentences.add(norm)
+                packed_words.append(words)
+
+            if kept:
+                text = " ".join(kept)
+                packed.append({**chunk, 'text': text, 'tokens': kept_tokens})
+
+            if used >= budget:
+                break
+
+        logger.info(f"Packed {len(packed)} chunks into {used}/{budget} tokens")
+        return packed
@@ -0,0 +1,181 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Multi-turn Follow-up Session for Satya RAG
+
+Keeps the retrieval set and the evaluated tokens of the last answer so that
+follow-ups such as "explain more" or "give an example" skip normalisation,
+embedding and retrieval, and only the new turn is evaluated by the model.
+"""
+
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# (pattern, turn template); {topic} is the previous question, {turn} the student's words
+FOLLOW_UP_PATTERNS = [
+    (re.compile(r"\b(give|show)\b.*\bexamples?\b|^(an?\s+)?examples?\b|\bfor example\b", re.I),
+     "Give a simple example for: {topic} (student asked: \"{turn}\")"),
+    (re.compile(r"\b(simpler|simplify|easier|simple words|don'?t understand|didn'?t understand|confus)", re.I),
+     "Explain in simpler words: {topic} (student asked: \"{turn}\")"),
+    (re.compile(r"\b(explain|tell( me)?|say)\b.*\b(more|further|again|detail)\b|\b(elaborate|go on|continue|more details?)\b", re.I),
+     "Explain in more detail: {topic} (student asked: \"{turn}\")"),
+    (re.compile(r"^(why|how)\s*(so|come)?\s*\??$|^what do you mean\b", re.I),
+     "Explain why, for: {topic} (student asked: \"{turn}\")"),
+]
+
+# A pattern turn only continues the session when it is short and every word
+# is follow-up phrasing; any other word names a topic, i.e. a new question
+_MAX_FOLLOW_UP_WORDS = 8
+_FOLLOW_UP_VOCABULARY = frozenset("""
+    a an the it this that these those them they one some another other more bit little
+    can could would will you please pls plz me us i we to of for in on with about again
+    give show example examples explain tell say elaborate continue go further detail details
+    simpler simple simply simplify easier words word understand understood confused confusing
+    don't dont didn't didnt not do does what why how so come mean make just
+    is are was were be did happen happens work works means really
+""".split())
+_WORD = re.compile(r"[a-z']+")
+
+# Short turns that lean on the previous answer ("what about it?"); like
+# pattern turns they may only use follow-up vocabulary ("is it a mammal?" is new)
+_REFERENCE_WORDS = re.compile(r"\b(it|this|that|these|those|they|them)\b", re.I)
+_MAX_REFERENCE_WORDS = 6
+
+
+def _names_no_topic(text: str) -> bool:
+    words = text.lower().split()
+    if len(words) > _MAX_FOLLOW_UP_WORDS:
+        return False
+    return all(w in _FOLLOW_UP_VOCABULARY for w in _WORD.findall(text.lower()))
+
+
+def detect_follow_up(text: str) -> Optional[str]:
+    """
+    Detects a follow-up turn.
+
+    Args:
+        text: Raw user input
+
+    Returns:
+        Turn template with {topic} and {turn} placeholders, or None for a new question
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+
+    if _names_no_topic(text):
+        for pattern, template in FOLLOW_UP_PATTERNS:
+            if pattern.search(text):
+                return template
+
+    if (len(text.split()) <= _MAX_REFERENCE_WORDS and _REFERENCE_WORDS.search(text)
+            and _names_no_topic(text)):
+        return "{turn} (about: {topic})"
+
+    return None
+
+
+class FollowUpSession:
+    """
+    Conversation state shared between consecutive RAG queries.
+    """
+
+    def __init__(self, ttl_seconds: int = 600, max_turns: int = 4):
+        """
+        Initialize follow-up session.
+
+        Args:
+            ttl_seconds: Idle time after which the session expires
+            max_turns: Follow-ups allowed per retrieved question
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_turns = max_turns
+        self._lock = threading.Lock()
+        self.follow_ups_served = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets the previous question, retrieval set and model state."""
+        self.question: str = ""
+        self.subject: str = ""
+        self.grade: str = ""
+        self.chunks: List[Dict] = []
+        self.context: str = ""
+        self.context_tokens: Optional[List[List[List[int]]]] = None
+        self.llm_state: Any = None
+        self.turns = 0
+        self.updated_at = 0.0
+
+    @property
+    def active(self) -> bool:
+        return bool(self.question) and time.time() - self.updated_at <= self.ttl_seconds
+
+    def match(self, text: str, subject: str, grade: str) -> Optional[str]:
+        """
+        Checks whether text continues this session.
+
+        Args:
+            text: Raw user input
+            subject: Current subject filter
+            grade: Current grade filter
+
+        Returns:
+            The follow-up turn to send to the model, or None
+        """
+        with self._lock:
+            if not self.active or self.turns >= self.max_turns:
+                return None
+            if (subject or "") != self.subject or (grade or "") != self.grade:
+                return None
+            template = detect_follow_up(text)
+            if template is None:
+                return None
+            return template.format(topic=self.question, turn=text.strip())
+
+    def start(
+        self,
+        question: str,
+        subject: str,
+        grade: str,
+        chunks: List[Dict],
+        context: str,
+        context_tokens: Optional[List[List[List[int]]]] = None,
+        llm_state: Any = None
+    ) -> None:
+        """Records a freshly retrieved question as the session topic."""
+        with self._lock:
+            self.question = question
+            self.subject = subject or ""
+            self.grade = grade or ""
+            self.chunks = list(chunks)
+            self.context = context
+            self.context_tokens = context_tokens
+            self.llm_state = llm_state
+            self.turns = 0
+            self.updated_at = time.time()
+
+    def record_turn(self, llm_state: Any = None) -> None:
+        """Records a served follow-up and the model state after it."""
+        with self._lock:
+            self.llm_state = llm_state
+            self.turns += 1
+            self.follow_ups_served += 1
+            self.updated_at = time.time()
+
+    def stats(self) -> Dict[str, Any]:
+        """Gets session statistics."""
+        return {
+            "active": self.active,
+            "question": self.question,
+            "turns": self.turns,
+            "has_llm_state": self.llm_state is not None,
+            "follow_ups_served": self.follow_ups_served
+        }
@@ -0,0 +1,107 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Per-request Latency Budget for Satya RAG
+
+Tracks time spent against a time-to-first-token target and lets each query
+stage pick a cheaper setting when earlier stages ran long. Every downgrade
+is recorded so it can be reported with the answer.
+
+Stage costs are rough i3 CPU estimates and can be tuned per device.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyBudget:
+    """
+    Deadline shared by the stages of one query.
+    """
+
+    SPELL_CHECK_COST = 0.6         # LanguageTool pass, seconds
+    COLLECTION_SEARCH_COST = 0.15  # One Chroma query, seconds
+    PREFILL_COST_PER_TOKEN = 0.008 # Phi 1.5 prompt evaluation, seconds/token
+    PROMPT_OVERHEAD_TOKENS = 80    # Instruction + question tokens
+
+    def __init__(self, ttft_seconds: float = 3.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize latency budget.
+
+        Args:
+            ttft_seconds: Target time to first token
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.ttft_seconds = ttft_seconds
+        self.clock = clock
+        self.started_at = clock()
+        self.degradations: List[str] = []
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started_at
+
+    def remaining(self) -> float:
+        return self.ttft_seconds - self.elapsed()
+
+    def _degrade(self, name: str) -> None:
+        self.degradations.append(name)
+        logger.info(f"Latency budget: {name} ({self.remaining():.2f}s left)")
+
+    def _prefill_seconds(self, tokens: int) -> float:
+        return (tokens + self.PROMPT_OVERHEAD_TOKENS) * self.PREFILL_COST_PER_TOKEN
+
+    def allow_spell_check(self, context_tokens: int) -> bool:
+        """Allows spell-check if it still leaves time for search and prefill."""
+        reserve = self.COLLECTION_SEARCH_COST + self._prefill_seconds(context_tokens)
+        if self.remaining() - self.SPELL_CHECK_COST >= reserve:
+            return True
+        self._degrade("skip_spell_check")
+        return False
+
+    def spell_check_wait(self, default: float, context_tokens: int) -> float:
+        """Caps the wait for a background spell-check so search and prefill still fit."""
+        reserve = self.COLLECTION_SEARCH_COST + self._prefill_seconds(context_tokens)
+        return max(0.0, min(default, self.remaining() - reserve))
+
+    def collection_limit(self, default: int, context_tokens: int) -> int:
+        """Caps collections searched so the searches fit before prefill."""
+        spare = self.remaining() - self._prefill_seconds(context_tokens)
+        limit = max(1, min(default, int(spare // self.COLLECTION_SEARCH_COST)))
+        if limit < default:
+            self._degrade(f"collections_{default}_to_{limit}")
+        return limit
+
+    def context_tokens(self, default: int, minimum: int = 60) -> int:
+        """Cuts reference tokens so prefill fits the remaining time."""
+        affordable = int(self.remaining() / self.PREFILL_COST_PER_TOKEN) - self.PROMPT_OVERHEAD_TOKENS
+        tokens = max(minimum, min(default, affordable))
+        if tokens < default:
+            self._degrade(f"context_tokens_{default}_to_{tokens}")
+        return tokens
+
+    def max_tokens(self, default: int, minimum: int = 160) -> int:
+        """Shortens the answer in proportion to how much budget was used."""
+        fraction = max(0.0, self.remaining()) / self.ttft_seconds if self.ttft_seconds else 0.0
+        if fraction >= 0.5:
+            return default
+        tokens = max(minimum, int(default * (0.5 + fraction)))
+        if tokens < default:
+            self._degrade(f"max_tokens_{default}_to_{tokens}")
+        return tokens
+
+    def report(self) -> Dict:
+        """Gets the budget outcome for the response."""
+        return {
+            "ttft_budget": self.ttft_seconds,
+            "elapsed_before_generation": round(self.elapsed(), 3),
+            "degradations": list(self.degradations)
+        }
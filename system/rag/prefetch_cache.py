@@ -0,0 +1,189 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Speculative Retrieval Cache for Satya RAG
+
+Holds retrieval results computed in the background from the partial text
+of a question while the student is still typing. On submit the engine
+reuses an entry whose text matches, whose text is a prefix of the question
+(the debounced partial "what is photosynthe" for "what is photosynthesis"),
+or whose embedding nearly matches, and goes straight to generation.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+_NON_WORD = re.compile(r'[^\w\s]')
+_SPACES = re.compile(r'\s+')
+
+
+def canonical_text(text: str) -> str:
+    """Lowercases text and drops punctuation and repeated spaces."""
+    return _SPACES.sub(' ', _NON_WORD.sub(' ', (text or '').lower())).strip()
+
+
+class PrefetchCache:
+    """
+    Small LRU of speculative retrieval results keyed by question text.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 8,
+        ttl_seconds: int = 120,
+        similarity_threshold: float = 0.93,
+        max_prefix_extra_words: int = 0,
+        min_prefix_ratio: float = 0.75
+    ):
+        """
+        Initialize prefetch cache.
+
+        Args:
+            max_entries: Entries kept (a few typing pauses' worth)
+            ttl_seconds: Age after which an entry is ignored
+            similarity_threshold: Embedding cosine for a near match
+            max_prefix_extra_words: Words the question may add after a cached
+                prefix (besides finishing its last word) for a prefix match
+            min_prefix_ratio: Share of the question's characters a cached
+                prefix must cover ("what is photo" is too little to reuse)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.max_prefix_extra_words = max_prefix_extra_words
+        self.min_prefix_ratio = min_prefix_ratio
+        # key -> (entry, timestamp)
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.prefix_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(text: str, subject: str, grade: str) -> Tuple[str, str, str]:
+        return canonical_text(text), (subject or '').lower(), grade or ''
+
+    def _fresh(self, timestamp: float) -> bool:
+        return time.time() - timestamp <= self.ttl_seconds
+
+    def contains(self, text: str, subject: str, grade: str) -> bool:
+        with self._lock:
+            item = self._entries.get(self._key(text, subject, grade))
+            return item is not None and self._fresh(item[1])
+
+    def put(self, texts, subject: str, grade: str, entry: Dict[str, Any]) -> None:
+        """
+        Stores a retrieval result under one or more texts.
+
+        Args:
+            texts: Raw and normalized forms of the partial question
+            subject: Subject filter used
+            grade: Grade filter used
+            entry: Retrieval result with an 'embedding'
+        """
+        now = time.time()
+        with self._lock:
+            for text in texts:
+                if not canonical_text(text):
+                    continue
+                key = self._key(text, subject, grade)
+                self._entries[key] = (entry, now)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, text: str, subject: str, grade: str) -> Optional[Dict[str, Any]]:
+        """Gets the entry whose text matches after canonicalisation."""
+        with self._lock:
+            item = self._entries.get(self._key(text, subject, grade))
+            if item and self._fresh(item[1]):
+                self.exact_hits += 1
+                return item[0]
+        return None
+
+    def find_prefix(self, text: str, subject: str, grade: str) -> Optional[Dict[str, Any]]:
+        """
+        Finds the entry for the longest cached partial that the question completes.
+
+        Args:
+            text: Submitted question
+            subject: Subject filter
+            grade: Grade filter
+
+        Returns:
+            Entry whose text is a prefix of the question, or None
+        """
+        question, subject_key, grade_key = self._key(text, subject, grade)
+        best, best_length = None, int(len(question) * self.min_prefix_ratio) - 1
+        with self._lock:
+            for (partial, s, g), (entry, timestamp) in self._entries.items():
+                if s != subject_key or g != grade_key or not self._fresh(timestamp):
+                    continue
+                if len(partial) <= best_length or not question.startswith(partial):
+                    continue
+                # The rest may finish the partial's last word and add a few more
+                if len(question[len(partial):].split(' ')) - 1 > self.max_prefix_extra_words:
+                    continue
+                best, best_length = entry, len(partial)
+
+        if best is not None:
+            self.prefix_hits += 1
+        return best
+
+    def find_near(self, embedding, subject: str, grade: str) -> Optional[Dict[str, Any]]:
+        """
+        Finds an entry whose question embedding nearly matches.
+
+        Args:
+            embedding: Embedding of the submitted question
+            subject: Subject filter
+            grade: Grade filter
+
+        Returns:
+            Closest entry above the similarity threshold, or None
+        """
+        query = np.asarray(embedding, dtype=np.float32).flatten()
+        query /= max(np.linalg.norm(query), 1e-12)
+        subject_key, grade_key = (subject or '').lower(), grade or ''
+
+        best, best_sim = None, self.similarity_threshold
+        with self._lock:
+            for (_, s, g), (entry, timestamp) in self._entries.items():
+                if s != subject_key or g != grade_key or not self._fresh(timestamp):
+                    continue
+                cached = np.asarray(entry['embedding'], dtype=np.float32).flatten()
+                sim = float(np.dot(query, cached) / max(np.linalg.norm(cached), 1e-12))
+                if sim >= best_sim:
+                    best, best_sim = entry, sim
+
+        if best is None:
+            self.misses += 1
+        else:
+            self.near_hits += 1
+        return best
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Gets prefetch statistics."""
+        return {
+            "entries": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "near_hits": self.near_hits,
+            "prefix_hits": self.prefix_hits,
+            "misses": self.misses
+        }
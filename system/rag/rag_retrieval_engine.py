@@ -11,15 +11,27 @@ Lightweight RAG Retrieval Engine for Satya Learning System
 """
 
 import logging
+import re
 import time
-from typing import Dict, List, Any
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Any, Optional
 import chromadb
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeout
 
 from system.rag.anti_confusion_engine import AntiConfusionEngine
 from system.rag.ascii_diagram_library import ASCIIDiagramLibrary
 from system.rag.user_edge_case_handler import UserEdgeCaseHandler
 from system.rag.rag_cache import RAGCache
+from system.rag.collection_router import CollectionRouter
+from system.rag.context_packer import ContextPacker, split_sentences
+from system.rag.context_compressor import ContextCompressor
+from system.rag.token_store import ChunkTokenStore
+from system.rag.followup_session import FollowUpSession
+from system.rag.latency_budget import LatencyBudget
+from system.rag.stream_monitor import StreamMonitor
+from system.rag.prefetch_cache import PrefetchCache
+from system.diagrams import prepare_diagram
 from system.input_processing.adaptive_normalizer import AdaptiveNormalizer
 from scripts.rag_data_preparation.embedding_generator import EmbeddingGenerator
 from ai_model.model_utils.model_handler import ModelHandler
@@ -34,15 +46,26 @@ class RAGRetrievalEngine:
         self,
         chroma_db_path: str = "satya_data/chroma_db",
         model_path: str = "satya_data/models/phi15",
-        llm_handler=None
+        llm_handler=None,
+        context_token_budget: int = 180,
+        compressed_token_budget: int = 120,
+        ttft_budget: float = 3.0,
+        max_answer_tokens: int = 512,
+        spell_wait: float = 0.15
     ):
         logger.info("Initializing Satya RAG Engine...")
 
         self.chroma_db_path = chroma_db_path
+        self.ttft_budget = ttft_budget
+        self.max_answer_tokens = max_answer_tokens
+        self.spell_wait = spell_wait
         self.edge_case_handler = UserEdgeCaseHandler()
         self.anti_confusion = AntiConfusionEngine()
         self.diagram_library = ASCIIDiagramLibrary()
         self.cache = RAGCache(max_size=100, ttl_seconds=3600)
+        self.router = CollectionRouter(chroma_db_path=chroma_db_path, max_collections=3)
+        self.token_store = ChunkTokenStore(chroma_db_path=chroma_db_path)
+        self.prefetch_cache = PrefetchCache()
         self.input_normalizer = AdaptiveNormalizer(enable_spell_check=True)
         self.embedding_gen = EmbeddingGenerator(device='cpu')
 
@@ -66,6 +89,20 @@ class RAGRetrievalEngine:
                 logger.error(f"LLM connection failed: {e}")
                 self.llm = None
         
+        # Counts real Phi tokens once the model is available
+        self.context_packer = ContextPacker(
+            token_counter=getattr(self.llm, 'count_tokens', None),
+            token_budget=context_token_budget
+        )
+        self.context_compressor = ContextCompressor(
+            embed_fn=self.embedding_gen.generate_embeddings,
+            token_counter=getattr(self.llm, 'count_tokens', None),
+            token_budget=compressed_token_budget
+        )
+        
+        # Diagram lookup runs here while the LLM decodes
+        self.side_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-side")
+        
         logger.info("RAG Engine initialized")
     
     def warm_up(self):
@@ -75,6 +112,12 @@ class RAGRetrievalEngine:
         """
         logger.info("Warming up RAG engine...")
         try:
+            # Fits router centroids for collections ingested without them
+            if self.chroma_client:
+                fitted = self.router.sync_with_client(self.chroma_client)
+                if fitted:
+                    logger.info(f"Router centroids fitted for {fitted} collections")
+
             # Warms up embedding generator with dummy query
             dummy_query = "test query"
             self.embedding_gen.generate_embedding(dummy_query)
@@ -162,15 +205,105 @@ class RAGRetrievalEngine:
         logger.info(f"Total collections selected: {len(collections)}")
         return collections[:3]  
 
+    def _select_collections(
+        self,
+        query_embedding,
+        subject: str,
+        grade: str,
+        max_collections: Optional[int] = None
+    ) -> List[str]:
+        """
+        Selects collections to search for a query embedding.
+
+        Uses centroid routing when centroids are available and falls back
+        to name matching for databases ingested before the router existed.
+        """
+        if self.router.is_ready:
+            candidates = None
+            if grade:
+                candidates = [
+                    name for name in self.router.centroids
+                    if self._collection_grade(name) in (None, grade)
+                ]
+            routed = self.router.route(query_embedding, candidates=candidates, max_collections=max_collections)
+            if routed:
+                return routed
+        return self._get_relevant_collections(subject, grade)[:max_collections]
+
+    @staticmethod
+    def _collection_grade(collection_name: str) -> Optional[str]:
+        """Extracts the grade from NEB collection names (neb_{subject}_grade_{grade})."""
+        match = re.search(r'_grade_(\w+)$', collection_name.lower())
+        return match.group(1) if match else None
+
+    @staticmethod
+    def _build_where_filters(collection_name: str, subject: str, grade: str) -> List[Optional[Dict]]:
+        """
+        Builds ChromaDB where filters for a collection, narrowest first.
+
+        Only NEB collections carry grade/subject metadata from ingestion,
+        so other collections are searched unfiltered. The final None entry
+        is the unfiltered fallback used when a filter matches nothing.
+        """
+        if not collection_name.lower().startswith("neb_"):
+            return [None]
+
+        clauses = []
+        if grade:
+            clauses.append({"grade": str(grade)})
+        if subject:
+            clauses.append({"subject": subject.lower().strip().replace(" ", "_")})
+
+        filters: List[Optional[Dict]] = []
+        if len(clauses) == 2:
+            filters.append({"$and": clauses})
+        if clauses:
+            # Grade alone when the subject naming does not match ingestion
+            filters.append(clauses[0])
+        filters.append(None)
+        return filters
+
     def query(
         self,
         query_text: str,
         subject: str,
         n_results: int = 3,
-        stream_callback=None 
+        stream_callback=None,
+        grade: str = "",
+        session: Optional[FollowUpSession] = None,
+        ttft_budget: Optional[float] = None,
+        event_callback=None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        log_question: bool = True
     ) -> Dict[str, Any]:
-        """Main query method, with streaming support."""
+        """
+        Main query method, with streaming support.
+
+        event_callback(event, payload), if given, receives "sources" before
+        the first token and "diagram" as soon as the lookup finishes, both
+        computed concurrently with decoding. When the stream monitor stops a
+        degenerating answer, "answer" carries the trimmed text that replaces
+        the tokens already streamed.
+
+        When a FollowUpSession is given, follow-ups to its last question reuse
+        the previous retrieval set and model state instead of a new search.
+        Each stage consults a time-to-first-token budget (ttft_budget seconds,
+        engine default otherwise) and runs a cheaper variant when it is tight.
+
+        should_cancel marks a background call from the LLM scheduler: it
+        runs without taking the interactive slot and stops generating (and
+        caches nothing) once should_cancel() returns True. Pass
+        log_question=False for questions the student did not ask (such as
+        prefetches) so they stay out of the normalization learning log.
+        """
         start_time = time.time()
+        budget = LatencyBudget(ttft_budget if ttft_budget is not None else self.ttft_budget)
+        grade = str(grade).strip() if grade else ""
+
+        if session is not None and self.llm:
+            turn = session.match(query_text, subject, grade)
+            if turn:
+                return self._answer_follow_up(session, turn, stream_callback, start_time, event_callback)
 
         # Edge case check
         edge_response = self.edge_case_handler.check_edge_cases(query_text)
@@ -190,7 +323,12 @@ class RAGRetrievalEngine:
                 stream_callback(error_msg)
             return {"answer": error_msg, "type": "error"}
         
-        normalization_result = self.input_normalizer.normalize(query_text)
+        # Spell-check runs in the background while the uncorrected question is embedded
+        normalization_result, spell_future = self.input_normalizer.normalize_speculative(
+            query_text,
+            enable_spell_check=budget.allow_spell_check(self.context_compressor.token_budget),
+            log=log_question
+        )
         clean_question = normalization_result["clean_question"]
         
         if normalization_result["notes"]:
@@ -199,7 +337,7 @@ class RAGRetrievalEngine:
         
         effective_query = clean_question if clean_question else query_text
 
-        cached_result = self.cache.get(query_text, subject, "")
+        cached_result = self.cache.get(query_text, subject, grade)
         if cached_result:
             logger.info(f"Cache HIT (exact)")
             if stream_callback:
@@ -208,6 +346,8 @@ class RAGRetrievalEngine:
                 words = answer.split()
                 for i, word in enumerate(words):
                     stream_callback(word + (" " if i < len(words) - 1 else ""))
+            if session is not None:
+                session.start(effective_query, subject, grade, [], "\n\n".join(cached_result.get("context_used", [])))
             return {**cached_result, "processing_time": time.time() - start_time}
 
         if stream_callback:
@@ -216,9 +356,29 @@ class RAGRetrievalEngine:
         if stream_callback:
             stream_callback("📊 Analyzing your question...\n\n")
         
-        query_embedding = self.embedding_gen.generate_embeddings(effective_query)
+        prefetched = (
+            self.prefetch_cache.get(query_text, subject, grade)
+            or self.prefetch_cache.get(effective_query, subject, grade)
+        )
+        if prefetched:
+            query_embedding = prefetched['embedding']
+        else:
+            query_embedding = self.embedding_gen.generate_embeddings(effective_query)
+
+        spell_corrected = False
+        if spell_future is not None:
+            corrected_result = self._await_spell_check(spell_future, normalization_result, budget)
+            if corrected_result:
+                normalization_result = corrected_result
+                effective_query = corrected_result["clean_question"] or effective_query
+                prefetched = self.prefetch_cache.get(effective_query, subject, grade)
+                query_embedding = (
+                    prefetched['embedding'] if prefetched
+                    else self.embedding_gen.generate_embeddings(effective_query)
+                )
+                spell_corrected = True
 
-        semantic_hit = self.cache.find_similar(query_embedding, subject, "", threshold=0.88)
+        semantic_hit = self.cache.find_similar(query_embedding, subject, grade, threshold=0.88)
         if semantic_hit:
             logger.info(f"Cache HIT (semantic)")
             if stream_callback:
@@ -226,28 +386,213 @@ class RAGRetrievalEngine:
                 words = answer.split()
                 for i, word in enumerate(words):
                     stream_callback(word + (" " if i < len(words) - 1 else ""))
+            if session is not None:
+                session.start(effective_query, subject, grade, [], "\n\n".join(semantic_hit.get("context_used", [])))
             return {**semantic_hit, "processing_time": time.time() - start_time}
 
-        target_collections = self._get_relevant_collections(subject, "")
-        if not target_collections:
-            logger.warning(f"No collections found for {subject}")
-        
+        if prefetched is None:
+            # A debounced partial ("what is photosynthe") or a close paraphrase
+            prefetched = (
+                self.prefetch_cache.find_prefix(query_text, subject, grade)
+                or self.prefetch_cache.find_near(query_embedding, subject, grade)
+            )
+
+        if prefetched:
+            # Retrieval already ran in the background while the student typed
+            logger.info("Using speculative retrieval")
+            target_collections = prefetched['target_collections']
+            searches_avoided = prefetched['searches_avoided']
+            relevant_chunks = prefetched['relevant_chunks']
+        else:
+            target_collections = self._select_collections(
+                query_embedding, subject, grade,
+                max_collections=budget.collection_limit(
+                    self.router.max_collections, self.context_compressor.token_budget
+                )
+            )
+            searches_avoided = max(0, len(self.router.centroids) - len(target_collections))
+            if not target_collections:
+                logger.warning(f"No collections found for {subject}")
+
+            if stream_callback:
+                stream_callback("🎯 Finding best matches...\n\n")
+
+            raw_results = self._search_collections(target_collections, query_embedding, subject, grade, n_results)
+            relevant_chunks = self._rank_chunks(raw_results, query_text)
+
+        # Token ids stored at ingest time replace tokenizer calls below
+        sentence_tokens = self.token_store.sentence_tokens(relevant_chunks)
+        final_context_chunks = self.context_packer.pack(relevant_chunks, sentence_tokens=sentence_tokens)
+
+        # Prefill time grows with prompt length; the budget decides how much fits
+        compressed_budget = budget.context_tokens(self.context_compressor.token_budget)
+
+        ordered_chunks = self.anti_confusion.resolve_conflicts(final_context_chunks)
+        ordered_chunks = self.context_compressor.compress(
+            ordered_chunks, query_embedding,
+            token_budget=compressed_budget, sentence_tokens=sentence_tokens
+        )
+        context_texts = [c['text'] for c in ordered_chunks]
+        full_context_str = "\n\n".join(context_texts)
+        context_tokens = self._context_token_ids(ordered_chunks, sentence_tokens)
+ 
         if stream_callback:
-            stream_callback("🎯 Finding best matches...\n\n")
+            stream_callback("✨ Generating answer...\n\n")
 
-        raw_results = []
+        # Sources and diagrams depend only on the question and chunks
+        sources = [c['metadata'] for c in ordered_chunks]
+        source_info = self._format_sources(sources)
+        self._emit(event_callback, "sources", {"sources": sources, "source_info": source_info})
+        diagram_future = self.side_executor.submit(self._lookup_diagrams, query_text, subject, grade)
+        if event_callback:
+            diagram_future.add_done_callback(
+                lambda f: self._emit(event_callback, "diagram", f.result())
+            )
+
+        answer = "Unable to generate answer."
+        confidence = 0.0
+        max_tokens = budget.max_tokens(self.max_answer_tokens)
+        budget_report = budget.report()
+        if budget_report["degradations"]:
+            logger.info(f"Degradations: {budget_report['degradations']}")
         
+        cancelled = False
+        monitor = StreamMonitor(full_context_str, engine=self.anti_confusion)
+        if self.llm:
+            handler = getattr(self.llm, 'handler', None)
+            with self._llm_slot(should_cancel):
+                if session is not None and should_cancel is None and hasattr(handler, 'end_session'):
+                    # This answer replaces the session; nothing to preserve
+                    handler.end_session()
+                try:
+                    if stream_callback or should_cancel:
+                        answer = ""
+                        for token in monitor.watch(self.llm.handler.get_answer_stream(
+                            effective_query, full_context_str,
+                            context_tokens=context_tokens, max_tokens=max_tokens
+                        )):
+                            if should_cancel and should_cancel():
+                                cancelled = True
+                                break
+                            answer += token
+                            if stream_callback:
+                                stream_callback(token)
+                        if monitor.reason:
+                            answer = monitor.text()
+                            self._emit(event_callback, "answer", {"answer": answer, "stopped": monitor.reason})
+
+                        confidence = self._calculate_confidence(answer, effective_query, final_context_chunks)
+                    else:
+                        answer, confidence = self.llm.simple_handler.get_answer(
+                            effective_query, full_context_str, context_tokens, max_tokens
+                        )
+                except Exception as e:
+                    logger.error(f"LLM generation error: {e}")
+                    if stream_callback:
+                        stream_callback("Error generating answer.")
+
+                if session is not None and not cancelled:
+                    # KV cache now holds prompt + answer; follow-ups append to it
+                    # (unless the answer degenerated, then they re-prefill).
+                    # Only the token ids are kept, not a copy of the state.
+                    keep_state = hasattr(handler, 'keep_session') and not monitor.reason
+                    session.start(
+                        effective_query, subject, grade, ordered_chunks, full_context_str, context_tokens,
+                        llm_state=handler.keep_session() if keep_state else None
+                    )
+
+        if cancelled:
+            logger.info("Background answer cancelled")
+            return {"answer": answer, "processing_time": time.time() - start_time, "type": "cancelled"}
+
+        diagrams = diagram_future.result()
+
+        result = {
+            "answer": answer,
+            "context_used": context_texts,
+            "sources": sources,
+            "source_info": source_info,
+            "diagram": diagrams["diagram"],
+            "diagram_prepared": diagrams["prepared"],
+            "confidence": confidence,
+            "collections_searched": target_collections,
+            "searches_avoided": searches_avoided,
+            "prefetched": prefetched is not None,
+            "degradations": budget_report["degradations"],
+            "latency_budget": budget_report,
+            "stopped_early": monitor.reason,
+            "spell_corrected": spell_corrected,
+            "processing_time": time.time() - start_time,
+            "type": "rag_response"
+        }
+
+        self.cache.set(query_text, subject, grade, result, embedding=query_embedding)
+
+        return result
+    
+    def _await_spell_check(
+        self,
+        spell_future: Future,
+        normalization_result: Dict[str, Any],
+        budget: LatencyBudget
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Waits briefly for the background spell-check.
+
+        A correction that is late or only changes short words is ignored; the
+        worker still caches it, so the next time the question is asked it is
+        corrected up front.
+        """
+        wait = budget.spell_check_wait(self.spell_wait, self.context_compressor.token_budget)
+        try:
+            corrected = spell_future.result(timeout=wait)
+        except FutureTimeout:
+            logger.info(f"Spell-check not back within {wait * 1000:.0f}ms; using the question as typed")
+            return None
+        except Exception as e:
+            logger.debug(f"Spell-check failed: {e}")
+            return None
+
+        corrected_result = self.input_normalizer.apply_correction(normalization_result, corrected)
+        if corrected_result:
+            logger.info(f"Using spell-corrected question: {corrected_result['clean_question']}")
+        return corrected_result
+
+    def _llm_slot(self, should_cancel: Optional[Callable[[], bool]] = None):
+        """Interactive model slot from the LLM scheduler (background calls already hold it)."""
+        scheduler = getattr(self.llm, 'scheduler', None)
+        if scheduler is None or should_cancel is not None:
+            return nullcontext()
+        return scheduler.interactive()
+
+    def _search_collections(
+        self,
+        target_collections: List[str],
+        query_embedding,
+        subject: str,
+        grade: str,
+        n_results: int
+    ) -> List[Dict]:
+        """Searches the target collections in parallel."""
+        raw_results = []
+
         def query_collection(coll_name):
             try:
                 coll = self.chroma_client.get_collection(coll_name)
-                res = coll.query(
-                    query_embeddings=[query_embedding.tolist()],
-                    n_results=min(2, n_results)  
-                )
+                # Pushes grade/subject down into the vector search
+                for where in self._build_where_filters(coll_name, subject, grade):
+                    res = coll.query(
+                        query_embeddings=[query_embedding.tolist()],
+                        n_results=min(2, n_results),
+                        where=where
+                    )
+                    if res['documents'] and res['documents'][0]:
+                        break
                 results = []
                 if res['documents']:
                     for i in range(len(res['documents'][0])):
                         results.append({
+                            'id': res['ids'][0][i],
                             'text': res['documents'][0][i],
                             'metadata': res['metadatas'][0][i],
                             'score': 1.0 - res['distances'][0][i],
@@ -263,65 +608,181 @@ class RAGRetrievalEngine:
             for future in as_completed(futures):
                 raw_results.extend(future.result())
 
+        return raw_results
+
+    def _rank_chunks(self, raw_results: List[Dict], query_text: str) -> List[Dict]:
+        """Ranks results and drops low-quality chunks."""
         ranked_chunks = self.anti_confusion.rank_results(raw_results, query_text)
-        final_context_chunks = []
-        current_len = 0
-        limit = 400
-        
-        for chunk in ranked_chunks:
-            if chunk['final_score'] < 0.35:
-                continue
-            text = chunk['text']
-            if current_len + len(text) < limit:
-                final_context_chunks.append(chunk)
-                current_len += len(text)
-            else:
-                break
+        return self.anti_confusion.filter_low_quality(ranked_chunks, min_score=0.35)
 
-        ordered_chunks = self.anti_confusion.resolve_conflicts(final_context_chunks)
-        context_texts = [c['text'] for c in ordered_chunks]
-        full_context_str = "\n\n".join(context_texts)
- 
-        if stream_callback:
-            stream_callback("✨ Generating answer...\n\n")
+    def prefetch(
+        self,
+        partial_text: str,
+        subject: str,
+        grade: str = "",
+        n_results: int = 3,
+        should_cancel: Optional[Callable[[], bool]] = None
+    ) -> bool:
+        """
+        Runs normalization, embedding and retrieval on a partial question.
 
-        answer = "Unable to generate answer."
-        confidence = 0.0
-        
-        if self.llm:
+        Meant to be called from a background thread while the student is
+        typing; query() reuses the result when the submitted question
+        matches, completes it, or nearly matches. Spell-check and
+        normalization logging are skipped for partial text. should_cancel
+        is checked before the embedding and search steps, so a question
+        submitted meanwhile does not compete with a stale prefetch.
+
+        Returns:
+            True if a result for the text is cached
+        """
+        grade = str(grade).strip() if grade else ""
+        if not self.chroma_client or len(partial_text.split()) < 3:
+            return False
+        if self.prefetch_cache.contains(partial_text, subject, grade):
+            return True
+
+        try:
+            normalized = self.input_normalizer.normalizer.normalize(partial_text)
+            clean_question = normalized.get("clean_question") or partial_text
+            if should_cancel and should_cancel():
+                return False
+            query_embedding = self.embedding_gen.generate_embeddings(clean_question)
+
+            if should_cancel and should_cancel():
+                return False
+            target_collections = self._select_collections(query_embedding, subject, grade)
+            raw_results = self._search_collections(target_collections, query_embedding, subject, grade, n_results)
+
+            self.prefetch_cache.put([partial_text, clean_question], subject, grade, {
+                "embedding": query_embedding,
+                "target_collections": target_collections,
+                "searches_avoided": max(0, len(self.router.centroids) - len(target_collections)),
+                "relevant_chunks": self._rank_chunks(raw_results, clean_question)
+            })
+            return True
+        except Exception as e:
+            logger.warning(f"Prefetch failed (non-critical): {e}")
+            return False
+
+    def _answer_follow_up(
+        self,
+        session: FollowUpSession,
+        turn: str,
+        stream_callback,
+        start_time: float,
+        event_callback=None
+    ) -> Dict[str, Any]:
+        """
+        Answers a follow-up from the session's retrieval set and model state.
+
+        Continues from the previous answer's tokens (whose KV cache
+        llama.cpp still holds, or a snapshot taken when another call needed
+        the model) when they fit the context window, otherwise re-prefills
+        the saved context. Either way no
+        normalisation, embedding or retrieval is done.
+        """
+        logger.info(f"Follow-up turn: {turn}")
+        handler = self.llm.handler
+        answer = ""
+
+        with self._llm_slot():
+            prompt = handler.continuation_prompt(turn, session.llm_state)
+
+            if prompt is not None:
+                stream = handler.continue_answer_stream(prompt, session.llm_state)
+            else:
+                handler.end_session()
+                stream = handler.get_answer_stream(turn, session.context, context_tokens=session.context_tokens)
+
+            monitor = StreamMonitor(session.context, engine=self.anti_confusion)
             try:
-                if stream_callback:
-                    answer = ""
-                    token_count = 0
-                    for token in self.llm.handler.get_answer_stream(effective_query, full_context_str):
-                        answer += token
-                        stream_callback(token)  
-                        token_count += 1                   
-                    
-                    confidence = self._calculate_confidence(answer, effective_query, final_context_chunks)
-                else:
-                    answer, confidence = self.llm.simple_handler.get_answer(effective_query, full_context_str)
+                for token in monitor.watch(stream):
+                    answer += token
+                    if stream_callback:
+                        stream_callback(token)
             except Exception as e:
-                logger.error(f"LLM generation error: {e}")
-                if stream_callback:
-                    stream_callback("Error generating answer.")
-
-        diagram = self.diagram_library.find_diagram_by_text(query_text)
+                logger.error(f"Follow-up generation error: {e}")
+            if monitor.reason:
+                answer = monitor.text()
+                self._emit(event_callback, "answer", {"answer": answer, "stopped": monitor.reason})
+                handler.end_session()
+            session.record_turn(None if monitor.reason else handler.keep_session())
 
-        result = {
-            "answer": answer,
-            "context_used": context_texts,
-            "sources": [c['metadata'] for c in ordered_chunks],
-            "diagram": diagram,
-            "confidence": confidence,
+        return {
+            "answer": answer or "Unable to generate answer.",
+            "context_used": [c['text'] for c in session.chunks],
+            "sources": [c.get('metadata', {}) for c in session.chunks],
+            "diagram": None,
+            "confidence": self._calculate_confidence(answer, turn, session.chunks),
+            "collections_searched": [],
+            "searches_avoided": len(self.router.centroids),
+            "follow_up": True,
+            "kv_reused": prompt is not None,
+            "stopped_early": monitor.reason,
             "processing_time": time.time() - start_time,
-            "type": "rag_response"
+            "type": "rag_follow_up"
         }
 
-        self.cache.set(query_text, subject, "", result, embedding=query_embedding)
+    def _lookup_diagrams(self, query_text: str, subject: str, grade: str) -> Dict[str, Any]:
+        """Finds the library diagram and prepares the YAML diagram for a question."""
+        try:
+            diagram = self.diagram_library.find_diagram_by_text(query_text)
+        except Exception as e:
+            logger.warning(f"Diagram lookup failed: {e}")
+            diagram = None
+        prepared = prepare_diagram(
+            query_text,
+            grade=int(grade) if grade.isdigit() else None,
+            subject=subject or None
+        )
+        return {"diagram": diagram, "prepared": prepared}
+
+    @staticmethod
+    def _format_sources(sources: List[Dict]) -> str:
+        """Formats distinct source names for display."""
+        names = []
+        for meta in sources:
+            name = (meta or {}).get('source')
+            if name and name not in names:
+                names.append(name)
+        return ", ".join(names[:3])
+
+    @staticmethod
+    def _emit(event_callback, event: str, payload: Dict[str, Any]) -> None:
+        """Sends a stream event without letting a UI error break the query."""
+        if not event_callback:
+            return
+        try:
+            event_callback(event, payload)
+        except Exception as e:
+            logger.warning(f"Event callback failed for {event}: {e}")
+
+    @staticmethod
+    def _context_token_ids(
+        chunks: List[Dict],
+        sentence_tokens: Dict[str, List[int]]
+    ) -> Optional[List[List[List[int]]]]:
+        """
+        Rebuilds context chunks as token ids from pre-tokenised sentences.
+
+        Sentences stay separate so the prompt can be trimmed at their
+        boundaries. Returns None when any sentence is missing so the text
+        prompt is used.
+        """
+        if not chunks or not sentence_tokens:
+            return None
+
+        context_tokens = []
+        for chunk in chunks:
+            sentences = []
+            for sentence in split_sentences(chunk['text']):
+                if sentence not in sentence_tokens:
+                    return None
+                sentences.append(sentence_tokens[sentence])
+            context_tokens.append(sentences)
+        return context_tokens
 
-        return result
-    
     def _calculate_confidence(self, answer: str, question: str, context_chunks: list = None) -> float:
         """
         Calculate confidence based on answer quality and RAG context.
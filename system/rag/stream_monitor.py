@@ -0,0 +1,202 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Streaming Degeneration Monitor for Satya RAG
+
+Watches the answer token stream and stops decoding as soon as Phi 1.5
+starts looping (repeated n-grams or sentences), drifts into exercises or
+Q/A echoes, or loses grounding in the reference material for several
+sentences in a row. The answer is trimmed to the text before the point of
+degeneration.
+"""
+
+import logging
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from system.rag.anti_confusion_engine import AntiConfusionEngine
+
+logger = logging.getLogger(__name__)
+
+# Same markers _clean_answer trims after generation, plus prompt echoes
+OFF_TOPIC_MARKERS = (
+    "Exercise:", "Practice:", "Try this:", "Use Case:", "Real-world",
+    "Question:", "Instruct:", "Reference Material:", "Student Answer:"
+)
+_MAX_MARKER_LEN = max(len(m) for m in OFF_TOPIC_MARKERS)
+
+_COMPLETE_WORD = re.compile(r'\S+(?=\s)')
+_SENTENCE_END = re.compile(r'[.!?](?=\s)')
+_NON_WORD = re.compile(r'\W+')
+
+
+class StreamMonitor:
+    """
+    Incremental checks run on every generated token.
+    """
+
+    def __init__(
+        self,
+        context: str = "",
+        engine: Optional[AntiConfusionEngine] = None,
+        ngram_size: int = 4,
+        max_ngram_repeats: int = 3,
+        min_words: int = 25,
+        drift_overlap: float = 0.15,
+        drift_sentences: int = 2
+    ):
+        """
+        Initialize stream monitor.
+
+        Args:
+            context: Reference material given to the model (empty disables drift checks)
+            engine: AntiConfusionEngine whose grounding terms are reused
+            ngram_size: Words per n-gram for loop detection
+            max_ngram_repeats: Occurrences of one n-gram allowed
+            min_words: Answer words before drift can stop generation
+            drift_overlap: Per-sentence grounding overlap counted as drift
+            drift_sentences: Consecutive drifting sentences that stop generation
+        """
+        self.context = context.lower()
+        self.engine = engine or AntiConfusionEngine()
+        self.ngram_size = ngram_size
+        self.max_ngram_repeats = max_ngram_repeats
+        self.min_words = min_words
+        self.drift_overlap = drift_overlap
+        self.drift_sentences = drift_sentences
+
+        self.reason: Optional[str] = None
+        self.cut: Optional[int] = None
+        self.tokens = 0
+        self.words = 0
+        self._text = ""
+        self._word_pos = 0
+        self._sentence_pos = 0
+        self._marker_pos = 0
+        self._recent: deque = deque(maxlen=ngram_size)
+        self._ngrams: Dict[tuple, List[int]] = {}
+        self._sentences = set()
+        self._drifting: List[int] = []
+
+    def _stop(self, reason: str, cut: int) -> None:
+        self.reason = reason
+        self.cut = cut
+        logger.info(f"Stopping generation early ({reason}) after {self.tokens} tokens")
+
+    def feed(self, token: str) -> bool:
+        """
+        Adds a token.
+
+        Args:
+            token: Newly generated text
+
+        Returns:
+            False once the answer has degenerated
+        """
+        if self.reason:
+            return False
+        self._text += token
+        self.tokens += 1
+
+        self._check_markers()
+        if not self.reason:
+            self._check_words()
+        if not self.reason:
+            self._check_sentences()
+        return self.reason is None
+
+    def _check_markers(self) -> None:
+        for marker in OFF_TOPIC_MARKERS:
+            index = self._text.find(marker, self._marker_pos)
+            if index >= 0:
+                self._stop("off_topic", index)
+                return
+        self._marker_pos = max(0, len(self._text) - _MAX_MARKER_LEN + 1)
+
+    def _check_words(self) -> None:
+        """Counts n-grams over words completed by this token."""
+        for match in _COMPLETE_WORD.finditer(self._text, self._word_pos):
+            self._word_pos = match.end()
+            word = _NON_WORD.sub('', match.group().lower())
+            if not word:
+                continue
+            self.words += 1
+            self._recent.append((word, match.start()))
+            if len(self._recent) < self.ngram_size:
+                continue
+
+            gram = tuple(w for w, _ in self._recent)
+            starts = self._ngrams.setdefault(gram, [])
+            starts.append(self._recent[0][1])
+            if len(starts) > self.max_ngram_repeats:
+                self._stop("repetition", starts[1])
+                return
+
+    def _check_sentences(self) -> None:
+        """Checks sentences completed by this token for repeats and drift."""
+        for match in _SENTENCE_END.finditer(self._text, self._sentence_pos):
+            start, end = self._sentence_pos, match.end()
+            self._sentence_pos = end
+            sentence = self._text[start:end].strip()
+            start = end - len(self._text[start:end].lstrip())
+
+            normalized = _NON_WORD.sub(' ', sentence.lower()).strip()
+            if len(normalized.split()) >= 4:
+                if normalized in self._sentences:
+                    self._stop("repetition", start)
+                    return
+                self._sentences.add(normalized)
+
+            if not self.context:
+                continue
+            terms = self.engine.key_terms(sentence)
+            if len(terms) < 3:
+                continue
+            if self.engine.grounding_overlap(terms, self.context) < self.drift_overlap:
+                self._drifting.append(start)
+            else:
+                self._drifting = []
+            if len(self._drifting) >= self.drift_sentences and self.words >= self.min_words:
+                self._stop("drift", self._drifting[0])
+                return
+
+    def watch(self, stream: Iterable[str]) -> Iterator[str]:
+        """
+        Passes tokens through until the answer degenerates, then closes the stream.
+
+        Args:
+            stream: Token stream from the model
+
+        Yields:
+            Tokens generated before the stop
+        """
+        try:
+            for token in stream:
+                if not self.feed(token):
+                    break
+                yield token
+        finally:
+            close = getattr(stream, 'close', None)
+            if close:
+                close()
+
+    def text(self) -> str:
+        """Gets the answer up to the point of degeneration."""
+        if self.cut is None:
+            return self._text
+        return self._text[:self.cut].rstrip()
+
+    def stats(self) -> Dict:
+        """Gets monitor statistics."""
+        return {
+            "tokens": self.tokens,
+            "words": self.words,
+            "stopped": self.reason
+        }
@@ -0,0 +1,163 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Pre-tokenised Chunk Store for Satya RAG
+
+Keeps the Phi token ids of every ingested chunk next to ChromaDB, split per
+sentence so that packed and compressed context can be rebuilt as token ids
+without calling the tokenizer at query time.
+
+Layout (one pair of files per collection under <chroma_db>/token_store/):
+- <collection>.tok: flat uint32 array of token ids
+- <collection>.json: {"chunks": {chunk_id: [offset, [sentence lengths]]}}
+"""
+
+import json
+import logging
+import os
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from system.rag.context_packer import split_sentences
+
+logger = logging.getLogger(__name__)
+
+TOKEN_STORE_DIRNAME = "token_store"
+TOKEN_TYPECODE = "I"
+
+
+class ChunkTokenStore:
+    """
+    Array-backed sidecar of per-sentence chunk token ids.
+    """
+
+    def __init__(self, chroma_db_path: str = "satya_data/chroma_db"):
+        """
+        Initialize token store.
+
+        Args:
+            chroma_db_path: ChromaDB directory the sidecar lives in
+        """
+        self.store_dir = os.path.join(chroma_db_path, TOKEN_STORE_DIRNAME)
+        self._collections: Dict[str, Tuple[array, Dict]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _paths(self, collection: str) -> Tuple[str, str]:
+        base = os.path.join(self.store_dir, collection)
+        return base + ".tok", base + ".json"
+
+    def _load(self, collection: str) -> Tuple[array, Dict]:
+        with self._lock:
+            if collection in self._collections:
+                return self._collections[collection]
+
+        tokens, index = array(TOKEN_TYPECODE), {}
+        tok_path, index_path = self._paths(collection)
+        if os.path.exists(tok_path) and os.path.exists(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f).get("chunks", {})
+                with open(tok_path, 'rb') as f:
+                    tokens.frombytes(f.read())
+            except Exception as e:
+                logger.warning(f"Could not load token store for {collection}: {e}")
+                tokens, index = array(TOKEN_TYPECODE), {}
+
+        with self._lock:
+            self._collections[collection] = (tokens, index)
+        return tokens, index
+
+    def get(self, collection: str, chunk_id: str) -> Optional[List[List[int]]]:
+        """
+        Gets the per-sentence token ids of a chunk.
+
+        Args:
+            collection: Collection name
+            chunk_id: ChromaDB id of the chunk
+
+        Returns:
+            List of sentence token id lists, or None if not stored
+        """
+        tokens, index = self._load(collection)
+        entry = index.get(chunk_id)
+        if entry is None:
+            return None
+
+        offset, lengths = entry
+        sentences = []
+        for length in lengths:
+            sentences.append(tokens[offset:offset + length].tolist())
+            offset += length
+        return sentences
+
+    def put_collection(self, collection: str, chunks: Dict[str, List[List[int]]]) -> None:
+        """
+        Stores chunk token ids and rewrites the collection sidecar.
+
+        Args:
+            collection: Collection name
+            chunks: Map of chunk id to per-sentence token id lists
+        """
+        tokens, index = self._load(collection)
+        merged = {cid: self.get(collection, cid) for cid in index}
+        merged.update(chunks)
+
+        new_tokens, new_index = array(TOKEN_TYPECODE), {}
+        for cid, sentences in merged.items():
+            new_index[cid] = [len(new_tokens), [len(s) for s in sentences]]
+            for sentence in sentences:
+                new_tokens.extend(sentence)
+
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            tok_path, index_path = self._paths(collection)
+            with open(tok_path, 'wb') as f:
+                new_tokens.tofile(f)
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump({"chunks": new_index}, f)
+        except Exception as e:
+            logger.warning(f"Could not save token store for {collection}: {e}")
+
+        with self._lock:
+            self._collections[collection] = (new_tokens, new_index)
+
+    def sentence_tokens(self, chunks: List[Dict]) -> Dict[str, List[int]]:
+        """
+        Maps sentence text to token ids for retrieved chunks.
+
+        Args:
+            chunks: Chunks with 'text', 'id' and 'collection'
+
+        Returns:
+            Dict of stripped sentence text -> token ids; chunks whose text
+            no longer matches the stored sentences are skipped
+        """
+        lookup: Dict[str, List[int]] = {}
+        for chunk in chunks:
+            stored = None
+            if chunk.get('id') and chunk.get('collection'):
+                stored = self.get(chunk['collection'], chunk['id'])
+            sentences = split_sentences(chunk.get('text', ''))
+            if stored is None or len(stored) != len(sentences):
+                self.misses += 1
+                continue
+            self.hits += 1
+            lookup.update(zip(sentences, stored))
+        return lookup
+
+    def stats(self) -> Dict[str, int]:
+        """Gets token store statistics."""
+        return {
+            "collections_loaded": len(self._collections),
+            "chunk_hits": self.hits,
+            "chunk_misses": self.misses
+        }
@@ -0,0 +1,105 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Teacher Batch Grading CLI
+
+Grades a whole class's worksheet answers from a CSV/JSONL answer sheet and
+streams the results to a file.
+
+Usage:
+    python -m teacher_tools.grading.batch_grading_cli answers.csv --output results.jsonl
+"""
+
+import argparse
+import os
+
+from rich.console import Console
+from rich.table import Table
+
+from teacher_tools.grading.batch_grading_utils import (
+    BatchGrader, build_answer_index, load_answer_sheet, write_results
+)
+from system.data_manager.content_manager import ContentManager
+from system.grading import GradingCache, QuickGrader
+from system.utils.resource_path import resolve_content_dir, resolve_model_dir
+
+console = Console()
+
+
+def _load_model(model_dir: str):
+    from ai_model.model_utils.model_handler import ModelHandler
+    try:
+        return ModelHandler(model_dir)
+    except Exception as e:
+        console.print(f"[yellow]Model not available ({e}); ambiguous answers use fuzzy matching.[/yellow]")
+        return None
+
+
+def _load_embedder():
+    try:
+        from scripts.rag_data_preparation.embedding_generator import EmbeddingGenerator
+        return EmbeddingGenerator(device='cpu').generate_embeddings
+    except Exception as e:
+        console.print(f"[yellow]Embeddings not available ({e}); similarity check skipped.[/yellow]")
+        return None
+
+
+def _display_stats(stats):
+    table = Table(title="Batch Grading Summary", show_lines=True)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("Answers Graded", str(stats["rows"]))
+    table.add_row("Unique Answers", str(stats["unique_answers"]))
+    table.add_row("Graded by Model", str(stats["model_graded"]))
+    table.add_row("Model Calls Avoided", f"{stats['grader']['llm_avoided_ratio']:.0%}")
+    table.add_row("Unknown Questions", str(stats["unknown_questions"]))
+    table.add_row("Elapsed", f"{stats['elapsed_seconds']:.1f}s")
+    table.add_row("Throughput", f"{stats['answers_per_minute']:.1f} answers/minute")
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-grade a class answer sheet")
+    parser.add_argument("sheet", help="CSV (student,question,answer) or JSONL answer sheet")
+    parser.add_argument("--output", default=None, help="Results file (.jsonl or .csv)")
+    parser.add_argument("--content", default=str(resolve_content_dir("satya_data/content")),
+                        help="Content directory with the worksheet questions")
+    parser.add_argument("--model", default=str(resolve_model_dir("satya_data/models/phi15")),
+                        help="Phi model folder")
+    parser.add_argument("--no-model", action="store_true", help="Grade without the language model")
+    parser.add_argument("--no-embeddings", action="store_true", help="Skip the embedding similarity check")
+    parser.add_argument("--verdict-only", action="store_true", help="Skip model feedback sentences")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.sheet):
+        console.print(f"[red]Answer sheet not found: {args.sheet}[/red]")
+        return
+
+    content_manager = ContentManager(args.content)
+    grader = QuickGrader(
+        model_handler=None if args.no_model else _load_model(args.model),
+        embed_fn=None if args.no_embeddings else _load_embedder(),
+        feedback=not args.verdict_only,
+        cache=GradingCache(autosave=False)
+    )
+    batch = BatchGrader(grader, build_answer_index(content_manager))
+
+    output = args.output or os.path.splitext(args.sheet)[0] + "_graded.jsonl"
+    fmt = "csv" if output.lower().endswith(".csv") else "jsonl"
+    with open(output, 'w', encoding='utf-8', newline='') as f:
+        for result in write_results(batch.grade_stream(load_answer_sheet(args.sheet)), f, fmt):
+            mark = "[green]✓[/green]" if result["correct"] else "[red]✗[/red]"
+            console.print(f"{mark} {result['student']}: {result['question'][:50]} [dim]({result['method']})[/dim]")
+
+    _display_stats(batch.stats())
+    console.print(f"[green]Results written to {output}[/green]")
+
+
+if __name__ == "__main__":
+    main()
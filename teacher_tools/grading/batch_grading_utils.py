@@ -0,0 +1,181 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Batch Grading Utilities Module
+
+Grades a class's answer sheet (student, question, answer) in one run.
+Identical answers are graded once, clear-cut answers are settled by the
+quick grader as the sheet is read, and the remaining answers go through the
+model back-to-back grouped by question, so consecutive prompts share the
+few-shot header, question and reference answer and llama.cpp only evaluates
+the new student answer.
+"""
+
+import csv
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from system.grading import QuickGrader
+from system.grading.quick_grader import acceptable_answers, normalize_answer
+
+logger = logging.getLogger(__name__)
+
+RESULT_FIELDS = ["student", "question", "answer", "correct", "feedback", "method"]
+
+
+def load_answer_sheet(filepath: str) -> Iterator[Dict[str, str]]:
+    """
+    Stream rows of an answer sheet.
+    Args:
+        filepath (str): CSV with a student,question,answer header, or JSONL
+    Returns:
+        Iterator[Dict[str, str]]: Rows with 'student', 'question' and 'answer'
+    """
+    path = Path(filepath)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.suffix.lower() in (".jsonl", ".json"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for number, row in enumerate(rows, 1):
+            if not row.get("question") or row.get("answer") is None:
+                logger.warning(f"Skipping row {number}: missing question or answer")
+                continue
+            yield {
+                "student": str(row.get("student", "")).strip(),
+                "question": str(row["question"]).strip(),
+                "answer": str(row["answer"]).strip()
+            }
+
+
+def build_answer_index(content_manager) -> Dict[str, List[str]]:
+    """
+    Map every content question to its acceptable answers.
+    Args:
+        content_manager (ContentManager): The content manager instance
+    Returns:
+        Dict[str, List[str]]: Normalised question text -> acceptable answers
+    """
+    index = {}
+    for subject in content_manager.get_all_subjects():
+        for topic in content_manager.get_all_topics(subject):
+            for concept in content_manager.get_all_concepts(subject, topic):
+                for q in concept.get("questions", []):
+                    index[normalize_answer(q.get("question", ""))] = acceptable_answers(q)
+    return index
+
+
+class BatchGrader:
+    """Grades answer sheets with de-duplication and batched model calls."""
+
+    def __init__(self, grader: QuickGrader, answer_index: Optional[Dict[str, List[str]]] = None):
+        self.grader = grader
+        self.answer_index = answer_index or {}
+        self.rows = 0
+        self.unique_answers = 0
+        self.model_graded = 0
+        self.unknown_questions = set()
+        self.elapsed = 0.0
+
+    def _answers_for(self, question: str) -> List[str]:
+        answers = self.answer_index.get(normalize_answer(question))
+        if answers is None:
+            self.unknown_questions.add(question)
+            return []
+        return answers
+
+    def grade_stream(self, rows: Iterable[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+        """
+        Grade rows, yielding each result as soon as it is known.
+        Args:
+            rows (Iterable[Dict[str, str]]): Answer sheet rows
+        Returns:
+            Iterator[Dict[str, Any]]: Rows with 'correct', 'feedback' and 'method'
+        """
+        started = time.monotonic()
+        decided: Dict[Tuple[str, str], Tuple[bool, str, str]] = {}
+        pending: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
+
+        # Pass 1: quick checks while reading; repeats reuse the first verdict
+        for row in rows:
+            self.rows += 1
+            key = (normalize_answer(row["question"]), normalize_answer(row["answer"]))
+            if key in pending:
+                pending[key].append(row)
+                continue
+            if key not in decided:
+                self.unique_answers += 1
+                result = self.grader.grade_detailed(
+                    row["question"], row["answer"], self._answers_for(row["question"]), use_model=False
+                )
+                if result is None:
+                    pending[key] = [row]
+                    continue
+                decided[key] = result
+            yield self._result(row, decided[key])
+
+        # Pass 2: model calls back-to-back, one question at a time
+        for key in sorted(pending):
+            group = pending[key]
+            first = group[0]
+            result = self.grader.grade_detailed(first["question"], first["answer"], self._answers_for(first["question"]))
+            self.model_graded += 1
+            for row in group:
+                yield self._result(row, result)
+
+        if self.grader.cache is not None:
+            self.grader.cache.flush()
+        self.elapsed += time.monotonic() - started
+        if self.unknown_questions:
+            logger.warning(f"{len(self.unknown_questions)} questions not found in content; graded without a reference")
+
+    @staticmethod
+    def _result(row: Dict[str, str], result: Tuple[bool, str, str]) -> Dict[str, Any]:
+        correct, feedback, method = result
+        return {**row, "correct": correct, "feedback": feedback, "method": method}
+
+    def stats(self) -> Dict[str, Any]:
+        """Gets batch throughput statistics."""
+        minutes = self.elapsed / 60
+        return {
+            "rows": self.rows,
+            "unique_answers": self.unique_answers,
+            "duplicates": self.rows - self.unique_answers,
+            "model_graded": self.model_graded,
+            "unknown_questions": len(self.unknown_questions),
+            "elapsed_seconds": round(self.elapsed, 2),
+            "answers_per_minute": round(self.rows / minutes, 1) if minutes else 0.0,
+            "grader": self.grader.stats()
+        }
+
+
+def write_results(results: Iterable[Dict[str, Any]], output: TextIO, fmt: str = "jsonl") -> Iterator[Dict[str, Any]]:
+    """
+    Write results as they arrive, passing each one through.
+    Args:
+        results (Iterable[Dict[str, Any]]): Graded rows
+        output (TextIO): Open output file
+        fmt (str): 'jsonl' or 'csv'
+    Returns:
+        Iterator[Dict[str, Any]]: The same results, after each is written
+    """
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(output, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+    for result in results:
+        if writer:
+            writer.writerow(result)
+        else:
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+        yield result
@@ -18,6 +18,10 @@ Tests cover:
 - Logging and feedback collection
 - Low-confidence case flagging
 - Edge cases and performance
+- Background spell-check and late corrections
+- Unlogged (prefetch) questions
+- Spell checker loading in the background
+- One shared log writer across normalizers
 """
 
 import sys
@@ -28,6 +32,7 @@ import pytest
 import json
 import tempfile
 import shutil
+import threading
 from pathlib import Path
 from system.input_processing.adaptive_normalizer import AdaptiveNormalizer
 
@@ -44,7 +49,9 @@ class TestConditionalSpellChecking:
     
     @pytest.fixture
     def normalizer(self, temp_log_dir):
-        return AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=True)
+        normalizer = AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=True)
+        yield normalizer
+        normalizer.close()
     
     def test_skip_short_queries(self, normalizer):
         """Test that short queries (<5 words) skip spell-checking."""
@@ -118,7 +125,9 @@ class TestSpellCorrectionCaching:
     @pytest.fixture
     def normalizer(self, temp_log_dir):
         # Enable spell-check for cache tests
-        return AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=True)
+        normalizer = AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=True)
+        yield normalizer
+        normalizer.close()
     
     def test_cache_key_generation(self, normalizer):
         """Test MD5-based cache key generation."""
@@ -209,7 +218,9 @@ class TestLoggingAndFeedback:
     
     @pytest.fixture
     def normalizer(self, temp_log_dir):
-        return AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=False)
+        normalizer = AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=False)
+        yield normalizer
+        normalizer.close()
     
     def test_feedback_logging(self, normalizer):
         """Test that normalizations are logged to feedback database."""
@@ -256,6 +267,133 @@ class TestLoggingAndFeedback:
         assert len(lines) == 100, "All 100 entries should be persisted"
 
 
+class SlowChecker:
+    """Spell checker that waits for the test to release it."""
+    
+    def __init__(self, corrections):
+        self.corrections = corrections
+        self.release = threading.Event()
+    
+    def correct(self, text):
+        self.release.wait(5)
+        for wrong, right in self.corrections.items():
+            text = text.replace(wrong, right)
+        return text
+
+
+class TestSpeculativeSpellCheck:
+    """Test spell-checking in the background."""
+    
+    QUERY = "please explain what is the process of fotosynthesis in green plants"
+    
+    @pytest.fixture
+    def temp_log_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+    
+    @pytest.fixture
+    def normalizer(self, temp_log_dir):
+        normalizer = AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=False)
+        checker = normalizer.spell_checker = SlowChecker({"fotosynthesis": "photosynthesis", "teh": "the"})
+        yield normalizer
+        checker.release.set()
+        normalizer.close()
+    
+    def test_returns_before_correction(self, normalizer):
+        """Test that normalization does not wait for the spell checker."""
+        result, future = normalizer.normalize_speculative(self.QUERY)
+        assert "fotosynthesis" in result["clean_question"]
+        assert not future.done()
+        normalizer.spell_checker.release.set()
+        assert future.result(timeout=5) == self.QUERY.replace("fotosynthesis", "photosynthesis")
+    
+    def test_late_correction_cached(self, normalizer):
+        """Test that a correction nobody waited for is used next time."""
+        _, future = normalizer.normalize_speculative(self.QUERY)
+        normalizer.spell_checker.release.set()
+        future.result(timeout=5)
+        
+        result, future = normalizer.normalize_speculative(self.QUERY)
+        assert future is None
+        assert "photosynthesis" in result["clean_question"]
+        assert normalizer.cache_hits == 1
+    
+    def test_material_correction_applied(self, normalizer):
+        """Test that a correction changing content words is adopted."""
+        result, future = normalizer.normalize_speculative(self.QUERY)
+        normalizer.spell_checker.release.set()
+        updated = normalizer.apply_correction(result, future.result(timeout=5))
+        assert "photosynthesis" in updated["clean_question"]
+    
+    def test_minor_correction_ignored(self, normalizer):
+        """Test that fixing a short word keeps the original normalization."""
+        query = "please explain what is teh process of photosynthesis in green plants"
+        result, future = normalizer.normalize_speculative(query)
+        normalizer.spell_checker.release.set()
+        assert normalizer.apply_correction(result, future.result(timeout=5)) is None
+    
+    def test_unlogged_question(self, normalizer, temp_log_dir):
+        """Test that log=False keeps a question out of the learning log."""
+        normalizer.spell_checker = None
+        result, _ = normalizer.normalize_speculative("wat is photosynthesis", log=False)
+        normalizer.normalize("wat is DNA", log=False)
+        normalizer.log_writer.flush()
+        assert result["clean_question"]
+        assert normalizer.feedback_db == []
+        assert not (Path(temp_log_dir) / "feedback_db.jsonl").exists()
+
+
+class TestBackgroundLoading:
+    """Test that the spell checker loads off the constructor path."""
+    
+    @pytest.fixture
+    def temp_log_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+    
+    def test_constructor_does_not_wait(self, temp_log_dir, monkeypatch):
+        """Test that questions skip spell-check until the backend is ready."""
+        release = threading.Event()
+        checker = SlowChecker({"fotosynthesis": "photosynthesis"})
+        checker.release.set()
+        monkeypatch.setattr(
+            AdaptiveNormalizer, "_load_symspell", lambda self, path: release.wait(5) and checker
+        )
+        normalizer = AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=True)
+        assert not normalizer.spell_ready.is_set()
+        
+        query = TestSpeculativeSpellCheck.QUERY
+        assert "fotosynthesis" in normalizer.normalize(query)["clean_question"]
+        
+        release.set()
+        assert normalizer.wait_until_ready(5)
+        assert "photosynthesis" in normalizer.normalize(query)["clean_question"]
+        normalizer.close()
+    
+    def test_log_writer_shared(self, temp_log_dir):
+        """Test that normalizers reuse one writer thread."""
+        first = AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=False)
+        first.normalize("What is DNA?")
+        threads = threading.active_count()
+        second = AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=False)
+        second.normalize("What is RNA?")
+        new_threads = threading.active_count() - threads
+        first.close()
+        second.close()
+        
+        assert first.log_writer is second.log_writer
+        assert new_threads == 0
+        assert len((Path(temp_log_dir) / "feedback_db.jsonl").read_text().splitlines()) == 2
+    
+    def test_disabled_is_ready(self, temp_log_dir):
+        """Test that a normalizer without spell-check is ready at once."""
+        normalizer = AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=False)
+        assert normalizer.wait_until_ready(0)
+        normalizer.close()
+
+
 class TestEdgeCases:
     """Test edge cases and error handling."""
     
@@ -267,7 +405,9 @@ class TestEdgeCases:
     
     @pytest.fixture
     def normalizer(self, temp_log_dir):
-        return AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=False)
+        normalizer = AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=False)
+        yield normalizer
+        normalizer.close()
     
     def test_empty_input(self, normalizer):
         """Test handling of empty input."""
@@ -296,6 +436,7 @@ class TestEdgeCases:
         assert Path(non_existent_dir).exists()
         
         # Cleanup
+        normalizer.close()
         shutil.rmtree(non_existent_dir)
     
     def test_corrupted_cache_file(self, normalizer, temp_log_dir):
@@ -322,7 +463,9 @@ class TestPerformance:
     
     @pytest.fixture
     def normalizer(self, temp_log_dir):
-        return AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=False)
+        normalizer = AdaptiveNormalizer(log_dir=temp_log_dir, enable_spell_check=False)
+        yield normalizer
+        normalizer.close()
     
     def test_cache_lookup_speed(self, normalizer):
         """Test that cache lookups are fast."""
@@ -0,0 +1,144 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for batch grading of teacher answer sheets.
+
+Tests cover:
+- CSV and JSONL answer sheet loading
+- De-duplication and quick results streamed before model results
+- Model calls grouped by question
+- Result writing and throughput statistics
+"""
+
+import io
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from system.grading import QuickGrader
+from teacher_tools.grading.batch_grading_utils import (
+    BatchGrader, build_answer_index, load_answer_sheet, write_results
+)
+
+ORGANELLE = "Which organelle makes energy?"
+PLANTS = "How do plants make food?"
+INDEX = {
+    "which organelle makes energy": ["Mitochondria"],
+    "how do plants make food": ["By photosynthesis using sunlight"],
+}
+
+
+class RecordingModel:
+    def __init__(self):
+        self.questions = []
+
+    def generate_verdict(self, prompt, feedback=True):
+        self.questions.append(prompt.split("Current Task:\nQuestion: ")[1].split("\n")[0])
+        return True, "Good."
+
+
+@pytest.fixture
+def model():
+    return RecordingModel()
+
+
+@pytest.fixture
+def batch(model):
+    return BatchGrader(QuickGrader(model_handler=model), INDEX)
+
+
+def _rows(*items):
+    return [{"student": s, "question": q, "answer": a} for s, q, a in items]
+
+
+class TestAnswerSheet:
+    """Test sheet loading."""
+
+    def test_csv_sheet(self, tmp_path):
+        sheet = tmp_path / "answers.csv"
+        sheet.write_text("student,question,answer\nram,Q1,A1\nsita,,A2\n", encoding="utf-8")
+        assert list(load_answer_sheet(str(sheet))) == [{"student": "ram", "question": "Q1", "answer": "A1"}]
+
+    def test_jsonl_sheet(self, tmp_path):
+        sheet = tmp_path / "answers.jsonl"
+        sheet.write_text(json.dumps({"student": "ram", "question": "Q1", "answer": "A1"}) + "\n\n", encoding="utf-8")
+        assert [r["answer"] for r in load_answer_sheet(str(sheet))] == ["A1"]
+
+    def test_answer_index_from_content(self):
+        class Content:
+            def get_all_subjects(self):
+                return ["Science"]
+
+            def get_all_topics(self, subject):
+                return ["Cells"]
+
+            def get_all_concepts(self, subject, topic):
+                return [{"questions": [{"question": ORGANELLE, "acceptable_answers": ["Mitochondria"]}]}]
+
+        assert build_answer_index(Content()) == {"which organelle makes energy": ["Mitochondria"]}
+
+
+class TestBatchGrading:
+    """Test grading order, de-duplication and batching."""
+
+    def test_duplicates_graded_once(self, batch, model):
+        results = list(batch.grade_stream(_rows(
+            ("ram", PLANTS, "Using sunlight energy"),
+            ("sita", PLANTS, "using sunlight energy!"),
+            ("hari", ORGANELLE, "mitochondria."),
+        )))
+        assert len(results) == 3
+        assert len(model.questions) == 1
+        assert batch.stats()["duplicates"] == 1
+
+    def test_quick_results_stream_first(self, batch):
+        results = list(batch.grade_stream(_rows(
+            ("ram", PLANTS, "Using sunlight energy"),
+            ("hari", ORGANELLE, "Mitochondria"),
+        )))
+        assert [r["method"] for r in results] == ["exact", "llm"]
+        assert results[0]["student"] == "hari"
+
+    def test_model_calls_grouped_by_question(self, batch, model):
+        list(batch.grade_stream(_rows(
+            ("a", PLANTS, "Leaves do it"),
+            ("b", ORGANELLE, "The cell wall"),
+            ("c", PLANTS, "From soil"),
+            ("d", ORGANELLE, "Nucleus probably"),
+        )))
+        assert model.questions == [PLANTS, PLANTS, ORGANELLE, ORGANELLE]
+
+    def test_unknown_question_counted(self, batch):
+        list(batch.grade_stream(_rows(("a", "What is gravity?", "A force"))))
+        assert batch.stats()["unknown_questions"] == 1
+
+
+class TestOutput:
+    """Test result writing and statistics."""
+
+    def test_write_csv_streams(self, batch):
+        out = io.StringIO()
+        rows = _rows(("hari", ORGANELLE, "Mitochondria"))
+        written = list(write_results(batch.grade_stream(rows), out, fmt="csv"))
+        lines = out.getvalue().splitlines()
+        assert lines[0] == "student,question,answer,correct,feedback,method"
+        assert lines[1].startswith("hari,")
+        assert written[0]["correct"] is True
+
+    def test_throughput_reported(self, batch):
+        list(batch.grade_stream(_rows(("hari", ORGANELLE, "Mitochondria"))))
+        stats = batch.stats()
+        assert stats["rows"] == 1
+        assert stats["answers_per_minute"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
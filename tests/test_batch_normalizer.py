@@ -0,0 +1,131 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for batch normalization.
+
+Tests cover:
+- In-process and process-pool runs matching single-question normalization
+- Lazy consumption of the input
+- No log or cache side effects
+- Diff records and report summary
+- Reprocessing a feedback log after a new noise phrase
+"""
+
+import io
+
+import pytest
+
+from system.input_processing.adaptive_normalizer import AdaptiveNormalizer
+from system.input_processing.batch_normalizer import (
+    DiffReport, diff_entry, iter_feedback_log, normalize_many, reprocess_log
+)
+from system.input_processing.input_normalizer import InputNormalizer
+
+QUESTIONS = [
+    "hey can u tell me what is photosynthesis",
+    "WITH REFERENCE TO THE DIAGRAM ABOVE explain mitosis",
+    "Why is the sky blue",
+    "what is DNA",
+    "as per the textbook what is osmosis",
+]
+
+
+@pytest.fixture
+def phrases(tmp_path):
+    return str(tmp_path / "phrases.json")
+
+
+class TestNormalizeMany:
+    """Test bulk normalization."""
+
+    def test_in_process_matches_normalize(self, phrases):
+        expected = [InputNormalizer(phrases).normalize(q) for q in QUESTIONS]
+        assert list(normalize_many(QUESTIONS, phrases, workers=1, chunksize=2)) == expected
+
+    def test_process_pool_keeps_order(self, phrases):
+        questions = QUESTIONS * 6
+        expected = list(normalize_many(questions, phrases, workers=1))
+        assert list(normalize_many(questions, phrases, workers=2, chunksize=4)) == expected
+
+    def test_input_consumed_lazily(self, phrases):
+        consumed = []
+
+        def questions():
+            for q in QUESTIONS:
+                consumed.append(q)
+                yield q
+
+        results = normalize_many(questions(), phrases, workers=1, chunksize=2)
+        next(results)
+        assert len(consumed) == 2
+
+    def test_no_logging_side_effects(self, tmp_path, phrases):
+        normalizer = AdaptiveNormalizer(
+            normalizer=InputNormalizer(phrases), log_dir=str(tmp_path / "logs"), enable_spell_check=False
+        )
+        results = list(normalizer.normalize_many(QUESTIONS, workers=1))
+        normalizer.close()
+        assert len(results) == len(QUESTIONS)
+        assert normalizer.feedback_db == []
+        assert list((tmp_path / "logs").iterdir()) == []
+
+
+class TestDiff:
+    """Test diff records."""
+
+    def test_unchanged_entry(self):
+        entry = {"clean": "What is DNA?", "intent": "DEFINE", "confidence": 0.8}
+        result = {"clean_question": "What is DNA?", "intent": "DEFINE", "confidence": 0.805}
+        assert diff_entry(entry, result) is None
+
+    def test_changed_fields_only(self):
+        entry = {"line": 3, "corrected": "q", "clean": "Old?", "confidence": 0.5}
+        result = {"clean_question": "New?", "intent": "WHAT", "confidence": 0.9}
+        assert diff_entry(entry, result) == {"line": 3, "question": "q", "clean": ["Old?", "New?"],
+                                             "confidence": [0.5, 0.9]}
+
+    def test_report_summary(self):
+        out = io.StringIO()
+        report = DiffReport(out)
+        report.add({"clean": "A", "confidence": 0.5}, {"clean_question": "B", "confidence": 0.7})
+        report.add({"clean": "C", "confidence": 0.5}, {"clean_question": "C", "confidence": 0.5})
+        summary = report.summary()
+        assert summary["total"] == 2
+        assert summary["changed"] == 1
+        assert summary["field_changes"]["clean"] == 1
+        assert summary["mean_confidence_after"] == 0.6
+        assert len(out.getvalue().splitlines()) == 1
+
+
+class TestReprocessLog:
+    """Test reprocessing a feedback log."""
+
+    def test_new_phrase_shows_in_diff(self, tmp_path, phrases):
+        log_dir = tmp_path / "logs"
+        normalizer = AdaptiveNormalizer(
+            normalizer=InputNormalizer(phrases), log_dir=str(log_dir), enable_spell_check=False
+        )
+        for q in QUESTIONS:
+            normalizer.normalize(q)
+        normalizer.close()
+        log_file = str(log_dir / "feedback_db.jsonl")
+        assert [e["line"] for e in iter_feedback_log(log_file)] == [1, 2, 3, 4, 5]
+
+        InputNormalizer(phrases).add_noise_phrase("as per the textbook")
+        summary = reprocess_log(log_file, phrases, workers=1)
+
+        assert summary["total"] == len(QUESTIONS)
+        assert summary["field_changes"]["clean"] == 1
+        change = summary["samples"]["clean"][0]
+        assert change["line"] == 5
+        assert "textbook" not in change["clean"][1].lower()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,104 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for CollectionRouter.
+
+Tests cover:
+- k-means centroid computation
+- Routing by centroid similarity with margin
+- Searches-avoided accounting
+- Centroid persistence
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from system.rag.collection_router import CollectionRouter, kmeans_centroids
+
+
+def _cluster(center, n=20, noise=0.05, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.asarray(center) + rng.normal(0, noise, size=(n, len(center)))
+
+
+@pytest.fixture
+def router(tmp_path):
+    router = CollectionRouter(chroma_db_path=str(tmp_path), max_collections=3, margin=0.1)
+    router.fit_collection("neb_science_grade_10", _cluster([1, 0, 0, 0]))
+    router.fit_collection("finemath", _cluster([0, 1, 0, 0], seed=1))
+    router.fit_collection("cs_stanford", _cluster([0, 0, 1, 0], seed=2))
+    router.fit_collection("fineweb_edu", _cluster([0, 0, 0, 1], seed=3))
+    return router
+
+
+class TestKMeans:
+    """Test centroid computation."""
+
+    def test_centroids_are_unit_length(self):
+        data = np.vstack([_cluster([1, 0, 0]), _cluster([0, 1, 0], seed=1)])
+        centroids = kmeans_centroids(data, k=2)
+
+        assert centroids.shape == (2, 3)
+        assert np.allclose(np.linalg.norm(centroids, axis=1), 1.0, atol=1e-5)
+
+    def test_k_capped_by_sample_count(self):
+        centroids = kmeans_centroids(np.eye(3), k=8)
+        assert len(centroids) <= 3
+
+    def test_empty_input(self):
+        assert kmeans_centroids(np.zeros((0, 4))).size == 0
+
+
+class TestRouting:
+    """Test query routing."""
+
+    def test_routes_to_closest_collection(self, router):
+        selected = router.route([0.05, 0.98, 0.0, 0.02])
+        assert selected == ["finemath"]
+
+    def test_margin_includes_close_runner_up(self, router):
+        selected = router.route([0.7, 0.7, 0.0, 0.0])
+        assert set(selected) == {"neb_science_grade_10", "finemath"}
+
+    def test_fan_out_capped(self, router):
+        selected = router.route([0.5, 0.5, 0.5, 0.5], max_collections=2)
+        assert len(selected) == 2
+
+    def test_candidates_restrict_routing(self, router):
+        selected = router.route([0.05, 0.98, 0.0, 0.02], candidates=["cs_stanford", "fineweb_edu"])
+        assert selected and selected[0] in {"cs_stanford", "fineweb_edu"}
+
+    def test_searches_avoided_reported(self, router):
+        router.route([1, 0, 0, 0])
+        stats = router.stats()
+
+        assert stats["queries_routed"] == 1
+        assert stats["searches_performed"] == 1
+        assert stats["searches_avoided"] == 3
+
+    def test_no_centroids_returns_empty(self, tmp_path):
+        router = CollectionRouter(chroma_db_path=str(tmp_path))
+        assert not router.is_ready
+        assert router.route([1, 0, 0]) == []
+
+
+class TestPersistence:
+    """Test centroid persistence."""
+
+    def test_save_and_load(self, router, tmp_path):
+        router.save()
+        reloaded = CollectionRouter(chroma_db_path=str(tmp_path))
+
+        assert set(reloaded.centroids) == set(router.centroids)
+        assert reloaded.route([0, 0, 1, 0]) == ["cs_stanford"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
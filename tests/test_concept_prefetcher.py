@@ -0,0 +1,130 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for ConceptPrefetcher.
+
+Tests cover:
+- Likely-question extraction from concept data
+- Retrieval warm-up through the scheduler
+- Answer warm-up leaving the feedback log untouched
+- Cancellation
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("llama_cpp")
+
+from ai_model.model_utils.llm_scheduler import LLMScheduler
+from system.input_processing.adaptive_normalizer import AdaptiveNormalizer
+from system.rag.concept_prefetcher import ConceptPrefetcher
+
+CONCEPT = {
+    "name": "Photosynthesis",
+    "summary": "Plants convert light into chemical energy. It happens in chloroplasts.",
+    "steps": [],
+    "questions": [
+        {"question": "What is the role of chlorophyll?", "acceptable_answers": ["absorbs light"], "hints": []},
+        {"question": "Where does photosynthesis happen?", "acceptable_answers": ["chloroplast"], "hints": []},
+    ],
+}
+
+
+class FakeCache:
+    """Answer cache that never hits."""
+
+    def get(self, text, subject, grade=""):
+        return None
+
+
+class FakeEngine:
+    """Records prefetch calls; queries go through a real normalizer."""
+
+    def __init__(self, input_normalizer=None):
+        self.llm = None
+        self.cache = FakeCache()
+        self.input_normalizer = input_normalizer
+        self.prefetched = []
+        self.queried = []
+
+    def prefetch(self, text, subject, grade=""):
+        self.prefetched.append((text, subject, grade))
+        return True
+
+    def query(self, query_text, subject, grade="", should_cancel=None, log_question=True):
+        self.input_normalizer.normalize_speculative(query_text, log=log_question)
+        self.queried.append(query_text)
+        return {"type": "rag_response"}
+
+
+@pytest.fixture
+def engine():
+    return FakeEngine()
+
+
+class TestLikelyQuestions:
+    """Test question extraction."""
+
+    def test_questions_then_summary(self):
+        texts = ConceptPrefetcher.likely_questions(CONCEPT, limit=5)
+        assert texts == [
+            "What is the role of chlorophyll?",
+            "Where does photosynthesis happen?",
+            "Plants convert light into chemical energy",
+        ]
+
+    def test_limit(self):
+        assert len(ConceptPrefetcher.likely_questions(CONCEPT, limit=1)) == 2
+
+
+class TestWarmUp:
+    """Test background warm-up."""
+
+    def test_warms_retrieval(self, engine):
+        prefetcher = ConceptPrefetcher(engine, scheduler=LLMScheduler())
+        prefetcher.start(CONCEPT, "Science", "10")
+
+        deadline = time.time() + 2
+        while len(engine.prefetched) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert len(engine.prefetched) == 3
+        assert prefetcher.stats()["retrievals_warmed"] == 3
+
+    def test_answer_prefetch_not_logged(self, tmp_path):
+        log_dir = tmp_path / "logs"
+        normalizer = AdaptiveNormalizer(log_dir=str(log_dir), enable_spell_check=False)
+        engine = FakeEngine(normalizer)
+        prefetcher = ConceptPrefetcher(engine, scheduler=LLMScheduler(), prefetch_answers=True)
+        prefetcher.start(CONCEPT, "Science", "10")
+
+        deadline = time.time() + 2
+        while len(engine.queried) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        normalizer.close()
+
+        assert prefetcher.stats()["answers_warmed"] == 3
+        assert normalizer.feedback_db == []
+        assert not (log_dir / "feedback_db.jsonl").exists()
+
+    def test_interactive_call_cancels(self, engine):
+        scheduler = LLMScheduler()
+        prefetcher = ConceptPrefetcher(engine, scheduler=scheduler)
+
+        with scheduler.interactive():
+            prefetcher.start(CONCEPT, "Science", "10")
+            prefetcher.cancel()
+
+        time.sleep(0.1)
+        assert engine.prefetched == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,92 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for ContextCompressor.
+
+Tests cover:
+- Sentence selection by query similarity
+- Token budget enforcement
+- Original order preservation
+- Token counts recomputed for shortened chunks
+- Pass-through when already within budget
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from system.rag.context_compressor import ContextCompressor
+
+VOCAB = ["photosynthesis", "chlorophyll", "light", "football", "weather"]
+
+
+def bag_of_words(sentences):
+    """Deterministic stand-in embedder over a tiny vocabulary."""
+    rows = []
+    for s in sentences:
+        lower = s.lower()
+        row = np.array([lower.count(w) for w in VOCAB], dtype=np.float32) + 1e-3
+        rows.append(row / np.linalg.norm(row))
+    return np.stack(rows)
+
+
+def word_counter(text):
+    return len(text.split())
+
+
+@pytest.fixture
+def compressor():
+    return ContextCompressor(embed_fn=bag_of_words, token_counter=word_counter, token_budget=12)
+
+
+@pytest.fixture
+def query():
+    return bag_of_words(["photosynthesis chlorophyll light"])[0]
+
+
+class TestCompression:
+    """Test extractive compression."""
+
+    def test_keeps_relevant_sentences(self, compressor, query):
+        chunks = [
+            {"text": "Football is a popular sport. Photosynthesis needs light and chlorophyll.", "metadata": {}},
+            {"text": "The weather was sunny today. Chlorophyll absorbs light.", "metadata": {}},
+        ]
+        compressed = compressor.compress(chunks, query)
+        joined = " ".join(c["text"] for c in compressed)
+
+        assert "Photosynthesis" in joined
+        assert "Football" not in joined
+        assert "weather" not in joined
+
+    def test_respects_budget_and_order(self, compressor, query):
+        chunks = [{"text": "Light matters. Chlorophyll absorbs light. Photosynthesis uses light energy. Weather changes."}]
+        compressed = compressor.compress(chunks, query)
+        kept = compressed[0]["text"]
+
+        assert word_counter(kept) <= 12
+        assert kept.index("Chlorophyll") < kept.index("Photosynthesis")
+
+    def test_recounts_tokens(self, compressor, query):
+        chunks = [{
+            "text": "Football is a popular sport. Chlorophyll absorbs light. Photosynthesis uses light energy.",
+            "tokens": 14
+        }]
+        compressed = compressor.compress(chunks, query, token_budget=9)
+
+        assert compressed[0]["tokens"] == word_counter(compressed[0]["text"])
+        assert compressed[0]["tokens"] < chunks[0]["tokens"]
+
+    def test_within_budget_passthrough(self, compressor, query):
+        chunks = [{"text": "Chlorophyll absorbs light."}]
+        assert compressor.compress(chunks, query) is chunks
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,105 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for ContextPacker.
+
+Tests cover:
+- Token budget enforcement
+- Removal of chunk-overlap spans
+- Near-duplicate sentence removal
+- MMR ordering
+"""
+
+import pytest
+from system.rag.context_packer import ContextPacker, split_sentences
+
+
+def word_counter(text):
+    """Deterministic stand-in tokenizer: one token per word."""
+    return len(text.split())
+
+
+@pytest.fixture
+def packer():
+    return ContextPacker(token_counter=word_counter, token_budget=40)
+
+
+class TestBudget:
+    """Test token budget enforcement."""
+
+    def test_respects_token_budget(self, packer):
+        chunks = [
+            {"text": f"Sentence number {i} is about photosynthesis in green plants.", "final_score": 0.9 - i * 0.01}
+            for i in range(20)
+        ]
+        packed = packer.pack(chunks)
+
+        assert sum(c["tokens"] for c in packed) <= 40
+        assert packed
+
+    def test_zero_budget(self, packer):
+        assert packer.pack([{"text": "Plants make food.", "final_score": 0.9}], token_budget=0) == []
+
+
+class TestDeduplication:
+    """Test overlap and near-duplicate removal."""
+
+    def test_overlap_span_removed(self, packer):
+        first = "Chlorophyll absorbs light. Light energy splits water molecules."
+        # Chunker overlap repeats the tail of the previous chunk
+        second = "splits water molecules. Oxygen is released as a by-product."
+        packed = packer.pack([
+            {"text": first, "final_score": 0.9},
+            {"text": second, "final_score": 0.8},
+        ])
+
+        joined = " ".join(c["text"] for c in packed)
+        assert joined.lower().count("water molecules") == 1
+        assert "Oxygen is released" in joined
+
+    def test_short_sentence_inside_longer_one_kept(self, packer):
+        packed = packer.pack([
+            {"text": "Salt water boils at a higher temperature. Ice melts.", "final_score": 0.9},
+            {"text": "Water boils. Sugar dissolves quickly. Ice melts.", "final_score": 0.8},
+        ])
+
+        joined = " ".join(c["text"] for c in packed)
+        assert "Water boils." in joined
+        assert joined.count("Ice melts.") == 1
+
+    def test_near_duplicate_sentence_removed(self, packer):
+        packed = packer.pack([
+            {"text": "The mitochondria is the powerhouse of the cell.", "final_score": 0.9},
+            {"text": "The mitochondria is the powerhouse of a cell!", "final_score": 0.85},
+        ])
+
+        assert len(packed) == 1
+
+
+class TestMMR:
+    """Test maximal marginal relevance ordering."""
+
+    def test_diverse_chunk_preferred_over_redundant(self):
+        packer = ContextPacker(token_counter=word_counter, token_budget=100, mmr_lambda=0.5)
+        base = "Photosynthesis converts light energy into chemical energy in plants"
+        ordered = packer.select_mmr([
+            {"text": base, "final_score": 0.90},
+            {"text": base + " daily", "final_score": 0.89},
+            {"text": "Stomata regulate gas exchange through the leaf surface", "final_score": 0.80},
+        ])
+
+        assert ordered[1]["text"].startswith("Stomata")
+
+
+def test_split_sentences():
+    assert split_sentences("One. Two!\nThree?") == ["One.", "Two!", "Three?"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
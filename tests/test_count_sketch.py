@@ -0,0 +1,128 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for sharded pattern mining.
+
+Tests cover:
+- Count-Min estimates never below the true count
+- Merging sketches equals counting everything in one sketch
+- Heavy-hitter retention under a small capacity
+- Sharded mining over a directory of per-school logs
+"""
+
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from system.input_processing.count_sketch import CountMinSketch
+from system.input_processing.pattern_miner import NgramSketch, PatternMiner
+
+SCHOOL_LOGS = [
+    ["can u pls explain photosynthesis", "like basically what is DNA", "what is osmosis"],
+    ["can u pls tell me about mitosis", "like basically explain photosynthesis"],
+    ["can u pls help me with DNA", "like basically tell me about mitosis", "hey bro what is DNA"],
+]
+
+
+@pytest.fixture
+def words():
+    rng = random.Random(0)
+    return [f"w{rng.randint(0, 500)}" for _ in range(5000)]
+
+
+class TestCountMinSketch:
+    """Test the Count-Min sketch."""
+
+    def test_never_underestimates(self, words):
+        sketch = CountMinSketch(width=256, depth=4)
+        for w in words:
+            sketch.add(w)
+        assert all(sketch.estimate(w) >= c for w, c in Counter(words).items())
+        assert sketch.total == len(words)
+
+    def test_exact_when_wide(self):
+        sketch = CountMinSketch(width=2 ** 12)
+        for w in ["a", "b", "a"]:
+            sketch.add(w)
+        assert sketch.estimate("a") == 2
+        assert sketch.estimate("c") == 0
+
+    def test_merge_matches_single_sketch(self, words):
+        whole, left, right = (CountMinSketch(width=256) for _ in range(3))
+        for i, w in enumerate(words):
+            whole.add(w)
+            (left if i % 2 else right).add(w)
+        left.merge(right)
+        assert left.table == whole.table
+        assert left.total == whole.total
+
+    def test_merge_shape_mismatch(self):
+        with pytest.raises(ValueError):
+            CountMinSketch(width=64).merge(CountMinSketch(width=128))
+
+
+class TestNgramSketch:
+    """Test heavy-hitter tracking."""
+
+    def test_keeps_frequent_phrases(self):
+        sketch = NgramSketch(capacity=10, width=2 ** 12)
+        rng = random.Random(1)
+        for i in range(500):
+            sketch.add(f"can you please x{rng.randint(0, 10000)} y{i}")
+        top = dict(sketch.most_common(3))
+        assert top["can you"] == 500
+        assert "can you please" in top
+        assert len(sketch.examples) <= 20
+        assert sketch.start_count("can you please") == 500
+
+    def test_examples_capped(self):
+        sketch = NgramSketch(width=2 ** 12)
+        for q in ["hey bro what is DNA", "hey bro explain mitosis", "hey bro why", "hey bro how"]:
+            sketch.add(q)
+        assert sketch.examples["hey bro"] == ["hey bro what is DNA", "hey bro explain mitosis", "hey bro why"]
+
+
+class TestShardedMining:
+    """Test mining a directory of per-school logs."""
+
+    @pytest.fixture
+    def log_files(self, tmp_path):
+        files = []
+        for i, questions in enumerate(SCHOOL_LOGS):
+            path = tmp_path / f"school_{i}.jsonl"
+            with open(path, 'w', encoding='utf-8') as f:
+                for q in questions:
+                    f.write(json.dumps({"original": q, "confidence": 0.5}) + "\n")
+            files.append(path)
+        return files
+
+    def _summary(self, suggestions):
+        return sorted((s["phrase"], s["frequency"], s["confidence"]) for s in suggestions)
+
+    def test_matches_exact_mining(self, log_files):
+        miner = PatternMiner(min_frequency=3)
+        logs = [log for f in log_files for log in PatternMiner.load_feedback_logs(str(f))]
+        expected = miner.mine_new_patterns(logs)
+        sharded = miner.mine_sharded(log_files, workers=1, width=2 ** 12)
+        assert expected
+        assert self._summary(sharded) == self._summary(expected)
+
+    def test_process_pool(self, log_files):
+        miner = PatternMiner(min_frequency=3)
+        in_process = miner.mine_sharded(log_files, workers=1, width=2 ** 12)
+        assert miner.mine_sharded(log_files, workers=2, width=2 ** 12) == in_process
+
+    def test_no_files(self):
+        assert PatternMiner().mine_sharded([], workers=1) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
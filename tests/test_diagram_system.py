@@ -15,6 +15,7 @@ This test suite validates:
 - Diagram rendering pipeline
 - should_show_diagram logic
 - End-to-end diagram generation
+- Split prepare/finalize generation used during streaming
 """
 
 import unittest
@@ -27,6 +28,8 @@ from system.diagrams.diagram_library import DiagramLibrary
 from system.diagrams.diagram_renderer import DiagramRenderer
 from system.diagrams.diagram_service import (
     generate_diagram_content,
+    prepare_diagram,
+    finalize_diagram,
     should_show_diagram,
     should_attempt_diagram
 )
@@ -232,6 +235,38 @@ class TestEndToEndGeneration(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestPreparedDiagram(unittest.TestCase):
+    """Tests for diagram preparation ahead of the answer."""
+    
+    QUESTION = "Describe photosynthesis process"
+    ANSWER = "Photosynthesis is a complex process involving light absorption, water splitting, electron transport, and glucose synthesis. " * 3
+    
+    def test_prepare_needs_only_question(self):
+        """Verify a diagram is matched and rendered before any answer exists."""
+        prepared = prepare_diagram(self.QUESTION, subject="Science")
+        
+        self.assertIsNotNone(prepared)
+        self.assertGreater(len(prepared['diagram']), 50)
+    
+    def test_finalize_matches_generate(self):
+        """Verify prepare + finalize gives the same result as generate_diagram_content."""
+        prepared = prepare_diagram(self.QUESTION, subject="Science")
+        
+        self.assertEqual(
+            finalize_diagram(prepared, self.QUESTION, self.ANSWER),
+            generate_diagram_content(self.QUESTION, self.ANSWER, subject="Science")
+        )
+    
+    def test_finalize_rejects_short_answer(self):
+        """Verify answer-dependent checks still apply after preparation."""
+        prepared = prepare_diagram(self.QUESTION, subject="Science")
+        self.assertIsNone(finalize_diagram(prepared, self.QUESTION, "Too short."))
+    
+    def test_finalize_without_preparation(self):
+        """Verify a missing prepared diagram yields None."""
+        self.assertIsNone(finalize_diagram(None, self.QUESTION, self.ANSWER))
+
+
 class TestDiagramConfig(unittest.TestCase):
     """Tests for diagram configuration."""
     
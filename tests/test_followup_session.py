@@ -0,0 +1,116 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for FollowUpSession.
+
+Tests cover:
+- Follow-up detection
+- Session matching on subject, grade, turns and expiry
+- Turn bookkeeping
+"""
+
+import time
+
+import pytest
+
+from system.rag.followup_session import FollowUpSession, detect_follow_up
+
+
+@pytest.fixture
+def session():
+    session = FollowUpSession(ttl_seconds=60, max_turns=2)
+    session.start(
+        "What is photosynthesis?", "Science", "10",
+        chunks=[{"text": "Plants make food using light.", "metadata": {}}],
+        context="Plants make food using light.",
+        llm_state=object()
+    )
+    return session
+
+
+class TestDetection:
+    """Test follow-up detection."""
+
+    @pytest.mark.parametrize("text", [
+        "explain more",
+        "Can you explain it in more detail?",
+        "give me an example",
+        "example?",
+        "I don't understand",
+        "make it simpler",
+        "why?",
+        "what about this?",
+        "why is that?",
+        "how does it work?",
+    ])
+    def test_follow_ups_detected(self, text):
+        assert detect_follow_up(text) is not None
+
+    @pytest.mark.parametrize("text", [
+        "What is Newton's second law of motion?",
+        "Define osmosis",
+        "explain the process of photosynthesis in more detail",
+        "give an example of a chemical reaction",
+        "Can you give examples of renewable energy sources?",
+        "What makes it rain?",
+        "Does this apply to Newton's law?",
+        "Why is that acid?",
+        "Is it a mammal?",
+        "",
+    ])
+    def test_new_questions_not_detected(self, text):
+        assert detect_follow_up(text) is None
+
+
+class TestSessionMatching:
+    """Test matching input against the session."""
+
+    def test_turn_mentions_previous_question(self, session):
+        turn = session.match("give an example", "Science", "10")
+        assert turn and "photosynthesis" in turn
+
+    def test_turn_carries_student_words(self, session):
+        turn = session.match("can you explain it again please", "Science", "10")
+        assert "photosynthesis" in turn
+        assert "can you explain it again please" in turn
+
+    def test_new_topic_with_follow_up_words_starts_over(self, session):
+        assert session.match("explain the process of respiration in more detail", "Science", "10") is None
+        assert session.match("give an example of a chemical reaction", "Science", "10") is None
+
+    def test_subject_or_grade_change_breaks_session(self, session):
+        assert session.match("explain more", "Math", "10") is None
+        assert session.match("explain more", "Science", "9") is None
+
+    def test_max_turns(self, session):
+        session.record_turn()
+        session.record_turn()
+        assert session.match("explain more", "Science", "10") is None
+
+    def test_expired_session(self, session):
+        session.updated_at = time.time() - 120
+        assert session.match("explain more", "Science", "10") is None
+
+    def test_reset(self, session):
+        session.reset()
+        assert not session.active
+        assert session.match("explain more", "Science", "10") is None
+
+    def test_record_turn_updates_state(self, session):
+        state = object()
+        session.record_turn(state)
+        stats = session.stats()
+
+        assert session.llm_state is state
+        assert stats["turns"] == 1
+        assert stats["follow_ups_served"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,100 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for FuzzyPhraseMatcher.
+
+Tests cover:
+- Bounded insert/delete distance with early exit
+- Typo'd phrase detection at the 0.85 threshold
+- Removal order and best-window selection
+- Agreement with the plain SequenceMatcher scan
+"""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from system.input_processing.fuzzy_matcher import FuzzyPhraseMatcher, bounded_indel_distance
+
+PHRASES = ["with reference to the figure above", "according to the passage", "explain in brief"]
+
+
+@pytest.fixture
+def matcher():
+    return FuzzyPhraseMatcher(PHRASES)
+
+
+class TestBoundedDistance:
+    """Test the banded edit distance."""
+
+    def test_within_limit(self):
+        assert bounded_indel_distance("pasage", "passage", 2) == 1
+        assert bounded_indel_distance("abc", "abc", 0) == 0
+
+    def test_substitution_costs_two(self):
+        assert bounded_indel_distance("cat", "cut", 2) == 2
+
+    def test_over_limit(self):
+        assert bounded_indel_distance("photosynthesis", "mitosis", 3) is None
+        assert bounded_indel_distance("a", "abcdef", 2) is None
+
+
+class TestMatching:
+    """Test phrase detection and removal."""
+
+    def test_typo_phrase_removed(self, matcher):
+        text, removed = matcher.remove("Acording to the pasage what is osmosis?")
+        assert text == "what is osmosis?"
+        assert removed == 1
+
+    def test_all_phrases_found(self, matcher):
+        found = matcher.find_all("with refrence to the figure abov explain in breif the leaf")
+        assert [phrase for phrase, _, _ in found] == [PHRASES[0], PHRASES[2]]
+
+    def test_unrelated_text_untouched(self, matcher):
+        text = "What  is the function of the   nucleus?"
+        assert matcher.remove(text) == (text, 0)
+
+    def test_best_window_removed(self):
+        matcher = FuzzyPhraseMatcher(["explain in brief"])
+        text, _ = matcher.remove("explain in brif and explain in brief")
+        assert text == "explain in brif and"
+
+    def test_most_windows_filtered(self, matcher):
+        matcher.remove(" ".join(["chlorophyll absorbs light"] * 50))
+        assert matcher.stats()["filtered_ratio"] > 0.9
+
+
+class TestEquivalence:
+    """Test agreement with the SequenceMatcher sliding window."""
+
+    def test_scores_match_difflib(self, matcher):
+        rng = random.Random(7)
+        for _ in range(2000):
+            target = rng.choice(PHRASES)
+            window = list(target)
+            for _ in range(rng.randint(0, 6)):
+                i = rng.randrange(len(window))
+                if rng.random() < 0.5:
+                    del window[i]
+                else:
+                    window.insert(i, rng.choice("aeirst "))
+            window = "".join(window)
+            entry = next(e for e in matcher.phrases if e["target"] == target)
+            ratio = SequenceMatcher(None, window, target).ratio()
+            score = matcher._score(window, entry)
+            if ratio >= matcher.threshold:
+                assert score == ratio
+            else:
+                assert score < matcher.threshold
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,123 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for GradingCache.
+
+Tests cover:
+- Hits on canonicalised answers and persistence across instances
+- Near-duplicate matching by embedding
+- Invalidation when acceptable answers change, and LRU bound
+- QuickGrader skipping the model for cached verdicts
+"""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from system.grading import GradingCache, QuickGrader
+
+QUESTION = "Which organelle is the powerhouse of the cell?"
+ANSWERS = ["Mitochondria"]
+
+
+def _unit(vector):
+    v = np.asarray(vector, dtype=np.float32)
+    return v / np.linalg.norm(v)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "grading_cache.json"
+
+
+@pytest.fixture
+def cache(cache_path):
+    return GradingCache(cache_path=str(cache_path))
+
+
+class TestExactLookup:
+    """Test canonical answer lookups."""
+
+    def test_canonical_answer_hit(self, cache):
+        cache.put(QUESTION, ANSWERS, "The mitochondria", True, "Correct!")
+        assert cache.get(QUESTION, ANSWERS, "the Mitochondria.") == (True, "Correct!")
+        assert cache.get(QUESTION, ANSWERS, "Nucleus") is None
+        assert cache.stats()["hits"] == 1
+
+    def test_shared_across_instances(self, cache, cache_path):
+        cache.put(QUESTION, ANSWERS, "ribosome", False, "No.")
+        other = GradingCache(cache_path=str(cache_path))
+        assert other.get(QUESTION, ANSWERS, "Ribosome") == (False, "No.")
+        assert "questions" in json.loads(cache_path.read_text(encoding="utf-8"))
+
+    def test_concurrent_writers_merged(self, cache, cache_path):
+        other = GradingCache(cache_path=str(cache_path))
+        cache.put(QUESTION, ANSWERS, "ribosome", False, "No.")
+        other.put(QUESTION, ANSWERS, "golgi body", False, "No.")
+        fresh = GradingCache(cache_path=str(cache_path))
+        assert fresh.get(QUESTION, ANSWERS, "ribosome") is not None
+        assert fresh.get(QUESTION, ANSWERS, "golgi body") is not None
+
+    def test_corrupted_file_starts_empty(self, cache_path):
+        cache_path.write_text("{not json", encoding="utf-8")
+        assert GradingCache(cache_path=str(cache_path)).stats()["entries"] == 0
+
+
+class TestNearDuplicates:
+    """Test embedding matches."""
+
+    def test_near_duplicate_hit(self, cache):
+        cache.put(QUESTION, ANSWERS, "it makes energy", True, "Yes.", embedding=_unit([1, 0.05, 0]))
+        assert cache.find_near(QUESTION, ANSWERS, _unit([1, 0, 0])) == (True, "Yes.")
+        assert cache.find_near(QUESTION, ANSWERS, _unit([0, 1, 0])) is None
+
+
+class TestInvalidation:
+    """Test content changes and eviction."""
+
+    def test_changed_answers_drop_entries(self, cache):
+        cache.put(QUESTION, ANSWERS, "mitochondrion", False, "No.")
+        assert cache.get(QUESTION, ANSWERS + ["Mitochondrion"], "mitochondrion") is None
+        assert cache.stats()["invalidated"] == 1
+        assert cache.get(QUESTION, ANSWERS, "mitochondrion") is None
+
+    def test_answer_order_does_not_invalidate(self, cache):
+        cache.put(QUESTION, ["A", "B"], "c", False, "No.")
+        assert cache.get(QUESTION, ["B", "A"], "c") == (False, "No.")
+
+    def test_lru_bound(self, cache_path):
+        cache = GradingCache(cache_path=str(cache_path), max_entries=2)
+        for answer in ("one", "two", "three"):
+            cache.put(QUESTION, ANSWERS, answer, False, "No.")
+        assert cache.stats()["entries"] == 2
+        assert cache.get(QUESTION, ANSWERS, "one") is None
+
+
+class TestGraderIntegration:
+    """Test QuickGrader with a cache."""
+
+    def test_model_verdict_reused(self, cache):
+        calls = []
+
+        class Model:
+            def generate_verdict(self, prompt, feedback=True):
+                calls.append(prompt)
+                return True, "Good."
+
+        grader = QuickGrader(model_handler=Model(), cache=cache)
+        assert grader.grade(QUESTION, "The energy organelle", ANSWERS) == (True, "Good.")
+        assert grader.grade(QUESTION, "the energy organelle!", ANSWERS) == (True, "Good.")
+        assert len(calls) == 1
+        assert grader.stats()["decisions"]["cached"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -18,14 +18,20 @@ Tests cover:
 - Intent classification
 - Confidence scoring
 - Edge cases and boundary conditions
+- Compiled rule matchers and learned phrase updates
+- Lazy loading of the optional spaCy tagger
+- Shared result cache and combined intent matcher
 """
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import threading
+
 import pytest
 from system.input_processing.input_normalizer import InputNormalizer
+from system.input_processing.normalization_cache import NormalizationCache
 
 
 class TestNoiseRemoval:
@@ -341,5 +347,139 @@ class TestEdgeCases:
             assert result["clean_question"] is not None
 
 
+class TestCompiledRules:
+    """Test the combined single-pass matchers."""
+
+    @pytest.fixture
+    def normalizer(self):
+        return InputNormalizer()
+
+    def test_added_phrase_takes_effect(self, tmp_path):
+        """Test that a newly learned phrase is removed on the next call."""
+        normalizer = InputNormalizer(learnable_db_path=str(tmp_path / "phrases.json"))
+        normalizer.add_noise_phrase("as per the textbook")
+        result = normalizer.normalize("as per the textbook what is osmosis")
+        assert "textbook" not in result["clean_question"].lower()
+
+    def test_longest_learned_phrase_wins(self, normalizer):
+        """Test that overlapping learned phrases resolve longest-first."""
+        normalizer.learned_noise_phrases |= {"quick note", "quick note please"}
+        result = normalizer.normalize("quick note please what is osmosis")
+        assert "please" not in result["clean_question"].lower()
+
+    def test_abbreviations_expanded_in_one_pass(self, normalizer):
+        """Test that several abbreviations in one question are all expanded."""
+        result = normalizer.normalize("What is the difference between AC and DC?")
+        clean = result["clean_question"].lower()
+        assert "alternating current" in clean
+        assert "direct current" in clean
+
+
+class TestLazyLoading:
+    """Test that spaCy is only loaded on first use."""
+
+    def test_spacy_not_loaded_by_normalize(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(InputNormalizer, "_load_spacy", lambda self: calls.append(1) or "nlp")
+        normalizer = InputNormalizer()
+        normalizer.normalize("What is photosynthesis?")
+        assert calls == []
+        assert not normalizer.nlp_ready
+
+        assert normalizer.nlp == "nlp"
+        assert normalizer.nlp == "nlp"
+        assert calls == [1]
+        assert normalizer.nlp_ready
+
+
+
+class TestResultCache:
+    """Test the per-question result cache."""
+
+    @pytest.fixture
+    def cache(self):
+        return NormalizationCache(max_entries=64)
+
+    @pytest.fixture
+    def normalizer(self, tmp_path, cache):
+        return InputNormalizer(str(tmp_path / "phrases.json"), cache=cache)
+
+    def test_repeat_hits_cache(self, normalizer, cache):
+        first = normalizer.normalize("hey can u explain photosynthesis")
+        second = normalizer.normalize("hey can u explain photosynthesis")
+        assert second == first
+        assert cache.stats()["hits"] == 1
+
+    def test_results_are_copies(self, normalizer):
+        normalizer.normalize("what is osmosis").get("notes").append("mutated")
+        assert "mutated" not in normalizer.normalize("what is osmosis")["notes"]
+
+    def test_scaffolding_cached_separately(self, normalizer):
+        assert "scaffolded_prompt" not in normalizer.normalize("why is the sky blue")
+        assert normalizer.normalize("why is the sky blue", add_scaffolding=True)["scaffolded_prompt"].startswith(
+            "Explain the reason:"
+        )
+
+    def test_new_phrase_invalidates(self, normalizer):
+        before = normalizer.normalize("quick note what is osmosis")
+        normalizer.add_noise_phrase("quick note")
+        assert normalizer.normalize("quick note what is osmosis")["clean_question"] != before["clean_question"]
+
+    def test_normalizers_with_different_phrases(self, tmp_path, cache):
+        plain = InputNormalizer(str(tmp_path / "a.json"), cache=cache)
+        learned = InputNormalizer(str(tmp_path / "b.json"), cache=cache)
+        learned.add_noise_phrase("quick note")
+        assert "Quick note" in plain.normalize("quick note what is osmosis")["clean_question"]
+        assert "quick note" not in learned.normalize("quick note what is osmosis")["clean_question"].lower()
+
+    def test_fallback_not_cached(self, normalizer, cache):
+        normalizer.normalize("hi")
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, tmp_path):
+        cache = NormalizationCache(max_entries=2)
+        normalizer = InputNormalizer(str(tmp_path / "phrases.json"), cache=cache)
+        for q in ["what is osmosis", "what is mitosis", "what is osmosis", "what is meiosis"]:
+            normalizer.normalize(q)
+        assert cache.stats()["entries"] == 2
+        normalizer.normalize("what is osmosis")
+        assert cache.stats()["hits"] == 2
+
+    def test_disabled(self, tmp_path):
+        cache = NormalizationCache(0)
+        normalizer = InputNormalizer(str(tmp_path / "phrases.json"), cache=cache)
+        normalizer.normalize("what is osmosis")
+        normalizer.normalize("what is osmosis")
+        assert cache.stats()["entries"] == 0
+
+    def test_shared_by_default(self):
+        assert InputNormalizer().cache is NormalizationCache.shared()
+
+    def test_concurrent_sessions(self, normalizer):
+        questions = ["what is osmosis", "why is the sky blue", "how do plants grow", "define velocity"]
+        expected = [InputNormalizer(normalizer.learnable_db_path, cache=NormalizationCache(0)).normalize(q)
+                    for q in questions]
+        errors = []
+
+        def session():
+            for _ in range(50):
+                for q, e in zip(questions, expected):
+                    if normalizer.normalize(q) != e:
+                        errors.append(q)
+
+        threads = [threading.Thread(target=session) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+
+    def test_intent_priority_kept(self, normalizer):
+        """The first intent in order wins, not the leftmost match."""
+        assert normalizer._classify_intent("difference between what causes rain and snow") == "WHY"
+        assert normalizer._classify_intent("explain the difference between AC and DC") == "DESCRIBE"
+        assert normalizer._classify_intent("what does\nosmosis mean") == "DESCRIBE"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
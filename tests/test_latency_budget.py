@@ -0,0 +1,96 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for LatencyBudget.
+
+Tests cover:
+- Full-cost stages when the budget is fresh
+- Spell-check skip, collection cap, context cut and max_tokens cut when tight
+- Degradation reporting
+"""
+
+import pytest
+
+from system.rag.latency_budget import LatencyBudget
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def budget(clock):
+    return LatencyBudget(ttft_seconds=3.0, clock=clock)
+
+
+class TestFreshBudget:
+    """Test that nothing degrades with time to spare."""
+
+    def test_all_stages_full_cost(self, budget):
+        assert budget.allow_spell_check(120)
+        assert budget.collection_limit(3, 120) == 3
+        assert budget.context_tokens(120) == 120
+        assert budget.max_tokens(512) == 512
+        assert budget.report()["degradations"] == []
+
+
+class TestTightBudget:
+    """Test degradations once time has been spent."""
+
+    def test_skips_spell_check(self, budget, clock):
+        clock.now += 1.6
+        assert not budget.allow_spell_check(120)
+        assert "skip_spell_check" in budget.degradations
+
+    def test_spell_wait_capped(self, budget, clock):
+        assert budget.spell_check_wait(0.15, 120) == 0.15
+        clock.now += 2.5
+        assert budget.spell_check_wait(0.15, 120) == 0.0
+
+    def test_fewer_collections(self, budget, clock):
+        clock.now += 1.6
+        assert budget.collection_limit(3, 120) < 3
+
+    def test_at_least_one_collection(self, budget, clock):
+        clock.now += 10
+        assert budget.collection_limit(3, 120) == 1
+
+    def test_smaller_context(self, budget, clock):
+        clock.now += 2.2
+        tokens = budget.context_tokens(120)
+        assert 60 <= tokens < 120
+
+    def test_lower_max_tokens(self, budget, clock):
+        clock.now += 2.5
+        assert budget.max_tokens(512) < 512
+
+    def test_report_lists_degradations(self, budget, clock):
+        clock.now += 2.5
+        budget.allow_spell_check(120)
+        budget.max_tokens(512)
+        report = budget.report()
+
+        assert report["ttft_budget"] == 3.0
+        assert report["elapsed_before_generation"] == pytest.approx(2.5)
+        assert len(report["degradations"]) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
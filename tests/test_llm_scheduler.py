@@ -0,0 +1,90 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for LLMScheduler.
+
+Tests cover:
+- Background tasks run in priority order
+- Interactive calls cancel queued and running background work
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("llama_cpp")
+
+from ai_model.model_utils.llm_scheduler import LLMScheduler
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def scheduler():
+    return LLMScheduler()
+
+
+class TestBackground:
+    """Test background execution."""
+
+    def test_runs_in_priority_order(self, scheduler):
+        gate = threading.Event()
+        order = []
+        scheduler.submit_background(lambda cancelled: gate.wait(1.0), priority=0)
+        scheduler.submit_background(lambda cancelled: order.append("low"), priority=20)
+        scheduler.submit_background(lambda cancelled: order.append("high"), priority=5)
+        gate.set()
+
+        assert _wait_for(lambda: len(order) == 2)
+        assert order == ["high", "low"]
+
+
+class TestCancellation:
+    """Test interactive preemption."""
+
+    def test_interactive_cancels_running_task(self, scheduler):
+        started = threading.Event()
+        stopped = threading.Event()
+
+        def long_task(cancelled):
+            started.set()
+            while not cancelled():
+                time.sleep(0.01)
+            stopped.set()
+
+        scheduler.submit_background(long_task, uses_llm=True)
+        assert started.wait(1.0)
+
+        with scheduler.interactive():
+            assert stopped.is_set()
+
+    def test_cancel_drops_queued_tasks(self, scheduler):
+        gate = threading.Event()
+        ran = []
+        scheduler.submit_background(lambda cancelled: gate.wait(1.0))
+        assert _wait_for(lambda: scheduler.stats()["queued"] == 0)
+        scheduler.submit_background(lambda cancelled: ran.append(1))
+        scheduler.cancel_background()
+        gate.set()
+
+        time.sleep(0.1)
+        assert ran == []
+        assert scheduler.stats()["cancelled"] >= 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,143 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for the background log writer and the append-only spell cache.
+
+Tests cover:
+- Batched appends grouped per file
+- Flush and ordered tasks on the writer thread
+- Dropping entries when the queue is full
+- The shared writer and restarting after close
+- Spell cache log replay and compaction
+"""
+
+import json
+import threading
+
+import pytest
+
+from system.input_processing.adaptive_normalizer import AdaptiveNormalizer
+from system.input_processing.log_writer import LogWriter
+
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.fixture
+def writer():
+    writer = LogWriter(batch_size=3, flush_interval=0.05)
+    yield writer
+    writer.close()
+
+
+class TestLogWriter:
+    """Test background appends."""
+
+    def test_entries_written_in_order(self, writer, tmp_path):
+        for i in range(7):
+            writer.write(tmp_path / "a.jsonl", {"i": i})
+        writer.write(tmp_path / "b.jsonl", {"i": "b"})
+        assert writer.flush()
+        assert [e["i"] for e in read_lines(tmp_path / "a.jsonl")] == list(range(7))
+        assert read_lines(tmp_path / "b.jsonl") == [{"i": "b"}]
+        assert writer.stats()["written"] == 8
+
+    def test_task_runs_after_queued_entries(self, writer, tmp_path):
+        seen = []
+        writer.write(tmp_path / "a.jsonl", {"i": 1})
+        writer.call(lambda: seen.append(len(read_lines(tmp_path / "a.jsonl"))))
+        writer.flush()
+        assert seen == [1]
+
+    def test_full_queue_drops(self, tmp_path):
+        writer = LogWriter(max_queue=2)
+        blocker = threading.Event()
+        writer.call(lambda: blocker.wait(5))
+        results = [writer.write(tmp_path / "a.jsonl", {"i": i}) for i in range(5)]
+        blocker.set()
+        writer.close()
+        assert results.count(False) == writer.stats()["dropped"] > 0
+
+    def test_flush_without_writes(self):
+        assert LogWriter().flush()
+
+    def test_shared_instance(self):
+        assert LogWriter.shared() is LogWriter.shared()
+
+    def test_write_after_close(self, writer, tmp_path):
+        writer.write(tmp_path / "a.jsonl", {"i": 1})
+        writer.close()
+        writer.write(tmp_path / "a.jsonl", {"i": 2})
+        assert writer.flush()
+        assert [e["i"] for e in read_lines(tmp_path / "a.jsonl")] == [1, 2]
+
+
+class TestSpellCacheLog:
+    """Test the append-only spell cache."""
+
+    class Checker:
+        def correct(self, text):
+            return text.replace("fotosynthesis", "photosynthesis")
+
+    @pytest.fixture
+    def normalizers(self):
+        normalizers = []
+        yield normalizers
+        for normalizer in normalizers:
+            normalizer.close()
+
+    @pytest.fixture
+    def make_normalizer(self, normalizers):
+        def make(log_dir, compact_every=1000):
+            normalizer = AdaptiveNormalizer(
+                log_dir=str(log_dir), enable_spell_check=False, compact_every=compact_every
+            )
+            normalizer.spell_checker = self.Checker()
+            normalizers.append(normalizer)
+            return normalizer
+        return make
+
+    def test_miss_appends_without_rewriting_snapshot(self, make_normalizer, tmp_path):
+        normalizer = make_normalizer(tmp_path)
+        normalizer._correct_and_cache("what is fotosynthesis")
+        normalizer.log_writer.flush()
+        assert not (tmp_path / "spell_cache.json").exists()
+        assert len(read_lines(tmp_path / "spell_cache.log.jsonl")) == 1
+
+    def test_log_replayed_on_load(self, make_normalizer, tmp_path):
+        first = make_normalizer(tmp_path)
+        first._correct_and_cache("what is fotosynthesis")
+        first.log_writer.flush()
+
+        second = make_normalizer(tmp_path)
+        key = second._get_cache_key("what is fotosynthesis")
+        assert second.spell_cache[key]["corrected"] == "what is photosynthesis"
+
+    def test_compaction_folds_log_into_snapshot(self, make_normalizer, tmp_path):
+        normalizer = make_normalizer(tmp_path, compact_every=2)
+        normalizer._correct_and_cache("what is fotosynthesis")
+        normalizer._correct_and_cache("explain fotosynthesis")
+        normalizer.log_writer.flush()
+
+        with open(tmp_path / "spell_cache.json", 'r') as f:
+            assert len(json.load(f)) == 2
+        assert read_lines(tmp_path / "spell_cache.log.jsonl") == []
+        assert len(make_normalizer(tmp_path).spell_cache) == 2
+
+    def test_close_compacts(self, make_normalizer, tmp_path):
+        normalizer = make_normalizer(tmp_path)
+        normalizer._correct_and_cache("what is fotosynthesis")
+        normalizer.close()
+        assert (tmp_path / "spell_cache.json").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
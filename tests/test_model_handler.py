@@ -110,6 +110,26 @@ def test_generate_response(model_path):
     assert len(response) > 0
 
 
+def test_generate_verdict(model_path):
+    """Test grammar-constrained grading verdicts."""
+    handler = ModelHandler(model_path)
+    prompt = (
+        "Question: What is 2 + 2?\n"
+        "Correct Answer: 4\n"
+        "Student Answer: 4\n"
+        "Verdict:"
+    )
+    
+    verdict = handler.generate_verdict(prompt, feedback=False)
+    assert verdict is not None
+    assert isinstance(verdict[0], bool)
+    assert verdict[1] == ""
+    
+    is_correct, feedback = handler.generate_verdict(prompt)
+    assert isinstance(is_correct, bool)
+    assert isinstance(feedback, str)
+
+
 def test_cleanup(model_path):
     """Test model cleanup."""
     handler = ModelHandler(model_path)
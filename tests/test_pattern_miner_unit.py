@@ -17,6 +17,7 @@ Tests cover:
 - Noise likelihood detection
 - Example retrieval
 - Report generation
+- Incremental mining from persisted counters and log offsets
 - Edge cases and boundary conditions
 """
 
@@ -333,6 +334,78 @@ class TestReportGeneration:
             Path(output_file).unlink()
 
 
+class TestIncrementalMining:
+    """Test incremental mining from persisted counters."""
+    
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        return tmp_path / "feedback_db.jsonl"
+    
+    @pytest.fixture
+    def state_file(self, tmp_path):
+        return str(tmp_path / "miner_state.json.gz")
+    
+    def _append(self, log_file, questions, confidence=0.5):
+        with open(log_file, 'a', encoding='utf-8') as f:
+            for q in questions:
+                f.write(json.dumps({"original": q, "confidence": confidence}) + "\n")
+    
+    def test_matches_full_mining(self, log_file, state_file):
+        """Test that counters give the same suggestions as mining all logs."""
+        self._append(log_file, ["can u pls explain photosynthesis", "like basically what is DNA"] * 4)
+        self._append(log_file, ["what is osmosis"], confidence=0.9)
+        miner = PatternMiner(min_frequency=3, state_file=state_file)
+        miner.update_from_log(str(log_file))
+        
+        expected = PatternMiner(min_frequency=3).mine_new_patterns(PatternMiner.load_feedback_logs(str(log_file)))
+        assert miner.suggest() == expected
+        assert miner.counts.cases == 8
+    
+    def test_reads_only_new_lines(self, log_file, state_file):
+        """Test that a second run resumes from the stored offset."""
+        self._append(log_file, ["hey bro what is DNA"] * 2)
+        assert PatternMiner(min_frequency=3, state_file=state_file).update_from_log(str(log_file)) == 2
+        
+        self._append(log_file, ["hey bro explain mitosis"])
+        miner = PatternMiner(min_frequency=3, state_file=state_file)
+        assert miner.update_from_log(str(log_file)) == 1
+        assert miner.counts.ngrams["hey bro"] == 3
+        assert [s["phrase"] for s in miner.suggest()] == ["hey bro"]
+    
+    def test_partial_line_left_for_next_run(self, log_file, state_file):
+        """Test that a line still being written is not consumed."""
+        self._append(log_file, ["hey bro what is DNA"])
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write('{"original": "hey bro')
+        miner = PatternMiner(state_file=state_file)
+        assert miner.update_from_log(str(log_file)) == 1
+        
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write(' explain mitosis", "confidence": 0.5}\n')
+        assert miner.update_from_log(str(log_file)) == 1
+        assert miner.counts.starts["hey bro explain"] == 1
+    
+    def test_rotated_log_recounted(self, log_file, state_file):
+        """Test that a replaced log file resets the counters."""
+        self._append(log_file, ["hey bro what is DNA"] * 3)
+        PatternMiner(state_file=state_file).update_from_log(str(log_file))
+        
+        log_file.unlink()
+        self._append(log_file, ["like basically what is mitosis and meiosis"])
+        miner = PatternMiner(state_file=state_file)
+        miner.update_from_log(str(log_file))
+        assert miner.counts.cases == 1
+        assert "hey bro" not in miner.counts.ngrams
+    
+    def test_corrupt_state_starts_over(self, log_file, tmp_path):
+        """Test that an unreadable state file is ignored."""
+        state_file = tmp_path / "miner_state.json.gz"
+        state_file.write_text("not gzip")
+        miner = PatternMiner(state_file=str(state_file))
+        assert miner.counts.cases == 0
+        assert miner.offset == 0
+
+
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
     
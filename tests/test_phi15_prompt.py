@@ -0,0 +1,147 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for Phi 1.5 RAG prompt assembly.
+
+Tests cover:
+- Token prompts keeping the same whole sentences as text prompts
+- Context within budget kept in full
+- Follow-up state kept as token ids, snapshotted only when another call needs the model
+"""
+
+import pytest
+
+pytest.importorskip("llama_cpp")
+
+from ai_model.model_utils.phi15_handler import SimplePhiHandler
+from system.rag.context_packer import split_sentences
+
+CHUNKS = [
+    "Photosynthesis happens in the chloroplasts of plant cells. Chlorophyll absorbs red and blue light.",
+    "The light reactions split water and release oxygen gas. The Calvin cycle fixes carbon dioxide into sugar.",
+]
+
+
+class WordTokenizer:
+    """Stand-in for the Phi tokenizer: one token per word."""
+
+    def __init__(self):
+        self.vocabulary = {}
+
+    def tokenize(self, text, add_bos=False):
+        return [self.vocabulary.setdefault(w, len(self.vocabulary)) for w in text.decode("utf-8").split()]
+
+    def words(self, ids):
+        names = {i: w for w, i in self.vocabulary.items()}
+        return [names[i] for i in ids]
+
+
+class FakeLlama(WordTokenizer):
+    """Tokenizer plus the evaluated-token bookkeeping of llama_cpp.Llama."""
+
+    def __init__(self):
+        super().__init__()
+        self.input_ids, self.n_tokens = [], 0
+        self.saves, self.loads = 0, 0
+
+    def __call__(self, prompt, stream=False, **kwargs):
+        tokens = self.tokenize(prompt.encode("utf-8")) if isinstance(prompt, str) else list(prompt)
+        self.input_ids = tokens + self.tokenize(b"ok")
+        self.n_tokens = len(self.input_ids)
+        output = {"choices": [{"text": " ok"}]}
+        return iter([output]) if stream else output
+
+    def n_ctx(self):
+        return 2048
+
+    def save_state(self):
+        self.saves += 1
+        return list(self.input_ids[:self.n_tokens])
+
+    def load_state(self, state):
+        self.loads += 1
+        self.input_ids, self.n_tokens = list(state), len(state)
+
+
+@pytest.fixture
+def handler():
+    handler = SimplePhiHandler("unused.gguf")
+    handler.llm = WordTokenizer()
+    return handler
+
+
+def context_tokens(handler, chunks):
+    # As stored at ingest time: each sentence tokenized with a leading space
+    return [[handler.tokenize(" " + s) for s in split_sentences(chunk)] for chunk in chunks]
+
+
+class TestPromptTokens:
+    """Test the pre-tokenised prompt against the text prompt."""
+
+    @pytest.mark.parametrize("budget", [12, 17, 25, 200])
+    def test_matches_text_prompt(self, handler, monkeypatch, budget):
+        monkeypatch.setattr(SimplePhiHandler, "CONTEXT_TOKEN_BUDGET", budget)
+        question = "Where does photosynthesis happen?"
+
+        text_prompt = handler._build_prompt(question, "\n\n".join(CHUNKS))
+        token_prompt = handler._build_prompt_tokens(question, context_tokens(handler, CHUNKS))
+
+        assert handler.llm.words(token_prompt) == text_prompt.split()
+
+    def test_cut_at_sentence_boundary(self, handler, monkeypatch):
+        monkeypatch.setattr(SimplePhiHandler, "CONTEXT_TOKEN_BUDGET", 12)
+        prompt = " ".join(handler.llm.words(handler._build_prompt_tokens("Why?", context_tokens(handler, CHUNKS))))
+        assert "plant cells." in prompt
+        assert "Chlorophyll" not in prompt
+
+    def test_context_within_budget_kept(self, handler):
+        tokens = context_tokens(handler, CHUNKS)
+        assert handler._trim_context_tokens(tokens, 200) is tokens
+
+
+class TestFollowUpState:
+    """Test the follow-up base kept after an answer."""
+
+    @pytest.fixture
+    def answered(self, handler):
+        handler.llm = FakeLlama()
+        "".join(handler.get_answer_stream("What is photosynthesis?", CHUNKS[0]))
+        return handler
+
+    def test_keep_session_copies_no_state(self, answered):
+        history = answered.keep_session()
+        assert history == answered.llm.input_ids
+        assert answered.llm.saves == 0
+
+    def test_follow_up_reuses_live_cache(self, answered):
+        history = answered.keep_session()
+        prompt = answered.continuation_prompt("Explain in more detail", history)
+        assert prompt[:len(history)] == history
+        "".join(answered.continue_answer_stream(prompt, history))
+        assert (answered.llm.saves, answered.llm.loads) == (0, 0)
+
+    def test_other_call_snapshots_once(self, answered):
+        history = answered.keep_session()
+        answered.generate_response("Grade this answer")
+        answered.generate_response("Grade another answer")
+        assert answered.llm.saves == 1
+
+        prompt = answered.continuation_prompt("Give an example", history)
+        "".join(answered.continue_answer_stream(prompt, history))
+        assert answered.llm.loads == 1
+
+    def test_new_question_ends_session(self, answered):
+        answered.keep_session()
+        answered.end_session()
+        answered.generate_response("Grade this answer")
+        assert answered.llm.saves == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
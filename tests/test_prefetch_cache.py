@@ -0,0 +1,104 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for PrefetchCache.
+
+Tests cover:
+- Exact matches after canonicalisation
+- Near matches by embedding similarity
+- Prefix matches for debounced partial questions
+- Subject/grade isolation, LRU bound and expiry
+"""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from system.rag.prefetch_cache import PrefetchCache, canonical_text
+
+
+def _entry(vector):
+    v = np.asarray(vector, dtype=np.float32)
+    return {"embedding": v / np.linalg.norm(v), "relevant_chunks": [{"text": "chunk"}]}
+
+
+@pytest.fixture
+def cache():
+    cache = PrefetchCache(max_entries=3, ttl_seconds=60, similarity_threshold=0.93)
+    cache.put(["how does photosynthesis work", "How does photosynthesis work?"], "Science", "10", _entry([1, 0, 0]))
+    return cache
+
+
+class TestExactMatch:
+    """Test text matching."""
+
+    def test_canonical_text(self):
+        assert canonical_text("  How does   Photosynthesis work?? ") == "how does photosynthesis work"
+
+    def test_punctuation_and_case_ignored(self, cache):
+        assert cache.get("HOW does photosynthesis work!", "science", "10") is not None
+
+    def test_subject_and_grade_isolated(self, cache):
+        assert cache.get("how does photosynthesis work", "Math", "10") is None
+        assert cache.get("how does photosynthesis work", "Science", "9") is None
+
+    def test_expired_entry_ignored(self, cache):
+        cache.ttl_seconds = 0
+        time.sleep(0.01)
+        assert cache.get("how does photosynthesis work", "Science", "10") is None
+
+
+class TestNearMatch:
+    """Test embedding near matches."""
+
+    def test_close_embedding_matches(self, cache):
+        assert cache.find_near([0.99, 0.05, 0.0], "Science", "10") is not None
+        assert cache.stats()["near_hits"] == 1
+
+    def test_distant_embedding_misses(self, cache):
+        assert cache.find_near([0.5, 0.5, 0.5], "Science", "10") is None
+        assert cache.stats()["misses"] == 1
+
+
+class TestPrefixMatch:
+    """Test partial questions completed by the submitted one."""
+
+    def test_finished_last_word_matches(self, cache):
+        cache.put(["what is photosynthe"], "Science", "10", _entry([0, 1, 0]))
+        assert cache.find_prefix("What is photosynthesis?", "Science", "10") is not None
+        assert cache.stats()["prefix_hits"] == 1
+
+    def test_longest_prefix_wins(self, cache):
+        cache.put(["explain the process of photo"], "Science", "10", _entry([0, 1, 0]))
+        cache.put(["explain the process of photosynth"], "Science", "10", _entry([0, 0, 1]))
+        entry = cache.find_prefix("explain the process of photosynthesis", "Science", "10")
+        assert entry["embedding"][2] == 1
+
+    def test_added_words_or_short_prefix_miss(self, cache):
+        assert cache.find_prefix("how does photosynthesis work in plants", "Science", "10") is None
+        cache.put(["what is photo"], "Science", "10", _entry([0, 1, 0]))
+        assert cache.find_prefix("what is photosynthesis", "Science", "10") is None
+        assert cache.find_prefix("how does photosynthesis work", "Math", "10") is None
+
+
+class TestBounds:
+    """Test LRU bound."""
+
+    def test_oldest_evicted(self, cache):
+        for i in range(3):
+            cache.put([f"question number {i}"], "Science", "10", _entry([0, 1, i]))
+
+        assert cache.stats()["entries"] == 3
+        assert not cache.contains("how does photosynthesis work", "Science", "10")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,231 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for QuickGrader.
+
+Tests cover:
+- Exact and overlap matches against any acceptable answer
+- Padded and negated answers left to the model
+- Near-miss embedding matches (antonyms, numbers) left to the model
+- Embedding similarity thresholds and reference embedding reuse
+- LLM calls only for ambiguous answers, and verdict parsing
+- Grammar-constrained verdicts and the verdict-only mode
+- Fallbacks without a model and the avoided-call statistics
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from system.grading import QuickGrader, acceptable_answers, parse_verdict
+from system.grading.quick_grader import is_negated
+
+VECTORS = {
+    "mitochondria produce energy": [1.0, 0.0, 0.0],
+    "the powerhouse of the cell": [0.9, 0.1, 0.0],
+    "it makes atp for the cell": [0.6, 0.8, 0.0],
+    "it protects the nucleus": [0.0, 0.0, 1.0],
+    "mitochondria do not produce energy": [1.0, 0.0, 0.0],
+}
+
+
+class FakeEmbedder:
+    """Maps known texts to fixed vectors and records batch sizes."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(len(texts))
+        return np.array([VECTORS.get(t.lower(), [0.0, 1.0, 0.0]) for t in texts], dtype=np.float32)
+
+
+class FakeModel:
+    def __init__(self, response="[CORRECT]\nFeedback: Well done."):
+        self.response = response
+        self.prompts = []
+
+    def generate_response(self, prompt, max_tokens=100):
+        self.prompts.append(prompt)
+        return self.response
+
+
+class FakeGrammarModel(FakeModel):
+    """Model with grammar-constrained verdicts."""
+
+    def __init__(self, verdict=(False, "")):
+        super().__init__()
+        self.verdict = verdict
+        self.feedback_flags = []
+
+    def generate_verdict(self, prompt, feedback=True):
+        self.prompts.append(prompt)
+        self.feedback_flags.append(feedback)
+        return self.verdict
+
+
+ANSWERS = ["Mitochondria produce energy", "The powerhouse of the cell"]
+
+
+@pytest.fixture
+def model():
+    return FakeModel()
+
+
+@pytest.fixture
+def grader(model):
+    return QuickGrader(model_handler=model, embed_fn=FakeEmbedder())
+
+
+class TestQuickChecks:
+    """Test decisions made without the model."""
+
+    def test_exact_match_ignores_case_and_punctuation(self, grader, model):
+        correct, feedback = grader.grade("What do mitochondria do?", "the powerhouse of the cell!", ANSWERS)
+        assert correct
+        assert model.prompts == []
+        assert grader.decisions["exact"] == 1
+
+    def test_overlap_accepts_reworded_answer(self, grader, model):
+        correct, _ = grader.grade("What do mitochondria do?", "Energy is what mitochondria produce", ANSWERS)
+        assert correct
+        assert grader.decisions["overlap"] == 1
+        assert model.prompts == []
+
+    def test_padded_answer_not_accepted(self, grader, model):
+        answer = "Mitochondria produce energy, the nucleus stores DNA and ribosomes make proteins"
+        grader.grade("What do mitochondria do?", answer, ANSWERS)
+        assert grader.decisions["overlap"] == 0
+        assert len(model.prompts) == 1
+
+    def test_negated_answer_not_accepted(self, grader, model):
+        # Covers every reference word and embeds like the reference
+        grader.grade("What do mitochondria do?", "Mitochondria do not produce energy", ANSWERS)
+        assert grader.decisions["overlap"] == grader.decisions["similar"] == 0
+        assert len(model.prompts) == 1
+
+    def test_negation_agreement(self):
+        grader = QuickGrader()
+        reference = ["Sound waves do not travel through a vacuum"]
+        assert grader.quick_verdict("Through a vacuum sound waves do not travel", reference)[:2] == (True, "overlap")
+        assert grader.quick_verdict("Sound waves travel through a vacuum", reference)[0] is None
+
+    # Unknown texts share one FakeEmbedder vector, so these pairs score a cosine of 1
+    @pytest.mark.parametrize("answer, reference", [
+        ("meiosis", "mitosis"),
+        ("It decreases the reaction rate", "It increases the reaction rate"),
+        ("anode", "cathode"),
+        ("5", "4"),
+        ("The current is 5 amperes", "4 amperes"),
+    ])
+    def test_near_miss_not_accepted_by_similarity(self, grader, answer, reference):
+        assert grader.quick_verdict(answer, [reference]) == (None, "", reference)
+
+    def test_paraphrase_accepted_by_similarity(self, grader):
+        verdict, method, _ = grader.quick_verdict("chlorophyll traps sunlight inside leaves", ["Plants absorb light energy"])
+        assert (verdict, method) == (True, "similar")
+
+    def test_is_negated(self):
+        assert is_negated("It isn't a plant")
+        assert is_negated("it doesnt move")
+        assert is_negated("Plants cannot move")
+        assert not is_negated("The plant wants light")
+        assert not is_negated("A knot in the note")
+
+    def test_dissimilar_answer_rejected(self, grader, model):
+        correct, feedback = grader.grade("What do mitochondria do?", "It protects the nucleus", ANSWERS)
+        assert not correct
+        assert feedback.startswith("The correct answer is:")
+        assert model.prompts == []
+
+    def test_empty_answer_rejected(self, grader):
+        correct, _ = grader.grade("Q", "   ", ANSWERS)
+        assert not correct
+
+    def test_reference_embeddings_cached(self, grader):
+        grader.grade("Q", "It protects the nucleus", ANSWERS)
+        grader.grade("Q", "It makes ATP for the cell", ANSWERS)
+        grader.grade("Q", "It protects the nucleus.", ANSWERS)
+        assert grader.embed_fn.batches == [3, 1]
+
+
+class TestModelBand:
+    """Test the ambiguous band."""
+
+    def test_ambiguous_answer_goes_to_model(self, grader, model):
+        correct, feedback = grader.grade("What do mitochondria do?", "It makes ATP for the cell", ANSWERS)
+        assert correct
+        assert feedback == "Well done."
+        assert len(model.prompts) == 1
+        assert "Student Answer: It makes ATP for the cell" in model.prompts[0]
+
+    def test_no_model_falls_back_to_fuzzy_match(self):
+        grader = QuickGrader()
+        correct, _ = grader.grade("Q", "Mitochondria produces energy", ANSWERS)
+        assert correct
+        correct, _ = grader.grade("Q", "Something unrelated", ANSWERS)
+        assert not correct
+        assert grader.decisions["fallback"] == 2
+
+    def test_no_reference_uses_open_prompt(self, model):
+        grader = QuickGrader(model_handler=model)
+        grader.grade_question({"question": "Why is the sky blue?"}, "Scattering")
+        assert "Verdict (Start with [CORRECT] or [INCORRECT])" in model.prompts[0]
+
+    def test_grammar_verdict_preferred(self):
+        model = FakeGrammarModel(verdict=(True, "Good explanation."))
+        grader = QuickGrader(model_handler=model, embed_fn=FakeEmbedder())
+        assert grader.grade("Q", "It makes ATP for the cell", ANSWERS) == (True, "Good explanation.")
+        assert model.feedback_flags == [True]
+
+    def test_verdict_only_mode(self):
+        model = FakeGrammarModel(verdict=(False, ""))
+        grader = QuickGrader(model_handler=model, embed_fn=FakeEmbedder(), feedback=False)
+        correct, feedback = grader.grade("Q", "It makes ATP for the cell", ANSWERS)
+        assert not correct
+        assert feedback.startswith("The correct answer is:")
+        assert model.feedback_flags == [False]
+
+    def test_grammar_failure_uses_free_text(self):
+        model = FakeGrammarModel(verdict=None)
+        model.response = "[INCORRECT]\nFeedback: Not quite."
+        grader = QuickGrader(model_handler=model, embed_fn=FakeEmbedder())
+        assert grader.grade("Q", "It makes ATP for the cell", ANSWERS) == (False, "Not quite.")
+        assert grader.stats()["llm_calls"] == 1
+
+    def test_parse_verdict(self):
+        assert parse_verdict("[INCORRECT] Feedback: No.", "a", "b") == (False, "No.")
+        assert parse_verdict(" Verdict: [CORRECT]\nFeedback: Yes.", "a", "b") == (True, "Yes.")
+        # Unclear verdict falls back to a strict match
+        assert parse_verdict("Maybe.", "Four", "four")[0]
+
+
+class TestQuestionData:
+    """Test reference answer lookup and statistics."""
+
+    def test_acceptable_answers_preferred(self):
+        question = {"acceptable_answers": ["A", " "], "answer": "B"}
+        assert acceptable_answers(question) == ["A"]
+        assert acceptable_answers({"answer": "B"}) == ["B"]
+        assert acceptable_answers({}) == []
+
+    def test_stats_report_avoided_ratio(self, grader):
+        grader.grade("Q", "Mitochondria produce energy", ANSWERS)
+        grader.grade("Q", "It protects the nucleus", ANSWERS)
+        grader.grade("Q", "It makes ATP for the cell", ANSWERS)
+        grader.grade("Q", "The powerhouse of the cell", ANSWERS)
+        stats = grader.stats()
+        assert stats["graded"] == 4
+        assert stats["llm_calls"] == 1
+        assert stats["llm_calls_avoided"] == 3
+        assert stats["llm_avoided_ratio"] == 0.75
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
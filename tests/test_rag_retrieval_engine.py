@@ -16,9 +16,15 @@ Tests cover:
 - Confidence calculation
 - Caching behavior
 - Error handling
+- Trimmed answers replacing the streamed tokens
 """
 
+import time
+from types import SimpleNamespace
+
 import pytest
+from system.rag.anti_confusion_engine import AntiConfusionEngine
+from system.rag.followup_session import FollowUpSession
 from system.rag.rag_retrieval_engine import RAGRetrievalEngine
 
 
@@ -86,6 +92,27 @@ class TestCollectionSelection:
         # Should return fallback collections
 
 
+class TestMetadataFilters:
+    """Test grade/subject filter pushdown."""
+    
+    def test_neb_collection_filters_narrowest_first(self):
+        """Test that NEB collections get grade+subject, then grade, then no filter."""
+        filters = RAGRetrievalEngine._build_where_filters("neb_science_grade_10", "Science", "10")
+        
+        assert filters[0] == {"$and": [{"grade": "10"}, {"subject": "science"}]}
+        assert filters[1] == {"grade": "10"}
+        assert filters[-1] is None
+    
+    def test_external_collection_unfiltered(self):
+        """Test that collections without NEB metadata are searched unfiltered."""
+        assert RAGRetrievalEngine._build_where_filters("openstax_science", "Science", "10") == [None]
+    
+    def test_collection_grade_extraction(self):
+        """Test grade parsing from NEB collection names."""
+        assert RAGRetrievalEngine._collection_grade("neb_science_grade_10") == "10"
+        assert RAGRetrievalEngine._collection_grade("finemath") is None
+
+
 class TestConfidenceCalculation:
     """Test confidence scoring logic."""
     
@@ -219,6 +246,72 @@ class TestEdgeCases:
             assert "answer" in result
 
 
+class LoopingHandler:
+    """Model handler whose follow-up answer falls into a loop."""
+
+    ANSWER = (
+        "Chlorophyll absorbs light in the chloroplasts. "
+        + "The plant makes sugar from light. " * 4
+    )
+
+    def continuation_prompt(self, turn, history):
+        return list(history) + [0]
+
+    def continue_answer_stream(self, prompt, history):
+        for word in self.ANSWER.split(" "):
+            yield word + " "
+
+    def keep_session(self):
+        return [1, 2, 3]
+
+    def end_session(self):
+        pass
+
+
+class TestStreamTrim:
+    """Test the trimmed answer sent after a degenerating stream."""
+
+    @pytest.fixture
+    def engine(self):
+        engine = RAGRetrievalEngine.__new__(RAGRetrievalEngine)
+        engine.llm = SimpleNamespace(handler=LoopingHandler())
+        engine.anti_confusion = AntiConfusionEngine()
+        engine.router = SimpleNamespace(centroids={})
+        return engine
+
+    @pytest.fixture
+    def session(self):
+        session = FollowUpSession()
+        session.start(
+            "Where does photosynthesis happen?", "Science", "8",
+            [{"text": "Photosynthesis happens in the chloroplasts.", "metadata": {}}],
+            "Photosynthesis happens in the chloroplasts.", llm_state=[1, 2, 3]
+        )
+        return session
+
+    def test_replace_event_matches_answer(self, engine, session):
+        streamed, events = [], []
+        result = engine._answer_follow_up(
+            session, "Explain more", streamed.append, time.time(),
+            lambda event, payload: events.append((event, payload))
+        )
+
+        assert result["stopped_early"] == "repetition"
+        assert len(result["answer"]) < len("".join(streamed))
+        assert events == [("answer", {"answer": result["answer"], "stopped": "repetition"})]
+
+    def test_no_event_for_healthy_answer(self, engine, session, monkeypatch):
+        monkeypatch.setattr(LoopingHandler, "ANSWER", "Chlorophyll absorbs light in the chloroplasts.")
+        events = []
+        result = engine._answer_follow_up(
+            session, "Explain more", None, time.time(),
+            lambda event, payload: events.append(event)
+        )
+
+        assert result["stopped_early"] is None
+        assert events == []
+
+
 class TestIntegration:
     """Integration tests for full pipeline."""
     
@@ -0,0 +1,176 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for the SymSpell spell corrector.
+
+Tests cover:
+- Vocabulary counting from content JSON
+- Delete index build, save and load round trip
+- Word lookup by distance and frequency
+- Question correction rules (case, acronyms, digits)
+- Base lexicon words never corrected, indexes without a lexicon refused
+- Index build used by content ingestion, with and without a word list
+- AdaptiveNormalizer backend selection (SymSpell, LanguageTool fallback)
+"""
+
+import gzip
+import json
+
+import pytest
+
+from scripts import build_spell_index
+from scripts.build_spell_index import build_index
+from system.input_processing.adaptive_normalizer import AdaptiveNormalizer
+from system.input_processing.spell_corrector import (
+    SymSpellCorrector, content_texts, count_words, edit_distance
+)
+
+VOCABULARY = {
+    "what": 50, "is": 60, "the": 90, "process": 8, "of": 70, "photosynthesis": 12,
+    "mitosis": 6, "cell": 10, "cells": 4, "explain": 9, "computer": 5, "binary": 3,
+    "numbers": 3, "how": 20, "does": 15, "store": 2, "a": 40, "place": 30, "price": 25, "inverted": 7,
+}
+
+# Stand-in for /usr/share/dict/words
+LEXICON = list(VOCABULARY) + ["please", "prime", "invented", "and", "in"]
+
+
+@pytest.fixture
+def corrector():
+    return SymSpellCorrector.build(VOCABULARY, LEXICON)
+
+
+@pytest.fixture
+def index_path(tmp_path, corrector):
+    return str(corrector.save(tmp_path / "spell_index.json.gz"))
+
+
+class TestVocabulary:
+    """Test vocabulary collection."""
+
+    def test_content_texts_walks_json(self, tmp_path):
+        content = {"subject": "Science", "topics": [{"name": "Cells", "questions": [{"answer": "Mitochondria"}]}]}
+        (tmp_path / "science.json").write_text(json.dumps(content), encoding="utf-8")
+        counts = count_words(content_texts(str(tmp_path)))
+        assert counts["mitochondria"] == 1
+        assert counts["science"] == 1
+
+    def test_edit_distance_transposition(self):
+        assert edit_distance("teh", "the", 2) == 1
+        assert edit_distance("mitosis", "photosynthesis", 2) is None
+
+
+class TestIndex:
+    """Test the delete index."""
+
+    def test_round_trip(self, corrector, index_path):
+        loaded = SymSpellCorrector(index_path)
+        assert loaded.ready
+        assert loaded.words == corrector.words
+        assert loaded.deletes == corrector.deletes
+
+    def test_build_requires_lexicon(self):
+        with pytest.raises(ValueError):
+            SymSpellCorrector.build(VOCABULARY, [])
+
+    def test_index_without_lexicon_refused(self, index_path):
+        with gzip.open(index_path, 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+        payload["lexicon_size"] = 0
+        with gzip.open(index_path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f)
+        assert not SymSpellCorrector(index_path).ready
+
+    def test_missing_index_not_ready(self, tmp_path):
+        assert not SymSpellCorrector(str(tmp_path / "missing.json.gz")).ready
+
+    def test_lookup(self, corrector):
+        assert corrector.lookup("fotosynthesis") == "photosynthesis"
+        assert corrector.lookup("photosynthesis") == "photosynthesis"
+        assert corrector.lookup("wat") == "what"
+        assert corrector.lookup("xylophone") is None
+
+    def test_long_word_past_prefix(self, corrector):
+        assert corrector.lookup("photosynthesys") == "photosynthesis"
+
+
+class TestCorrection:
+    """Test question correction."""
+
+    def test_corrects_typos(self, corrector):
+        assert corrector.correct("explain the proces of mitosis") == "explain the process of mitosis"
+
+    def test_keeps_capitalisation(self, corrector):
+        assert corrector.correct("How does a computr store binary numbrs?") == \
+            "How does a computer store binary numbers?"
+
+    def test_leaves_acronyms_and_digits(self, corrector):
+        assert corrector.correct("what is DNA and ATP5 proces") == "what is DNA and ATP5 process"
+
+    def test_lexicon_words_kept(self, corrector):
+        """Real words stay, even next to a more frequent curriculum word."""
+        assert corrector.correct("please explain the prime numbers") == "please explain the prime numbers"
+        assert corrector.correct("who invented the cell") == "who invented the cell"
+
+    def test_unknown_words_untouched(self, corrector):
+        assert corrector.correct("what is xylophone") == "what is xylophone"
+
+
+class TestBuildIndex:
+    """Test the index build run by content ingestion."""
+
+    def test_builds_with_wordlist(self, tmp_path):
+        wordlist = tmp_path / "words.txt"
+        wordlist.write_text("\n".join(sorted(LEXICON)))
+        path = build_index(["Photosynthesis happens in chloroplasts."], str(wordlist), str(tmp_path / "index.json.gz"))
+        corrector = SymSpellCorrector(str(path))
+        assert corrector.ready
+        assert corrector.correct("what is fotosynthesis") == "what is photosynthesis"
+
+    def test_no_wordlist_builds_nothing(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(build_spell_index, "DEFAULT_WORDLISTS", [str(tmp_path / "missing.txt")])
+        assert build_index(["Photosynthesis"], output=str(tmp_path / "index.json.gz")) is None
+        assert not (tmp_path / "index.json.gz").exists()
+
+
+class TestBackendSelection:
+    """Test AdaptiveNormalizer spell backends."""
+
+    def test_auto_prefers_symspell(self, tmp_path, index_path):
+        normalizer = AdaptiveNormalizer(log_dir=str(tmp_path / "logs"), spell_index_path=index_path)
+        assert normalizer.wait_until_ready(5)
+        assert isinstance(normalizer.spell_checker, SymSpellCorrector)
+        query = "please explain what is the proces of fotosynthesis in the cell"
+        normalizer.normalize(query)
+        assert normalizer.feedback_db[-1]["corrected"] == \
+            "please explain what is the process of photosynthesis in the cell"
+        normalizer.close()
+
+    def test_missing_index_disables_symspell(self, tmp_path):
+        normalizer = AdaptiveNormalizer(
+            log_dir=str(tmp_path / "logs"), spell_backend="symspell",
+            spell_index_path=str(tmp_path / "missing.json.gz")
+        )
+        assert normalizer.wait_until_ready(5)
+        assert normalizer.spell_checker is None
+        normalizer.close()
+
+    def test_auto_falls_back_to_language_tool(self, tmp_path, monkeypatch):
+        fallback = object()
+        monkeypatch.setattr(AdaptiveNormalizer, "_load_language_tool", lambda self: fallback)
+        normalizer = AdaptiveNormalizer(
+            log_dir=str(tmp_path / "logs"), spell_index_path=str(tmp_path / "missing.json.gz")
+        )
+        assert normalizer.wait_until_ready(5)
+        assert normalizer.spell_checker is fallback
+        normalizer.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,144 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for StreamMonitor.
+
+Tests cover:
+- Healthy grounded answers pass through untouched
+- N-gram loops and repeated sentences
+- Off-topic markers split across tokens
+- Collapsing grounding overlap against the context
+- Closing the model stream on stop
+"""
+
+import re
+
+import pytest
+
+from system.rag.anti_confusion_engine import AntiConfusionEngine
+from system.rag.stream_monitor import StreamMonitor
+
+CONTEXT = (
+    "Photosynthesis is the process by which green plants use sunlight, water and carbon dioxide "
+    "to produce glucose and oxygen. It takes place in the chloroplasts of leaf cells, where "
+    "chlorophyll absorbs light energy."
+)
+
+
+def tokens(text):
+    """Splits text roughly the way a tokenizer streams it."""
+    return re.findall(r'\s*\S+', text)
+
+
+def run(monitor, text):
+    return "".join(monitor.watch(tokens(text)))
+
+
+@pytest.fixture
+def monitor():
+    return StreamMonitor(CONTEXT)
+
+
+class TestHealthyAnswers:
+    """Test answers that should not be stopped."""
+
+    def test_grounded_answer_passes(self, monitor):
+        answer = (
+            "Photosynthesis happens in the chloroplasts of leaf cells. Chlorophyll absorbs light energy "
+            "from sunlight. Plants combine water and carbon dioxide to produce glucose. Oxygen is "
+            "released as a product of photosynthesis."
+        )
+        assert run(monitor, answer) == answer
+        assert monitor.reason is None
+        assert monitor.text() == answer
+
+    def test_no_context_skips_drift(self):
+        monitor = StreamMonitor("")
+        answer = "Volcanoes erupt because magma rises through cracks. Tectonic plates shift slowly over millions of years."
+        assert run(monitor, answer) == answer
+
+
+class TestRepetition:
+    """Test loop detection."""
+
+    def test_ngram_loop_stopped(self, monitor):
+        run(monitor, "Plants produce glucose and oxygen and oxygen and oxygen and oxygen and oxygen and oxygen and oxygen")
+        assert monitor.reason == "repetition"
+        assert monitor.text().startswith("Plants produce glucose and oxygen")
+        assert monitor.text().count("and oxygen") <= 2
+
+    def test_repeated_sentence_stopped(self, monitor):
+        sentence = "Chlorophyll absorbs light energy in the leaf. "
+        run(monitor, "Photosynthesis makes glucose. " + sentence * 3)
+        assert monitor.reason == "repetition"
+        assert monitor.text() == "Photosynthesis makes glucose. " + sentence.strip()
+
+
+class TestOffTopic:
+    """Test marker detection."""
+
+    def test_exercise_marker_across_tokens(self, monitor):
+        stream = ["Plants make glucose.", " Exer", "cise:", " Draw a leaf", " and label it."]
+        out = "".join(monitor.watch(stream))
+        assert monitor.reason == "off_topic"
+        assert monitor.text() == "Plants make glucose."
+        assert "label" not in out
+
+    def test_prompt_echo_stopped(self, monitor):
+        run(monitor, "Glucose is produced. Question: What is respiration?")
+        assert monitor.reason == "off_topic"
+        assert monitor.text() == "Glucose is produced."
+
+
+class TestDrift:
+    """Test grounding collapse."""
+
+    def test_drift_stopped(self, monitor):
+        grounded = (
+            "Photosynthesis takes place in the chloroplasts of leaf cells where chlorophyll absorbs light energy. "
+            "Plants use sunlight, water and carbon dioxide to produce glucose and oxygen. "
+        )
+        drift = (
+            "Meanwhile, basketball tournaments attract thousands of spectators every summer. "
+            "Stadium tickets become expensive during championship seasons. "
+            "Players practise dribbling techniques constantly."
+        )
+        run(monitor, grounded + drift)
+        assert monitor.reason == "drift"
+        assert monitor.text() == grounded.strip()
+
+    def test_reuses_engine_terms(self):
+        engine = AntiConfusionEngine()
+        terms = engine.key_terms("Plants produce GLUCOSE in leaves")
+        assert terms == {"plants", "produce", "glucose", "leaves"}
+        assert engine.grounding_overlap(terms, CONTEXT.lower()) == 0.75
+
+
+class TestStreamControl:
+    """Test early abort."""
+
+    def test_stream_closed_on_stop(self, monitor):
+        produced = []
+
+        def generator():
+            try:
+                for word in ["Glucose", " is", " made.", " Exercise:", " one", " two", " three"]:
+                    produced.append(word)
+                    yield word
+            finally:
+                produced.append("closed")
+
+        list(monitor.watch(generator()))
+        assert produced[-1] == "closed"
+        assert " one" not in produced
+        assert monitor.stats()["stopped"] == "off_topic"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,101 @@
+# Copyright (C) 2026 Aashik
+#
+# This software is subject to the terms of the PolyForm Noncommercial License 1.0.0.
+# A copy of the license can be found in the LICENSE file or at
+# https://polyformproject.org/licenses/noncommercial/1.0.0/
+#
+# USE OF THIS SOFTWARE FOR COMMERCIAL PURPOSES IS STRICTLY PROHIBITED.
+
+"""
+Unit tests for ChunkTokenStore.
+
+Tests cover:
+- Storing and reading per-sentence token ids
+- Persistence of the array-backed sidecar
+- Sentence lookup for retrieved chunks
+- Token counting from stored ids in ContextPacker
+"""
+
+import pytest
+
+from system.rag.context_packer import ContextPacker
+from system.rag.token_store import ChunkTokenStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ChunkTokenStore(chroma_db_path=str(tmp_path))
+    store.put_collection("neb_science_grade_10", {
+        "neb_science_grade_10_0": [[11, 12, 13], [14, 15]],
+        "neb_science_grade_10_1": [[21, 22]],
+    })
+    return store
+
+
+class TestStorage:
+    """Test storing token ids."""
+
+    def test_get_returns_sentences(self, store):
+        assert store.get("neb_science_grade_10", "neb_science_grade_10_0") == [[11, 12, 13], [14, 15]]
+
+    def test_missing_chunk(self, store):
+        assert store.get("neb_science_grade_10", "unknown") is None
+        assert store.get("other_collection", "neb_science_grade_10_0") is None
+
+    def test_persists_to_disk(self, store, tmp_path):
+        reloaded = ChunkTokenStore(chroma_db_path=str(tmp_path))
+        assert reloaded.get("neb_science_grade_10", "neb_science_grade_10_1") == [[21, 22]]
+
+    def test_update_keeps_other_chunks(self, store):
+        store.put_collection("neb_science_grade_10", {"neb_science_grade_10_1": [[31], [32]]})
+
+        assert store.get("neb_science_grade_10", "neb_science_grade_10_0") == [[11, 12, 13], [14, 15]]
+        assert store.get("neb_science_grade_10", "neb_science_grade_10_1") == [[31], [32]]
+
+
+class TestSentenceLookup:
+    """Test sentence-to-token lookup."""
+
+    def test_maps_sentences(self, store):
+        chunks = [{
+            "id": "neb_science_grade_10_0",
+            "collection": "neb_science_grade_10",
+            "text": "Cells divide. Mitosis has phases."
+        }]
+        lookup = store.sentence_tokens(chunks)
+
+        assert lookup == {"Cells divide.": [11, 12, 13], "Mitosis has phases.": [14, 15]}
+
+    def test_skips_mismatched_text(self, store):
+        chunks = [{
+            "id": "neb_science_grade_10_1",
+            "collection": "neb_science_grade_10",
+            "text": "Edited text. Now has two sentences."
+        }]
+        assert store.sentence_tokens(chunks) == {}
+        assert store.stats()["chunk_misses"] == 1
+
+    def test_packer_counts_stored_tokens(self, store):
+        chunks = [{
+            "id": "neb_science_grade_10_0",
+            "collection": "neb_science_grade_10",
+            "text": "Cells divide. Mitosis has phases.",
+            "final_score": 1.0
+        }]
+        lookup = store.sentence_tokens(chunks)
+
+        calls = []
+
+        def counting_tokenizer(text):
+            calls.append(text)
+            return len(text.split())
+
+        packed = ContextPacker(token_counter=counting_tokenizer, token_budget=4).pack(chunks, sentence_tokens=lookup)
+
+        assert packed[0]["text"] == "Cells divide."
+        assert packed[0]["tokens"] == 3
+        assert calls == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])